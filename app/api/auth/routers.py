@@ -1,14 +1,29 @@
 import datetime
 from typing import Annotated
 
-from fastapi import APIRouter, Cookie, Depends, Request, Response, status
+from fastapi import (
+    APIRouter,
+    Cookie,
+    Depends,
+    Form,
+    Header,
+    Request,
+    Response,
+    status,
+)
 from fastapi.responses import JSONResponse
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from api.auth.schemas import TokenIntrospectionSchema, UserSessionSchema
 from api.users import schemas as user_schemas
 from db.session import get_db
-from service.auth import handlers
+from service.auth import handlers, keys
+from service.exceptions.api.users import (
+    BaseUserException,
+    InactiveUserException,
+    InvalidUserRoleException,
+)
 from service.helpers.url_utils import extract_base_url
 from settings import auth_settings as a_s
 
@@ -36,11 +51,12 @@ async def login(
     if 'localhost' in domain:
         domain = None
 
-    access_token = await handlers.login(
+    access_token, user = await handlers.login(
         db=db,
         password=form_data.password,
         email=form_data.username,
-        user_agent=user_agent
+        user_agent=user_agent,
+        client_ip=handlers.get_client_ip(request),
     )
 
     response.set_cookie(
@@ -53,7 +69,7 @@ async def login(
         samesite="none",
         secure=True
     )
-    return await handlers.get_user_info(db, form_data.username)
+    return user
 
 
 @api_router.delete(
@@ -71,6 +87,119 @@ async def logout(
     if bool(int(a_s.SKIP_AUTH)):
         return True
 
+    await handlers.logout(access_token=access_token)
+
+    return build_logout_response(request)
+
+
+@api_router.delete(
+    "/logout/all",
+    status_code=status.HTTP_200_OK
+)
+async def logout_all(
+    request: Request,
+    user: Annotated[
+        user_schemas.UserTTInfo,
+        Depends(handlers.get_active_user_from_cookie)
+    ],
+):
+
+    if bool(int(a_s.SKIP_AUTH)):
+        return True
+
+    await handlers.logout_all(user)
+
+    return build_logout_response(request)
+
+
+@api_router.get(
+    "/auth/sessions",
+    response_model=list[UserSessionSchema],
+    status_code=status.HTTP_200_OK
+)
+async def get_sessions(
+    user: Annotated[
+        user_schemas.UserTTInfo,
+        Depends(handlers.get_active_user_from_cookie)
+    ],
+    access_token: str | None = Cookie(
+        default=None, alias=a_s.COOKIE_SESSION_KEY
+    )
+):
+
+    return await handlers.get_user_sessions(user, access_token)
+
+
+@api_router.post(
+    "/auth/introspect",
+    response_model=TokenIntrospectionSchema,
+    response_model_exclude_none=True,
+    status_code=status.HTTP_200_OK
+)
+async def introspect(
+    user: Annotated[
+        user_schemas.UserTTInfo,
+        Depends(handlers.get_active_user_from_header)
+    ],
+    token: Annotated[str, Form()],
+    token_type_hint: Annotated[str | None, Form()] = None,
+):
+
+    return await handlers.introspect_token(token)
+
+
+@api_router.get(
+    "/auth/check",
+    response_class=Response,
+    status_code=status.HTTP_200_OK
+)
+async def check(
+    request: Request,
+    authorization: Annotated[
+        str | None,
+        Header(alias="Authorization")
+    ] = None,
+    access_token: str | None = Cookie(
+        default=None, alias=a_s.COOKIE_SESSION_KEY
+    )
+):
+
+    response = Response(status_code=status.HTTP_200_OK)
+    if authorization:
+        access_token = authorization.split(' ')[-1]
+
+    try:
+        user = await handlers.get_user_from_token(
+            request, response, access_token, use_claims=True
+        )
+        if not user.active:
+            raise InactiveUserException()
+        handlers.check_eula_accepted(user)
+        if user.role is None:
+            raise InvalidUserRoleException()
+
+    except BaseUserException as exc:
+        # auth_request / ext_authz only pass 401 and 403 through; a user
+        # without a role is authenticated but has nothing to be granted
+        forbidden = (
+            exc.status_code == status.HTTP_403_FORBIDDEN
+            or isinstance(exc, InvalidUserRoleException)
+        )
+        return Response(
+            status_code=(
+                status.HTTP_403_FORBIDDEN
+                if forbidden
+                else status.HTTP_401_UNAUTHORIZED
+            ),
+            headers={"X-Auth-Error": exc.exc_state},
+        )
+
+    response.headers.update(handlers.get_principal_headers(user))
+    return response
+
+
+def build_logout_response(request: Request) -> JSONResponse:
+
     origin = extract_base_url(request.headers.get('origin'))
     referer = extract_base_url(request.headers.get('referer'))
     host = extract_base_url(request.headers.get('host'))
@@ -80,8 +209,6 @@ async def logout(
     if 'localhost' in domain:
         domain = None
 
-    await handlers.logout(access_token=access_token)
-
     expires = datetime.datetime.now(datetime.UTC) + datetime.timedelta(seconds=1)
     resp = JSONResponse(status_code=status.HTTP_200_OK, content='Ok')
     resp.set_cookie(
@@ -94,3 +221,13 @@ async def logout(
         domain=domain
     )
     return resp
+
+
+@api_router.get(
+    "/.well-known/jwks.json",
+    status_code=status.HTTP_200_OK
+)
+async def jwks(response: Response):
+
+    response.headers["Cache-Control"] = "public, max-age=300"
+    return keys.get_jwks()
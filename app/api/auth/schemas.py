@@ -0,0 +1,19 @@
+from pydantic import BaseModel
+
+
+class UserSessionSchema(BaseModel):
+
+    user_agent: str
+    expires_in: int
+    is_current: bool
+
+
+class TokenIntrospectionSchema(BaseModel):
+
+    active: bool
+    sub: str | None = None
+    username: str | None = None
+    role: str | None = None
+    token_type: str | None = None
+    iat: int | None = None
+    exp: int | None = None
@@ -1,7 +1,8 @@
 from typing import Annotated, Sequence
 
 from fastapi import Depends
-from sqlalchemy import Select, select
+from sqlalchemy import JSON, Select, func, select
+from sqlalchemy.dialects.postgresql import aggregate_order_by
 from sqlalchemy.engine.row import RowMapping
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -12,7 +13,7 @@ from service.exceptions.api.rights import (
     InsufficientRightsException,
     RightsNotFoundException,
 )
-from service.helpers.group_by import group_rows_by_field
+from service.rights.index import RightRecord, rights_index
 from service.rights.models import SpecRights, UserRights
 from service.rights.types import RightScoreType, RightType, SourceType
 from service.roles.types import RoleType
@@ -23,30 +24,52 @@ async def get_sources_by_user_id(
     source_type: SourceType,
     user_id: int,
     db: Annotated[AsyncSession, Depends(get_db)]
-) -> dict[str, list[int]]:
+) -> dict[str, list[int] | dict[str, list[int]]]:
 
-    query = get_share_rights_query(
-        [UserRights.subject_id == user_id, SpecRights.source_type == source_type],
-        [SpecRights.right_type],
+    rights = get_share_rights_query(
+        [UserRights.subject_id == user_id, SpecRights.source_type == source_type]
+    ).cte("rights")
+
+    grouped = (
+        select(
+            rights.c.right_type,
+            func.array_agg(
+                aggregate_order_by(rights.c.source_id, rights.c.source_id)
+            ).label("source_ids"),
+        )
+        .group_by(rights.c.right_type)
+        .subquery()
     )
 
-    rights = (await db.execute(query)).mappings().all()
-    grouped_rights = await group_rows_by_field(rights, 'right_type')
-
-    source_ids_by_right_scope = {
-        'assigned_source_ids': [
-            right['source_id']
-            for right
-            in rights
-        ],
-        'grouped': {
-            right_type: [r['source_id'] for r in rights_seq]
-            for right_type, rights_seq
-            in grouped_rights.items()
-        }
-    }
+    sources = (
+        await db.execute(
+            select(
+                select(
+                    func.array_agg(
+                        aggregate_order_by(
+                            rights.c.source_id,
+                            rights.c.right_type,
+                            rights.c.source_id,
+                        )
+                    )
+                )
+                .scalar_subquery()
+                .label("assigned_source_ids"),
+                select(
+                    func.json_object_agg(
+                        grouped.c.right_type, grouped.c.source_ids, type_=JSON
+                    )
+                )
+                .scalar_subquery()
+                .label("grouped"),
+            )
+        )
+    ).one()
 
-    return source_ids_by_right_scope
+    return {
+        'assigned_source_ids': sources.assigned_source_ids or [],
+        'grouped': sources.grouped or {},
+    }
 
 
 async def get_user_right_by_right_id(
@@ -82,18 +105,22 @@ async def get_right_by_user_id(
     db: AsyncSession,
     subject_id: int,
     source_id: int,
+    source_type: SourceType | None = None,
 ) -> UserRights | None:
 
-    return (
-        await db.execute(
-            select(UserRights)
-            .join(SpecRights)
-            .where(
-                SpecRights.source_id == source_id,
-                UserRights.subject_id == subject_id
-            )
-        )
-    ).scalars().one_or_none()
+    rights = await rights_index.get_subject_rights(subject_id)
+    records = [
+        sources[source_id]
+        for type_, sources in rights.items()
+        if source_id in sources
+        and (source_type is None or type_ == source_type)
+    ]
+    # none, or rights on several source types and no type to pick one
+    if len(records) != 1:
+        return None
+
+    # the index answers the lookup, the row is only loaded to be deleted
+    return await db.get(UserRights, records[0].user_right_id)
 
 
 async def get_highest_user_right(
@@ -108,33 +135,39 @@ async def get_spec_right_by_user_id(
     subject_id: int,
     source_id: int,
     source_type: SourceType
-) -> RowMapping | None:
-
-    rights = (
-        await db.execute(
-            get_share_rights_query(
-                [
-                    SpecRights.source_id == source_id,
-                    SpecRights.source_type == source_type,
-                    UserRights.subject_id == subject_id
-                ]
-            )
-        )
-    ).mappings().all()
+) -> RightRecord:
 
-    if not rights:
+    right = await rights_index.get_right(subject_id, source_id, source_type)
+    if not right:
         raise RightsNotFoundException()
 
-    return await get_highest_user_right(rights)
+    return right
+
+
+async def filter_candidates_by_user_id(
+    subject_id: int,
+    source_type: SourceType,
+    source_ids: list[int],
+) -> list[RightRecord]:
+
+    rights = (
+        await rights_index.get_subject_rights(subject_id)
+    ).get(source_type, {})
+
+    return [
+        rights[source_id]
+        for source_id in dict.fromkeys(source_ids)
+        if source_id in rights
+    ]
 
 
 async def get_right_by_rel_id(
     source_id: int,
+    source_type: SourceType,
     user: Annotated[UserTTInfo, Depends(get_active_user_from_cookie)],
-    db: Annotated[AsyncSession, Depends(get_db)]
-) -> UserRights | None:
+) -> RightRecord:
 
-    right = await get_right_by_user_id(db, user.id, source_id)
+    right = await rights_index.get_right(user.id, source_id, source_type)
     if not right:
         raise RightsNotFoundException()
 
@@ -149,26 +182,48 @@ async def get_granted_users_by_rel_id(
     right_type: RightType | None = None
 ) -> dict[str, list]:
 
-    query = get_share_rights_query(
-        [
-            SpecRights.source_type == source_type,
-            SpecRights.source_id == source_id,
-        ],
-        [SpecRights.right_type],
-    )
-    query = query.add_columns(
-        User.first_name, User.last_name,
-        User.parent_name, User.photo_link
-    )
-    query = query.join(User, UserRights.subject_id == User.id)
-
+    where_conds = [
+        SpecRights.source_type == source_type,
+        SpecRights.source_id == source_id,
+    ]
     if right_type:
-        query = query.where(SpecRights.right_type == right_type)
+        where_conds.append(SpecRights.right_type == right_type)
 
-    return await group_rows_by_field(
-        (await db.execute(query)).mappings().all(), 'right_type'
+    granted = (
+        select(
+            SpecRights.right_type,
+            func.json_agg(
+                aggregate_order_by(
+                    func.json_build_object(
+                        'subject_id', UserRights.subject_id,
+                        'first_name', User.first_name,
+                        'last_name', User.last_name,
+                        'parent_name', User.parent_name,
+                        'photo_link', User.photo_link,
+                        'constraints', UserRights.constraints,
+                    ),
+                    UserRights.id,
+                )
+            ).label("users"),
+        )
+        .select_from(SpecRights)
+        .join(UserRights, SpecRights.id == UserRights.right_id)
+        .join(User, UserRights.subject_id == User.id)
+        .where(*where_conds)
+        .group_by(SpecRights.right_type)
+        .subquery()
     )
 
+    return (
+        await db.execute(
+            select(
+                func.json_object_agg(
+                    granted.c.right_type, granted.c.users, type_=JSON
+                )
+            )
+        )
+    ).scalar() or {}
+
 
 async def user_can_grant_rights_to_obj(
     db: AsyncSession,
@@ -0,0 +1,26 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, status
+
+from api.users.schemas import UserTTInfo
+from service.auth.handlers import get_active_user_from_header
+from service.auth.sessions import store_breaker
+from service.exceptions.api.rights import InsufficientRightsException
+from service.helpers.hashing import hashing_pool
+from service.roles.types import RoleType
+
+api_router = APIRouter(prefix="/metrics")
+
+
+@api_router.get("", status_code=status.HTTP_200_OK)
+async def get_metrics(
+    user: Annotated[UserTTInfo, Depends(get_active_user_from_header)],
+):
+
+    if user.role not in [RoleType.USER_MASTER, RoleType.SERVICE_USER]:
+        raise InsufficientRightsException()
+
+    return {
+        "hashing": hashing_pool.stats(),
+        "session_store": store_breaker.stats(),
+    }
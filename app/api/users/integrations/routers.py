@@ -22,19 +22,23 @@ from api.users.integrations.schemas import (
 )
 from db.session import get_db
 from service.auth.handlers import (
+    get_active_user_from_api_key_or_header,
     get_active_user_from_cookie,
-    get_active_user_from_header,
 )
 from service.exceptions.api.integrations import (
     UserAppCredentialsNotFoundException,
     JobSitePolicyNotFoundException,
 )
-from service.types import JobSiteMicroEnum
+from service.types import ApiKeyScope, JobSiteMicroEnum
 from service.users.handlers import get_organization_by_user_id
 from service.users.models import User
 
 api_router = APIRouter(prefix="/integrations")
 
+get_active_integration_user = get_active_user_from_api_key_or_header(
+    ApiKeyScope.INTEGRATIONS
+)
+
 
 @api_router.get(
     path="/users/with-creds",
@@ -42,7 +46,7 @@ api_router = APIRouter(prefix="/integrations")
     status_code=status.HTTP_200_OK
 )
 async def users_with_credentials(
-    user: Annotated[User, Depends(get_active_user_from_header)],
+    user: Annotated[User, Depends(get_active_integration_user)],
     db: Annotated[AsyncSession, Depends(get_db)],
     user_id: int,
     vacancy_id: int,
@@ -84,7 +88,7 @@ async def unlink_job_site(
     status_code=status.HTTP_200_OK
 )
 async def get_credentials(
-    user: Annotated[User, Depends(get_active_user_from_header)],
+    user: Annotated[User, Depends(get_active_integration_user)],
     db: Annotated[AsyncSession, Depends(get_db)],
     user_id: int,
     platform_type: JobSiteMicroEnum,
@@ -110,7 +114,7 @@ async def get_credentials(
     status_code=status.HTTP_200_OK
 )
 async def get_organization_policy(
-    user: Annotated[User, Depends(get_active_user_from_header)],
+    user: Annotated[User, Depends(get_active_integration_user)],
     db: Annotated[AsyncSession, Depends(get_db)],
     user_id: int,
     platform_type: JobSiteMicroEnum,
@@ -135,7 +139,7 @@ async def get_organization_policy(
     status_code=status.HTTP_200_OK
 )
 async def create_or_update_credentials(
-    user: Annotated[User, Depends(get_active_user_from_header)],
+    user: Annotated[User, Depends(get_active_integration_user)],
     db: Annotated[AsyncSession, Depends(get_db)],
     user_id: int,
     platform_type: JobSiteMicroEnum,
@@ -159,7 +163,7 @@ async def create_or_update_credentials(
     status_code=status.HTTP_200_OK
 )
 async def integration_user_state(
-    user: Annotated[User, Depends(get_active_user_from_header)],
+    user: Annotated[User, Depends(get_active_integration_user)],
     db: Annotated[AsyncSession, Depends(get_db)],
     user_id: int,
     platform_type: JobSiteMicroEnum,
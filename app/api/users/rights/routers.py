@@ -1,10 +1,10 @@
 from typing import Annotated
 
 from fastapi import APIRouter, Depends, status
-from sqlalchemy import RowMapping
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from api.dependencies.rights.helpers import (
+    filter_candidates_by_user_id,
     get_granted_users_by_rel_id,
     get_right_by_user_id,
     get_rights_by_type,
@@ -13,6 +13,8 @@ from api.dependencies.rights.helpers import (
     user_can_grant_rights_to_obj,
 )
 from api.users.rights.schemas import (
+    FilterCandidatesSchema,
+    FilteredCandidatesSchema,
     GrantedSourcesSchema,
     GrantRightSchema,
     GrantRightToUsersSchema,
@@ -31,7 +33,9 @@ from service.rights.handlers import (
     check_right_with_role_cond,
     update_right_of_user,
 )
+from service.rights.index import RightRecord, invalidate_rights
 from service.rights.models import SpecRights, UserRights
+from service.rights.types import SourceType
 
 api_router = APIRouter(prefix='/rights')
 
@@ -91,13 +95,34 @@ async def set_rights_to_users(
     }
 
 
+@api_router.post(
+    "/filter-candidates",
+    response_model=FilteredCandidatesSchema,
+    status_code=status.HTTP_200_OK
+)
+async def filter_candidates(
+    candidates: FilterCandidatesSchema,
+    user: Annotated[UserTTInfo, Depends(get_active_user_from_cookie)],
+):
+
+    return {
+        'allowed': await filter_candidates_by_user_id(
+            candidates.subject_id,
+            candidates.source_type,
+            candidates.source_ids,
+        )
+    }
+
+
 @api_router.get(
     '/by-rel/{source_id}/{subject_id}',
     response_model=RightSchemaBase,
     status_code=status.HTTP_200_OK
 )
 async def get_user_highest_right_by_source_id(
-    spec_right_by_rel: Annotated[RowMapping, Depends(get_spec_right_by_user_id)],
+    spec_right_by_rel: Annotated[
+        RightRecord, Depends(get_spec_right_by_user_id)
+    ],
     user: Annotated[UserTTInfo, Depends(get_active_user_from_cookie)],
 ):
 
@@ -112,7 +137,9 @@ async def get_user_highest_right_by_source_id(
 async def update_right_to_user_by_source_id(
     source_id: int,
     grant_schema: GrantRightSchema,
-    spec_right_by_rel: Annotated[RowMapping, Depends(get_spec_right_by_user_id)],
+    spec_right_by_rel: Annotated[
+        RightRecord, Depends(get_spec_right_by_user_id)
+    ],
     user: Annotated[UserTTInfo, Depends(get_active_user_from_cookie)],
     db: Annotated[AsyncSession, Depends(get_db)],
     by_nested: bool = False
@@ -142,15 +169,18 @@ async def delete_right_by_source_id(
     source_id: int,
     subject_id: int,
     db: Annotated[AsyncSession, Depends(get_db)],
+    source_type: SourceType | None = None,
 ):
 
-    right = await get_right_by_user_id(db, subject_id, source_id)
+    right = await get_right_by_user_id(db, subject_id, source_id, source_type)
     if not right:
         raise RightsNotFoundException()
 
     async with transaction(db):
         await db.delete(right)
 
+    await invalidate_rights([subject_id])
+
     return right
 
 
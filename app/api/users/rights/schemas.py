@@ -1,6 +1,7 @@
-from pydantic import BaseModel, HttpUrl, model_validator
+from pydantic import BaseModel, Field, HttpUrl, model_validator
 
 from service.rights.types import HiddenFieldsVacancy, RightType, SourceType
+from settings import auth_settings as a_s
 
 
 class RightSchemaTypes(BaseModel):
@@ -86,3 +87,22 @@ class GrantedSourcesSchema(BaseModel):
 
     assigned_source_ids: list[int] | None = []
     grouped: GrantedSourcesByType
+
+
+class FilterCandidatesSchema(BaseModel):
+
+    subject_id: int
+    source_type: SourceType
+    source_ids: list[int] = Field(max_length=a_s.FILTER_CANDIDATES_MAX_SIZE)
+
+
+class CandidateRightSchema(BaseModel):
+
+    source_id: int
+    right_type: RightType
+    constraints: ConstraintsSchema | None = ConstraintsSchema()
+
+
+class FilteredCandidatesSchema(BaseModel):
+
+    allowed: list[CandidateRightSchema]
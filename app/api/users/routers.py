@@ -10,11 +10,14 @@ from api.users.schemas import (
     UserTTInfo,
     UserTTInfoPhone,
     UserUpdateSchema,
+    UserVerifyBatchResult,
+    UserVerifyBatchSchema,
     UserVerifyInfo,
 )
 from db.session import get_db
 from service.auth import handlers as auth_handlers
-from service.exceptions.api.users.exc import EulaMustBeAcceptedException
+from service.exceptions.api.rights import InsufficientRightsException
+from service.exceptions.api.users import BaseUserException
 from service.rights.types import SourceType
 from service.roles.handlers import check_user_role_existence
 from service.roles.models import Role
@@ -85,6 +88,12 @@ async def update_user(
     ),
     img: UploadFile = File(None),
 ):
+    # deactivation revokes every session of the user, admins only
+    if updated_info.active is not None and user.role not in [
+        RoleType.USER_MASTER, RoleType.SERVICE_USER
+    ]:
+        raise InsufficientRightsException()
+
     if img:
         oldest_img = await get_user_image_name(db, user_id)
         img = await process_image(img, oldest_img)
@@ -134,12 +143,7 @@ async def verify(
     ],
 ):
 
-    if not bool(a_s.SKIP_AGREEMENT):
-        if (
-            user.role != RoleType.SERVICE_USER
-            and not user.is_eula_accepted
-        ):
-            raise EulaMustBeAcceptedException
+    auth_handlers.check_eula_accepted(user)
 
     return UserVerifyInfo(
         id=user.id,
@@ -153,6 +157,26 @@ async def verify(
     )
 
 
+@api_router.post(
+    "/verify/batch",
+    response_model=list[UserVerifyBatchResult],
+    status_code=status.HTTP_200_OK
+)
+async def verify_batch(
+    user: Annotated[
+        UserTTInfo,
+        Depends(auth_handlers.get_active_user_from_header)
+    ],
+    db: Annotated[AsyncSession, Depends(get_db)],
+    batch: UserVerifyBatchSchema,
+):
+
+    return [
+        auth_handlers.build_verify_result(result)
+        for result in await auth_handlers.verify_tokens(db, batch.tokens)
+    ]
+
+
 @api_router.get("/by-roles", response_model=list[UserInfoWithAssign])
 async def get_users_by_roles(
     user: Annotated[
@@ -1,9 +1,10 @@
 from fastapi import Form
-from pydantic import BaseModel, field_validator
+from pydantic import BaseModel, Field, field_validator
 from pydantic.v1 import ConfigDict
 
 from service.roles.models import Role
 from service.roles.types import RoleType
+from settings import auth_settings as a_s
 
 
 class UserBase(BaseModel):
@@ -51,6 +52,7 @@ class UserUpdateSchema(BaseModel):
     first_name: str | None = None
     last_name: str | None = None
     parent_name: str | None = None
+    active: bool | None = None
 
     @classmethod
     def as_form(
@@ -59,12 +61,14 @@ class UserUpdateSchema(BaseModel):
         first_name: str | None = Form(None),
         last_name: str | None = Form(None),
         parent_name: str | None = Form(None),
+        active: bool | None = Form(None),
     ):
         return cls(
             email=email,
             first_name=first_name,
             last_name=last_name,
-            parent_name=parent_name
+            parent_name=parent_name,
+            active=active
         )
 
 
@@ -139,6 +143,12 @@ class UserTTInfo(UserTTBase):
     is_internal: bool
 
 
+class UserClaimsInfo(UserTTInfo):
+
+    # rebuilt from the signed token claims, which carry no contact details
+    is_internal: bool | None = None
+
+
 class UserTTInfoPhone(UserTTBase):
 
     phone_number: str | None = None
@@ -170,6 +180,20 @@ class UserVerifyInfo(BaseModel):
     organization_id: int | None = None
 
 
+class UserVerifyBatchSchema(BaseModel):
+
+    tokens: list[str] = Field(max_length=a_s.VERIFY_BATCH_MAX_SIZE)
+
+
+class UserVerifyBatchResult(BaseModel):
+
+    is_valid: bool
+    user: UserVerifyInfo | None = None
+
+    exc_state: str | None = None
+    exc_info: str | None = None
+
+
 class UserInfoWithAssign(UserTTBase):
 
     is_assigned: bool | None = False
@@ -1,10 +1,20 @@
+import asyncio
 from logging import config
 
 import click
 
+from lib.cli.api_keys.handlers import create_api_key, revoke_api_key_by_id
+from lib.cli.benchmark.handlers import (
+    benchmark_jwt_decoders,
+    benchmark_session_stores,
+    calibrate_password_hash,
+)
 from lib.cli.migrate.huntflow.handlers import migrate_data_from_hf_by_type
 from lib.cli.migrate.types import MigrateSourceType
 from lib.log.settings import LogSettings
+from service.auth import sidecar
+from service.types import ApiKeyScope
+from settings import auth_settings as a_s
 
 config.dictConfig(LogSettings().build())
 
@@ -38,7 +48,116 @@ def migrate_department_from_huntflow(
     migrate_data_from_hf_by_type(**locals())
 
 
+@click.command('benchmark-jwt')
+@click.option('--iterations', '-n', default=10000, type=int)
+@click.option(
+    '--with-claims',
+    is_flag=True,
+    help='Embed the user claims used by CLAIMS_VERIFY'
+)
+def benchmark_jwt(iterations: int, with_claims: bool) -> None:
+
+    for name, elapsed in benchmark_jwt_decoders(
+        iterations, with_claims
+    ).items():
+        click.echo(f'{name}: {elapsed:.1f} us/token')
+
+
+@click.command('benchmark-sessions')
+@click.option('--iterations', '-n', default=1000, type=int)
+@click.option(
+    '--store', '-s',
+    'stores',
+    multiple=True,
+    default=['memory', 'redis', 'postgres'],
+    type=click.Choice(['memory', 'redis', 'postgres']),
+)
+def benchmark_sessions(iterations: int, stores: tuple[str]) -> None:
+
+    for name, results in benchmark_session_stores(
+        list(stores), iterations
+    ).items():
+        click.echo(
+            f'{name}: ' + ', '.join(
+                f'{operation} {elapsed:.1f} us' for operation, elapsed
+                in results.items()
+            )
+        )
+
+
+@click.command('calibrate-password-hash')
+@click.option(
+    '--budget-ms', '-b',
+    default=a_s.PASSWORD_HASH_BUDGET_MS,
+    type=int,
+    help='Hashing latency budget of a single password on this machine'
+)
+@click.option('--min-rounds', default=10, type=click.IntRange(4, 31))
+@click.option('--max-rounds', default=16, type=click.IntRange(4, 31))
+@click.option('--iterations', '-n', default=5, type=int)
+def calibrate_password_hashing(
+    budget_ms: int,
+    min_rounds: int,
+    max_rounds: int,
+    iterations: int,
+) -> None:
+
+    rounds, timings = calibrate_password_hash(
+        budget_ms, min_rounds, max_rounds, iterations
+    )
+    for measured_rounds, elapsed in timings.items():
+        click.echo(f'rounds {measured_rounds}: {elapsed:.1f} ms/hash')
+
+    if rounds is None:
+        raise click.ClickException(
+            f'Even {min_rounds} rounds exceed the {budget_ms} ms budget'
+        )
+
+    click.echo(f'PASSWORD_HASH_ROUNDS={rounds}')
+
+
+@click.command('create-api-key')
+@click.option('--email', '-e', prompt='Service user email')
+@click.option(
+    '--scope', '-s',
+    'scopes',
+    multiple=True,
+    required=True,
+    type=click.Choice([scope.value for scope in ApiKeyScope]),
+)
+@click.option('--name', '-n', default=None)
+def create_service_api_key(
+    email: str,
+    scopes: tuple[str],
+    name: str | None,
+) -> None:
+
+    api_key = create_api_key(email, [ApiKeyScope(s) for s in scopes], name)
+    click.echo(api_key)
+
+
+@click.command('revoke-api-key')
+@click.option('--key-id', '-k', prompt='Key ID')
+def revoke_service_api_key(key_id: str) -> None:
+
+    if not revoke_api_key_by_id(key_id):
+        raise click.ClickException(f'Active API key {key_id} not found')
+
+
+@click.command('serve-sidecar')
+@click.option('--path', '-p', default=a_s.SIDECAR_SOCKET_PATH)
+def serve_sidecar(path: str) -> None:
+
+    asyncio.run(sidecar.serve(path))
+
+
 cli.add_command(migrate_department_from_huntflow)
+cli.add_command(benchmark_jwt)
+cli.add_command(benchmark_sessions)
+cli.add_command(calibrate_password_hashing)
+cli.add_command(create_service_api_key)
+cli.add_command(revoke_service_api_key)
+cli.add_command(serve_sidecar)
 
 
 if __name__ == '__main__':
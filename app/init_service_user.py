@@ -6,7 +6,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from db.session import get_db
 from db.utils.transactional import transaction
-from service.helpers import utils
+from service.helpers import hashing
 from service.roles.models import Role, UserRole
 from service.roles.types import RoleType
 from service.users.models import User
@@ -34,7 +34,7 @@ async def init_service_user():
             last_name="SERVICE_USER",
             parent_name="SERVICE_USER",
             pass_salt=pass_salt,
-            password=utils.get_hash(m_s.SERVICE_USER_PASS + pass_salt),
+            password=await hashing.get_hash(m_s.SERVICE_USER_PASS + pass_salt),
             email=m_s.SERVICE_USER_EMAIL,
             active=True,
         )
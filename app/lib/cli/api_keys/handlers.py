@@ -0,0 +1,41 @@
+import asyncio
+
+from db.session import async_session
+from service.auth import api_keys
+from service.auth.handlers import get_user_by_email
+from service.exceptions.api.users import UserNotFoundException
+from service.types import ApiKeyScope
+
+
+async def create_api_key_for_user(
+    email: str,
+    scopes: list[ApiKeyScope],
+    name: str | None = None,
+) -> str:
+
+    async with async_session() as db:
+        user = await get_user_by_email(db, email)
+        if not user:
+            raise UserNotFoundException()
+
+        return await api_keys.create_api_key(db, user.id, scopes, name)
+
+
+async def revoke_api_key(key_id: str) -> bool:
+
+    async with async_session() as db:
+        return await api_keys.revoke_api_key(db, key_id)
+
+
+def create_api_key(
+    email: str,
+    scopes: list[ApiKeyScope],
+    name: str | None = None,
+) -> str:
+
+    return asyncio.run(create_api_key_for_user(email, scopes, name))
+
+
+def revoke_api_key_by_id(key_id: str) -> bool:
+
+    return asyncio.run(revoke_api_key(key_id))
@@ -0,0 +1,158 @@
+import asyncio
+import secrets
+import statistics
+import time
+import uuid
+
+from passlib.hash import bcrypt
+
+from service.auth import keys, sessions
+from service.auth.decoders import BENCHMARK_DECODERS
+from service.helpers import utils
+from settings import auth_settings as a_s
+
+
+def build_sample_token(with_claims: bool = False) -> str:
+
+    data = {
+        "email": f"{uuid.uuid4().hex}@example.com",
+        "user_id": 1,
+        "role": "HR_RECRUITER",
+        "device_id": utils.encode_to_base64(
+            "Mozilla/5.0 (X11; Linux x86_64) Gecko/20100101 Firefox/124.0"
+        ),
+    }
+    if with_claims:
+        data["usr"] = {
+            "id": 1,
+            "active": True,
+            "first_name": "Benchmark",
+            "last_name": "Benchmark",
+            "parent_name": None,
+            "photo_link": None,
+            "department_id": 1,
+            "organization_id": 1,
+            "role": data["role"],
+            "is_eula_accepted": True,
+        }
+        data["stamp"] = sessions.get_stamp_seed()
+
+    return utils.create_token(
+        data=data,
+        minutes=int(a_s.ACCESS_TOKEN_EXPIRES_MINUTES),
+        secret_key=keys.access_key.signing_key,
+        algorithm=keys.access_key.algorithm,
+        headers={"kid": keys.access_key.kid},
+    )
+
+
+def benchmark_jwt_decoders(
+    iterations: int,
+    with_claims: bool = False,
+) -> dict[str, float]:
+
+    token = build_sample_token(with_claims)
+    key = keys.access_key
+
+    results = {}
+    for name, decoder in BENCHMARK_DECODERS.items():
+        started_at = time.perf_counter()
+        for _ in range(iterations):
+            decoder.get_header(token)
+            decoder.decode(token, key.verifying_key, key.algorithm)
+
+        results[name] = (time.perf_counter() - started_at) / iterations * 1e6
+
+    return results
+
+
+async def benchmark_session_store(
+    name: str,
+    iterations: int,
+) -> dict[str, float]:
+
+    store = sessions.build_session_store(name)
+    device_id = utils.encode_to_base64("benchmark")
+
+    # negative ids never collide with real users
+    tokens = [
+        (-i, secrets.token_urlsafe(32)) for i in range(1, iterations + 1)
+    ]
+
+    operations = {
+        "create": lambda user_id, token: store.create(
+            sessions.get_session_key(token),
+            user_id,
+            sessions.build_session_record(user_id, device_id),
+            60,
+            device_id,
+        ),
+        "get": lambda user_id, token: store.get(
+            sessions.get_session_key(token)
+        ),
+        "rotate": lambda user_id, token: store.rotate(
+            sessions.get_session_key(token),
+            sessions.get_session_key(token[::-1]),
+            token[::-1],
+            user_id,
+            sessions.build_session_record(user_id, device_id),
+            60,
+            5,
+            device_id,
+        ),
+        "revoke_user": lambda user_id, token: store.revoke_user(user_id),
+    }
+
+    results = {}
+    for operation, func in operations.items():
+        started_at = time.perf_counter()
+        for user_id, token in tokens:
+            await func(user_id, token)
+
+        results[operation] = (
+            (time.perf_counter() - started_at) / iterations * 1e6
+        )
+
+    return results
+
+
+def benchmark_session_stores(
+    names: list[str],
+    iterations: int,
+) -> dict[str, dict[str, float]]:
+
+    return {
+        name: asyncio.run(benchmark_session_store(name, iterations))
+        for name in names
+    }
+
+
+def calibrate_password_hash(
+    budget_ms: int,
+    min_rounds: int,
+    max_rounds: int,
+    iterations: int,
+) -> tuple[int | None, dict[int, float]]:
+
+    secret = secrets.token_urlsafe(16) + secrets.token_hex(8)
+    # the first hash pays for loading the bcrypt backend
+    bcrypt.using(rounds=4).hash(secret)
+
+    timings = {}
+    for rounds in range(min_rounds, max_rounds + 1):
+        hasher = bcrypt.using(rounds=rounds)
+
+        samples = []
+        for _ in range(iterations):
+            started_at = time.perf_counter()
+            hasher.hash(secret)
+            samples.append((time.perf_counter() - started_at) * 1e3)
+
+        timings[rounds] = statistics.median(samples)
+        # every extra round doubles the cost, nothing above fits either
+        if timings[rounds] > budget_ms:
+            break
+
+    fitting = [rounds for rounds, ms in timings.items() if ms <= budget_ms]
+
+    return max(fitting, default=None), timings
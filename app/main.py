@@ -1,11 +1,16 @@
+import asyncio
 import logging.config
+from contextlib import asynccontextmanager
 
 from fastapi import APIRouter, FastAPI
 from starlette.middleware import Middleware
 from starlette.middleware.cors import CORSMiddleware
 
+from settings import auth_settings as a_s
 from settings import main_settings as m_s
+from settings import redis_settings as r_s
 from api.auth.routers import api_router as auth_router
+from api.metrics.routers import api_router as metrics_router
 from api.middleware.exc import HTTPExceptionMiddleware
 from api.organizations.routers import api_router as organizations_router
 from api.users.agreements.routers import api_router as agreement_router
@@ -15,6 +20,9 @@ from api.users.integrations.routers import (
 from api.users.rights.routers import api_router as user_rights_router
 from api.users.routers import api_router as user_router
 from lib.log.settings import LogSettings
+from service.auth import handlers as auth_handlers
+from service.auth import sessions
+from service.helpers.hashing import hashing_pool
 
 logging.config.dictConfig(LogSettings().build())
 
@@ -30,9 +38,28 @@ middleware = [
 ]
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+
+    listeners = [
+        asyncio.create_task(auth_handlers.listen_principal_invalidations()),
+        asyncio.create_task(auth_handlers.watch_api_keys()),
+    ]
+    if bool(r_s.REDIS_CLIENT_CACHE):
+        listeners.append(asyncio.create_task(sessions.track_sessions()))
+    if a_s.ACCESS_TOKEN_KEYRING_FILE:
+        listeners.append(asyncio.create_task(auth_handlers.watch_keyring()))
+
+    yield
+    for listener in listeners:
+        listener.cancel()
+    hashing_pool.shutdown()
+
+
 app = FastAPI(
     title="auth-backend",
     middleware=middleware,
+    lifespan=lifespan,
     openapi_url=f'{m_s.USE_PREFIX}/openapi.json',
     docs_url=f'{m_s.USE_PREFIX}/docs'
 )
@@ -74,4 +101,10 @@ main_api_router.include_router(
     tags=["Agreements"]
 )
 
+main_api_router.include_router(
+    metrics_router,
+    prefix=m_s.USE_PREFIX,
+    tags=["Metrics"]
+)
+
 app.include_router(main_api_router)
@@ -6,6 +6,12 @@ from dotenv import load_dotenv
 from sqlalchemy import engine_from_config, pool
 
 from db.meta import metadata
+from service.auth.models import (
+    AuthRateLimitHit,
+    AuthRotatedSession,
+    AuthSecurityStamp,
+    AuthSession,
+)
 from service.organizations.models import Organization, Department
 from service.rights.models import SpecRights, UserRights
 from service.roles.models import Role, UserRole
@@ -0,0 +1,127 @@
+import asyncio
+import hashlib
+import hmac
+import secrets
+from dataclasses import dataclass
+
+from sqlalchemy import func, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.users.schemas import UserTTInfo
+from db.utils.transactional import transaction
+from service.auth import sessions
+from service.exceptions.api.users import (
+    ApiKeyScopeForbiddenException,
+    InvalidApiKeyException,
+    msg,
+)
+from service.types import ApiKeyScope
+from service.users.models import ApiKey
+from settings import auth_settings as a_s
+
+
+@dataclass(frozen=True)
+class ApiKeyRecord:
+
+    key_id: str
+    key_hash: str
+    scopes: frozenset[str]
+    user: UserTTInfo
+
+
+def hash_api_key_secret(secret: str) -> str:
+
+    return hmac.new(
+        a_s.API_KEY_SECRET.encode(), secret.encode(), hashlib.sha256
+    ).hexdigest()
+
+
+def generate_api_key() -> tuple[str, str, str]:
+
+    key_id = secrets.token_hex(8)
+    secret = secrets.token_urlsafe(32)
+
+    return key_id, hash_api_key_secret(secret), f"{key_id}.{secret}"
+
+
+class ApiKeyTable:
+
+    def __init__(self) -> None:
+
+        self.records: dict[str, ApiKeyRecord] = {}
+        self.user_ids: set[int] = set()
+        self.changed = asyncio.Event()
+
+    def __len__(self) -> int:
+
+        return len(self.records)
+
+    def replace(self, records: list[ApiKeyRecord]) -> None:
+
+        self.records = {record.key_id: record for record in records}
+        self.user_ids = {record.user.id for record in records}
+
+    def authenticate(self, api_key: str, scope: ApiKeyScope) -> UserTTInfo:
+
+        key_id, _, secret = api_key.partition(".")
+
+        # unknown key ids cost the same HMAC as known ones
+        key_hash = hash_api_key_secret(secret)
+
+        record = self.records.get(key_id)
+        if record is None or not hmac.compare_digest(
+            key_hash, record.key_hash
+        ):
+            raise InvalidApiKeyException()
+
+        if scope not in record.scopes:
+            raise ApiKeyScopeForbiddenException(
+                exc_info=msg.api_key_scope_forbidden_text.format(scope)
+            )
+
+        return record.user
+
+
+api_key_table = ApiKeyTable()
+
+
+async def create_api_key(
+    db: AsyncSession,
+    user_id: int,
+    scopes: list[ApiKeyScope],
+    name: str | None = None,
+) -> str:
+
+    key_id, key_hash, api_key = generate_api_key()
+
+    async with transaction(db):
+        db.add(
+            ApiKey(
+                user_id=user_id,
+                key_id=key_id,
+                key_hash=key_hash,
+                name=name,
+                scopes=[str(scope) for scope in scopes],
+            )
+        )
+
+    await sessions.publish_invalidation(sessions.INVALIDATION_API_KEYS)
+    return api_key
+
+
+async def revoke_api_key(db: AsyncSession, key_id: str) -> bool:
+
+    api_key_table.records.pop(key_id, None)
+
+    async with transaction(db):
+        revoked = (
+            await db.execute(
+                update(ApiKey)
+                .where(ApiKey.key_id == key_id, ApiKey.revoked_at.is_(None))
+                .values(revoked_at=func.now())
+                .returning(ApiKey.id)
+            )
+        ).scalar()
+
+    await sessions.publish_invalidation(sessions.INVALIDATION_API_KEYS)
+    return revoked is not None
@@ -0,0 +1,74 @@
+from api.users.schemas import UserTTInfo
+from service.auth import types
+from service.helpers.cache import LRUTTLCache
+from settings import auth_settings as a_s
+
+principal_cache = LRUTTLCache(
+    maxsize=a_s.PRINCIPAL_CACHE_SIZE,
+    ttl=a_s.PRINCIPAL_CACHE_TTL_SECONDS,
+)
+stamp_cache = LRUTTLCache(
+    maxsize=a_s.PRINCIPAL_CACHE_SIZE,
+    ttl=a_s.SECURITY_STAMP_CACHE_TTL_SECONDS,
+)
+decoded_token_cache = LRUTTLCache(
+    maxsize=a_s.DECODED_TOKEN_CACHE_SIZE,
+    ttl=int(a_s.ACCESS_TOKEN_EXPIRES_MINUTES) * 60,
+)
+introspection_cache = LRUTTLCache(
+    maxsize=a_s.INTROSPECTION_CACHE_SIZE,
+    ttl=a_s.INTROSPECTION_NEGATIVE_TTL_SECONDS,
+)
+
+
+def get_claims_key(token: types.AccessTokenTD) -> tuple:
+
+    return token.get("email"), token.get("role")
+
+
+def get_cached_principal(token: types.AccessTokenTD) -> UserTTInfo | None:
+
+    cached = principal_cache.get(token.get("user_id"))
+    if not cached:
+        return None
+
+    claims, user = cached
+    if claims != get_claims_key(token):
+        return None
+
+    return user
+
+
+def cache_principal(token: types.AccessTokenTD, user: UserTTInfo) -> None:
+
+    if token.get("user_id") != user.id:
+        return
+
+    principal_cache.set(user.id, (get_claims_key(token), user))
+
+
+def evict_principal(user_id: int, stamp: int | None = None) -> None:
+
+    principal_cache.pop(user_id)
+    # introspection answers carry the role and active state of the user
+    introspection_cache.pop_if(
+        lambda result: result.get("sub") == str(user_id)
+    )
+
+    if stamp is None:
+        stamp_cache.pop(user_id)
+    else:
+        stamp_cache.set(user_id, stamp)
+
+
+def evict_introspections(session_keys: list[str]) -> None:
+
+    for session_key in session_keys:
+        introspection_cache.pop(session_key)
+
+
+def clear_principals() -> None:
+
+    principal_cache.clear()
+    stamp_cache.clear()
+    introspection_cache.clear()
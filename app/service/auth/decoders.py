@@ -0,0 +1,122 @@
+import base64
+import hashlib
+import hmac
+import json
+import time
+
+from jose import jwt
+from jose.constants import ALGORITHMS
+from jose.exceptions import ExpiredSignatureError, JWTClaimsError, JWTError
+
+from settings import auth_settings as a_s
+
+HMAC_DIGESTS = {
+    ALGORITHMS.HS256: hashlib.sha256,
+    ALGORITHMS.HS384: hashlib.sha384,
+    ALGORITHMS.HS512: hashlib.sha512,
+}
+
+
+def b64decode(value: str) -> bytes:
+
+    return base64.urlsafe_b64decode(value + "=" * (-len(value) % 4))
+
+
+class JoseDecoder:
+
+    name = "jose"
+
+    def get_header(self, token: str) -> dict:
+
+        return jwt.get_unverified_header(token)
+
+    def decode(
+        self,
+        token: str,
+        key: str,
+        algorithm: str,
+        verify_exp: bool = True,
+    ) -> dict:
+
+        return jwt.decode(
+            token,
+            key,
+            algorithms=[algorithm],
+            options={"verify_exp": verify_exp},
+        )
+
+
+class HMACDecoder(JoseDecoder):
+
+    # stdlib-only verification of HS* tokens, anything else goes to jose
+    name = "hmac"
+
+    def get_header(self, token: str) -> dict:
+
+        try:
+            return json.loads(b64decode(token.split(".", 1)[0]))
+        except Exception:
+            raise JWTError("Error decoding token headers.")
+
+    def decode(
+        self,
+        token: str,
+        key: str,
+        algorithm: str,
+        verify_exp: bool = True,
+    ) -> dict:
+
+        digest = HMAC_DIGESTS.get(algorithm)
+        if digest is None:
+            return super().decode(token, key, algorithm, verify_exp)
+
+        try:
+            signing_input, _, signature = token.rpartition(".")
+            header, _, payload = signing_input.partition(".")
+
+            if json.loads(b64decode(header)).get("alg") != algorithm:
+                raise JWTError("The specified alg value is not allowed")
+
+            expected = hmac.new(
+                key.encode(), signing_input.encode(), digest
+            ).digest()
+            if not hmac.compare_digest(expected, b64decode(signature)):
+                raise JWTError("Signature verification failed.")
+
+            claims = json.loads(b64decode(payload))
+        except JWTError:
+            raise
+        except Exception:
+            raise JWTError("Error decoding token.")
+
+        if not isinstance(claims, dict):
+            raise JWTError("Invalid payload string: must be a json object")
+
+        if "aud" in claims:
+            raise JWTClaimsError("Invalid audience")
+
+        now = int(time.time())
+        if "nbf" in claims and claims["nbf"] > now:
+            raise JWTClaimsError("The token is not yet valid (nbf)")
+
+        if verify_exp and "exp" in claims and claims["exp"] < now:
+            raise ExpiredSignatureError("Signature has expired.")
+
+        return claims
+
+
+DECODERS: dict[str, JoseDecoder] = {
+    decoder.name: decoder for decoder in (JoseDecoder(),)
+}
+
+# hand-rolled verification is only ever compared against jose, it never
+# verifies production tokens
+BENCHMARK_DECODERS: dict[str, JoseDecoder] = {
+    **DECODERS,
+    HMACDecoder.name: HMACDecoder(),
+}
+
+
+def get_decoder(name: str | None = None) -> JoseDecoder:
+
+    return DECODERS[name or a_s.JWT_DECODER]
@@ -1,66 +1,172 @@
-from typing import Annotated
+import asyncio
+import logging
+import time
+from typing import Annotated, Callable
 
-import redis.asyncio as aioredis
 from fastapi import Cookie, Depends, Header, Request, Response, status
-from jose import ExpiredSignatureError, jwt
+from jose import ExpiredSignatureError
+from sqlalchemy import RowMapping, Select, func, update
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
-from api.users.schemas import UserTTInfo
-from db.session import get_db
-from service.auth import types
+from api.users.schemas import (
+    UserClaimsInfo,
+    UserTTInfo,
+    UserVerifyBatchResult,
+    UserVerifyInfo,
+)
+from db.session import async_session
+from db.utils.transactional import transaction
+from service.auth import keys, sessions, types
+from service.auth.api_keys import ApiKeyRecord, api_key_table
+from service.auth.cache import (
+    cache_principal,
+    clear_principals,
+    decoded_token_cache,
+    evict_introspections,
+    evict_principal,
+    get_cached_principal,
+    introspection_cache,
+    stamp_cache,
+)
+from service.auth.decoders import get_decoder
 from service.exceptions.api.users import (
+    BaseUserException,
+    EulaMustBeAcceptedException,
     ExpiredUserTokenException,
     InactiveUserException,
     InvalidLoginDataException,
     InvalidUserRoleException,
     InvalidUserTokenException,
+    SessionStoreUnavailableException,
+    TooManyLoginAttemptsException,
     UserNotFoundException,
+    msg,
 )
-from service.helpers import utils
+from service.helpers import hashing, utils
+from service.helpers.singleflight import SingleFlight
 from service.helpers.url_utils import extract_base_url
 from service.organizations.models import Department
-from service.roles.handlers import check_user_role_existence
+from service.rights.index import rights_index
 from service.roles.models import Role, UserRole
 from service.roles.types import RoleType
-from service.types import UserAgreementType
-from service.users.models import User, UserAgreement
+from service.types import ApiKeyScope, UserAgreementType
+from service.users.models import ApiKey, User, UserAgreement
 from settings import auth_settings as a_s
-from settings import redis_settings as r_s
 
-redis = aioredis.from_url(r_s.REDIS_URL, decode_responses=True)
+logger = logging.getLogger(__name__)
+
+# the token carries only what verification responses and checks need
+CLAIMS_FIELDS = {
+    "id",
+    "first_name",
+    "last_name",
+    "parent_name",
+    "photo_link",
+    "role",
+    "department_id",
+    "organization_id",
+    "active",
+    "is_eula_accepted",
+}
+
+principal_flight = SingleFlight()
+
+
+async def get_security_stamp(user_id: int) -> int:
+
+    stamp = stamp_cache.get(user_id)
+    if stamp is None:
+        stamp = await sessions.get_security_stamp(user_id)
+        stamp_cache.set(user_id, stamp)
+
+    return stamp
 
 
-async def create_tokens_pair(
+async def issue_security_stamp(user_id: int) -> int:
+
+    stamp = stamp_cache.get(user_id)
+    if not stamp:
+        stamp = await sessions.seed_security_stamp(user_id)
+        stamp_cache.set(user_id, stamp)
+
+    return stamp
+
+
+def get_device_id(user_agent: str | None) -> str:
+
+    return utils.encode_to_base64(user_agent or "")
+
+
+async def mint_access_token(
     user: UserTTInfo | User,
     user_role: RoleType,
-    user_agent: str | None = None
-) -> tuple[types.AccessToken, types.RefreshToken]:
-
-    access_token = utils.create_token(
-        data={
-            "email": user.email,
-            "user_id": user.id,
-            "role": user_role,
-            "device_id": utils.encode_to_base64(user_agent)
-        },
+    user_agent: str | None = None,
+    stamp: int | None = None,
+) -> types.AccessToken:
+
+    data = {
+        "email": user.email,
+        "user_id": user.id,
+        "role": user_role,
+        "device_id": get_device_id(user_agent)
+    }
+    # the stamp has to be read before the user was loaded: one read after it
+    # would pair claims from before an invalidation with the bumped stamp
+    if (
+        bool(a_s.CLAIMS_VERIFY)
+        and isinstance(user, UserTTInfo)
+        and stamp is not None
+    ):
+        data["usr"] = user.model_dump(mode="json", include=CLAIMS_FIELDS)
+        data["stamp"] = stamp
+
+    return utils.create_token(
+        data=data,
         minutes=int(a_s.ACCESS_TOKEN_EXPIRES_MINUTES),
-        secret_key=a_s.ACCESS_TOKEN_SECRET_KEY,
-        algorithm=a_s.TOKENS_ALGORITHM,
+        secret_key=keys.access_key.signing_key,
+        algorithm=keys.access_key.algorithm,
+        headers={"kid": keys.access_key.kid},
     )
-    refresh_token = utils.create_token(
-        data={"email": user.email},
-        minutes=int(a_s.REFRESH_TOKEN_EXPIRES_MINUTES),
-        secret_key=a_s.REFRESH_TOKEN_SECRET_KEY,
-        algorithm=a_s.TOKENS_ALGORITHM,
+
+
+async def start_session(
+    user: UserTTInfo | User,
+    user_role: RoleType,
+    user_agent: str | None = None,
+    stamp: int | None = None,
+) -> types.AccessToken:
+
+    access_token = await mint_access_token(user, user_role, user_agent, stamp)
+
+    await sessions.create_session(
+        access_token, user.id, get_device_id(user_agent)
     )
+    return access_token
+
+
+async def rotate_tokens_pair(
+    access_token: types.AccessToken,
+    user: UserTTInfo,
+    user_agent: str | None = None,
+    stamp: int | None = None,
+) -> types.AccessToken:
 
-    await redis.set(
+    # signing is cheap, minting before the rotation keeps it one store call
+    new_access_token = await mint_access_token(
+        user, user.role, user_agent, stamp
+    )
+    rotated_access_token = await sessions.rotate_session(
         access_token,
-        refresh_token,
-        int(a_s.REFRESH_TOKEN_EXPIRES_MINUTES) * 60
+        new_access_token,
+        user.id,
+        get_device_id(user_agent),
     )
-    return access_token, refresh_token
+    if not rotated_access_token:
+        raise ExpiredUserTokenException()
+
+    return rotated_access_token
 
 
 async def get_user_by_email(
@@ -71,62 +177,55 @@ async def get_user_by_email(
     return (await db.execute(select(User).where(User.email == email))).scalar()
 
 
-async def get_user_info(
-    db: AsyncSession,
-    email: str
-) -> UserTTInfo:
-    organization_id_sub_query = select(
-        Department.id, Department.organization_id
-    ).select_from(Department).subquery()
-
-    role_name_sub_query = select(
-        UserRole.user_id, Role.rolename
-    ).join(
-        Role, UserRole.role_id == Role.id
-    ).subquery()
-
-    fields = [
-        User.id,
-        User.active,
-        User.email,
-        User.first_name,
-        User.department_id,
-        User.photo_link,
-        User.last_name,
-        User.parent_name,
-        User.phone_number,
-        User.is_internal,
-        organization_id_sub_query.c.organization_id,
-        role_name_sub_query.c.rolename.label("role")
-    ]
+def get_user_info_query(where_conds: list, *columns) -> Select:
 
-    query = (
-        select(*fields)
-        .where(User.email == email)
-        .outerjoin(
-            organization_id_sub_query,
-            User.department_id == organization_id_sub_query.c.id
-        ).outerjoin(
-            role_name_sub_query,
-            User.id == role_name_sub_query.c.user_id
-        ).group_by(*fields)
+    role_query = (
+        select(Role.rolename)
+        .join(UserRole, UserRole.role_id == Role.id)
+        .where(UserRole.user_id == User.id)
+        .order_by(UserRole.id.desc())
+        .limit(1)
+        .scalar_subquery()
     )
 
-    user = (await db.execute(query)).mappings().one_or_none()
+    agreements_query = (
+        select(func.array_agg(UserAgreement.agreement_type))
+        .where(
+            UserAgreement.user_id == User.id,
+            UserAgreement.organization_id == Department.organization_id
+        )
+        .scalar_subquery()
+    )
 
-    if not user:
-        raise UserNotFoundException()
+    return (
+        select(
+            User.id,
+            User.active,
+            User.email,
+            User.first_name,
+            User.department_id,
+            User.photo_link,
+            User.last_name,
+            User.parent_name,
+            User.phone_number,
+            User.is_internal,
+            Department.organization_id,
+            role_query.label("role"),
+            agreements_query.label("agreement_types"),
+            *columns,
+        )
+        .select_from(User)
+        .outerjoin(Department, User.department_id == Department.id)
+        .where(*where_conds)
+    )
+
+
+def build_user_info(row: RowMapping | dict) -> UserTTInfo:
+
+    user = dict(row)
+    agreements = user.pop("agreement_types") or []
 
     if not bool(a_s.SKIP_AGREEMENT):
-        agreements_query = (
-            select(UserAgreement.agreement_type)
-            .where(
-                UserAgreement.user_id == user.id,
-                UserAgreement.organization_id == user.organization_id
-            )
-        )
-        agreements = await db.execute(agreements_query)
-        agreements = agreements.scalars().all()
         is_eula_accepted = UserAgreementType.EULA in agreements
     else:
         is_eula_accepted = True
@@ -137,65 +236,350 @@ async def get_user_info(
     )
 
 
-async def decode_token(
+async def get_user_info(
+    db: AsyncSession,
+    email: str
+) -> UserTTInfo:
+
+    user = (
+        await db.execute(get_user_info_query([User.email == email]))
+    ).mappings().one_or_none()
+
+    if not user:
+        raise UserNotFoundException()
+
+    return build_user_info(user)
+
+
+async def get_users_info(
+    db: AsyncSession,
+    emails: list[str]
+) -> dict[str, UserTTInfo]:
+
+    users = (
+        await db.execute(get_user_info_query([User.email.in_(emails)]))
+    ).mappings().all()
+
+    return {user.email: build_user_info(user) for user in users}
+
+
+async def decode_access_token(
     token: str,
-    secret_key: str,
-) -> dict | None:
+    verify_exp: bool = True,
+) -> types.AccessTokenTD | None:
+
+    digest = utils.get_digest(token) if isinstance(token, str) else None
+    if verify_exp and digest:
+        cached = decoded_token_cache.get(digest)
+        if cached is not None:
+            kid, claims = cached
+            # the key may have been retired since the token was cached
+            keys.get_access_key(kid)
+            return claims
+
+    decoder = get_decoder()
     try:
-        return jwt.decode(
+        kid = decoder.get_header(token).get("kid")
+        key = keys.get_access_key(kid)
+
+        claims = decoder.decode(
             token,
-            secret_key,
-            algorithms=[a_s.TOKENS_ALGORITHM]
+            key.verifying_key,
+            key.algorithm,
+            verify_exp=verify_exp,
         )
     except ExpiredSignatureError:
         return None
     except Exception:
         raise InvalidUserTokenException()
 
+    if verify_exp and isinstance(claims.get("exp"), int):
+        decoded_token_cache.set(
+            digest,
+            (kid, claims),
+            min(claims["exp"], key.retires_at or claims["exp"]) - time.time()
+        )
 
-async def get_user_from_token(
+    return claims
+
+
+async def get_user_from_claims(
+    token: types.ClaimsAccessTokenTD
+) -> UserClaimsInfo | None:
+
+    # stamps are seeded above zero, a zero stamp was never issued
+    if "usr" not in token or not token.get("stamp"):
+        return None
+
+    try:
+        stamp = await get_security_stamp(token["user_id"])
+    except SessionStoreUnavailableException:
+        # degraded mode: trust the signed claims until the store is back
+        stamp = token["stamp"]
+
+    if token["stamp"] != stamp:
+        return None
+
+    return UserClaimsInfo(**token["usr"], email=token["email"])
+
+
+def check_eula_accepted(user: UserTTInfo) -> None:
+
+    if not bool(a_s.SKIP_AGREEMENT):
+        if (
+            user.role != RoleType.SERVICE_USER
+            and not user.is_eula_accepted
+        ):
+            raise EulaMustBeAcceptedException()
+
+
+async def verify_tokens(
     db: AsyncSession,
-    request: Request,
-    response: Response,
+    access_tokens: list[types.AccessToken]
+) -> list[UserTTInfo | BaseUserException]:
+
+    results: list[types.AccessTokenTD | UserTTInfo | BaseUserException] = []
+    for access_token in access_tokens:
+        try:
+            token = await decode_access_token(access_token)
+            if not token:
+                raise ExpiredUserTokenException()
+
+            user = None
+            if bool(a_s.CLAIMS_VERIFY):
+                user = await get_user_from_claims(token)
+            results.append(user or get_cached_principal(token) or token)
+
+        except BaseUserException as exc:
+            results.append(exc)
+
+    emails = {item["email"] for item in results if isinstance(item, dict)}
+    users = await get_users_info(db, list(emails)) if emails else {}
+
+    for i, item in enumerate(results):
+        try:
+            if isinstance(item, dict):
+                user = users.get(item["email"])
+                if not user:
+                    raise UserNotFoundException()
+
+                if user.role != item["role"]:
+                    raise InvalidUserRoleException()
+
+                cache_principal(item, user)
+                item = user
+
+            if isinstance(item, UserTTInfo):
+                if not item.active:
+                    raise InactiveUserException()
+                check_eula_accepted(item)
+
+        except BaseUserException as exc:
+            item = exc
+
+        results[i] = item
+
+    return results
+
+
+def build_verify_result(
+    result: UserTTInfo | BaseUserException
+) -> UserVerifyBatchResult:
+
+    if isinstance(result, BaseUserException):
+        return UserVerifyBatchResult(
+            is_valid=False,
+            exc_state=result.exc_state,
+            exc_info=result.exc_info,
+        )
+
+    return UserVerifyBatchResult(
+        is_valid=True,
+        user=UserVerifyInfo(**result.model_dump()),
+    )
+
+
+async def get_introspected_user(
+    token: types.AccessTokenTD
+) -> UserTTInfo | None:
+
+    user = get_cached_principal(token)
+    if not user:
+        async with async_session() as db:
+            try:
+                user = await get_user_info(db, token["email"])
+            except UserNotFoundException:
+                return None
+
+        if user.role != token["role"]:
+            return None
+
+        cache_principal(token, user)
+
+    return user if user.active else None
+
+
+async def introspect_token(
     access_token: types.AccessToken
-) -> UserTTInfo:
+) -> types.IntrospectionTD:
+
+    session_key = sessions.get_session_key(access_token)
+
+    cached = introspection_cache.get(session_key)
+    if cached is not None:
+        return cached
+
+    try:
+        token = await decode_access_token(access_token)
+    except InvalidUserTokenException:
+        token = None
+
+    try:
+        session = await sessions.get_session(access_token) if token else None
+    except SessionStoreUnavailableException:
+        # degraded mode: skip the session but not the principal check, and
+        # do not cache the answer
+        if not await get_introspected_user(token):
+            return {"active": False}
+
+        return {
+            "active": True,
+            "sub": str(token["user_id"]),
+            "username": token["email"],
+            "role": token["role"],
+            "token_type": "Bearer",
+            "exp": token["exp"],
+        }
+
+    user = await get_introspected_user(token) if token and session else None
 
-    token: types.AccessTokenTD = await decode_token(
-        access_token, a_s.ACCESS_TOKEN_SECRET_KEY
+    if not user:
+        result: types.IntrospectionTD = {"active": False}
+        introspection_cache.set(session_key, result)
+        return result
+
+    result = {
+        "active": True,
+        "sub": str(token["user_id"]),
+        "username": token["email"],
+        "role": token["role"],
+        "token_type": "Bearer",
+        "iat": session["issued_at"],
+        "exp": token["exp"],
+    }
+    introspection_cache.set(
+        session_key,
+        result,
+        min(token["exp"] - time.time(), a_s.INTROSPECTION_POSITIVE_TTL_SECONDS)
     )
 
-    origin = extract_base_url(request.headers.get('origin'))
-    referer = extract_base_url(request.headers.get('referer'))
-    host = extract_base_url(request.headers.get('host'))
+    return result
 
-    domain = f'{origin or referer or host or a_s.DOMAIN_URL}'
 
-    if 'localhost' in domain:
-        domain = None
+async def load_principal(
+    db: AsyncSession,
+    access_token: types.AccessToken,
+    user_agent: str | None = None,
+    use_claims: bool = False,
+) -> tuple[UserTTInfo, types.AccessToken | None]:
+
+    token: types.AccessTokenTD = await decode_access_token(access_token)
 
     if not token:
-        refresh_token: str = await redis.get(access_token)
-        if not refresh_token:
-            raise ExpiredUserTokenException()
+        token = await decode_access_token(access_token, verify_exp=False)
+
+        stamp = user = None
+        if bool(a_s.CLAIMS_VERIFY):
+            # a cached principal may predate the stamp, load it after
+            stamp = await issue_security_stamp(token["user_id"])
+        else:
+            user = get_cached_principal(token)
+
+        if not user:
+            user = await get_user_info(db, token['email'])
+
+            if not user:
+                raise UserNotFoundException()
 
-        token: types.RefreshTokenTD = await decode_token(
-            refresh_token, a_s.REFRESH_TOKEN_SECRET_KEY
+            if user.role != token["role"]:
+                raise InvalidUserRoleException()
+
+        return user, await rotate_tokens_pair(
+            access_token, user, user_agent, stamp
         )
-        if not token:
-            raise ExpiredUserTokenException()
 
+    user = None
+    if use_claims and bool(a_s.CLAIMS_VERIFY):
+        user = await get_user_from_claims(token)
+
+    if not user:
+        user = get_cached_principal(token)
+
+    if not user:
         user = await get_user_info(db, token['email'])
+
         if not user:
             raise UserNotFoundException()
 
-        await redis.delete(access_token)
-        access_token, _ = await create_tokens_pair(
-            user, user.role, request.headers.get('user-agent')
-        )
+        if user.role != token["role"]:
+            raise InvalidUserRoleException()
+
+        cache_principal(token, user)
+
+    return user, None
+
 
+async def load_shared_principal(
+    access_token: types.AccessToken,
+    user_agent: str | None = None,
+    use_claims: bool = False,
+) -> tuple[UserTTInfo, types.AccessToken | None]:
+
+    # the load outlives any single caller, so it cannot borrow their session
+    async with async_session() as db:
+        return await load_principal(db, access_token, user_agent, use_claims)
+
+
+async def resolve_principal(
+    access_token: types.AccessToken,
+    user_agent: str | None = None,
+    use_claims: bool = False,
+) -> tuple[UserTTInfo, types.AccessToken | None]:
+
+    if not access_token:
+        raise InvalidUserTokenException()
+
+    # a rotation is bound to the device, only share it with the same one
+    return await principal_flight.do(
+        (access_token, user_agent, use_claims),
+        lambda: load_shared_principal(access_token, user_agent, use_claims)
+    )
+
+
+async def get_user_from_token(
+    request: Request,
+    response: Response,
+    access_token: types.AccessToken,
+    use_claims: bool = False,
+) -> UserTTInfo:
+
+    user, rotated_access_token = await resolve_principal(
+        access_token, request.headers.get('user-agent'), use_claims
+    )
+
+    origin = extract_base_url(request.headers.get('origin'))
+    referer = extract_base_url(request.headers.get('referer'))
+    host = extract_base_url(request.headers.get('host'))
+
+    domain = f'{origin or referer or host or a_s.DOMAIN_URL}'
+
+    if 'localhost' in domain:
+        domain = None
+
+    if rotated_access_token:
         response.set_cookie(
             a_s.COOKIE_SESSION_KEY,
-            access_token,
+            rotated_access_token,
             expires=int(a_s.REFRESH_TOKEN_EXPIRES_MINUTES) * 60,
 
             domain=domain,
@@ -205,18 +589,6 @@ async def get_user_from_token(
         )
         return user
 
-    user = await get_user_info(db, token['email'])
-
-    if not user:
-        raise UserNotFoundException()
-
-    role = await check_user_role_existence(
-        db=db,
-        role=token["role"]
-    )
-    if user.role != role.rolename:
-        raise InvalidUserRoleException()
-
     response.set_cookie(
         a_s.COOKIE_SESSION_KEY,
         access_token,
@@ -230,8 +602,32 @@ async def get_user_from_token(
     return user
 
 
+def get_principal_headers(user: UserTTInfo) -> dict[str, str]:
+
+    headers = {
+        "X-Auth-User-Id": str(user.id),
+        "X-Auth-Role": user.role,
+    }
+    if user.organization_id is not None:
+        headers["X-Auth-Organization-Id"] = str(user.organization_id)
+
+    return headers
+
+
+def get_client_ip(request: Request) -> str | None:
+
+    if a_s.LOGIN_CLIENT_IP_HEADER:
+        # the gateway appends the address it saw, earlier entries are
+        # whatever the client sent
+        forwarded = request.headers.get(a_s.LOGIN_CLIENT_IP_HEADER)
+        if not forwarded:
+            return None
+        return forwarded.split(",")[-1].strip() or None
+
+    return request.client.host if request.client else None
+
+
 async def get_user_from_cookie(
-    db: Annotated[AsyncSession, Depends(get_db)],
     request: Request,
     response: Response,
     access_token: types.AccessToken | None = Cookie(
@@ -243,11 +639,10 @@ async def get_user_from_cookie(
     if bool(int(a_s.SKIP_AUTH)):
         return True
 
-    return await get_user_from_token(db, request, response, access_token)
+    return await get_user_from_token(request, response, access_token)
 
 
 async def get_user_from_header(
-    db: Annotated[AsyncSession, Depends(get_db)],
     request: Request,
     response: Response,
     access_token: Annotated[
@@ -257,39 +652,265 @@ async def get_user_from_header(
 ) -> UserTTInfo:
 
     return await get_user_from_token(
-        db, request, response, access_token.split(' ')[-1]
+        request, response, access_token.split(' ')[-1], use_claims=True
     )
 
 
-async def logout(access_token: str) -> bool | None:
+async def invalidate_user_principal(user_id: int) -> None:
 
+    evict_principal(user_id)
     try:
-        await redis.delete(access_token)
-    except aioredis.DataError:
-        return True
+        stamp = await sessions.incr_security_stamp(user_id)
+        evict_principal(user_id, stamp)
+        await sessions.publish_invalidation(
+            sessions.INVALIDATION_PRINCIPAL, user_id, stamp
+        )
+    except SessionStoreUnavailableException:
+        # other workers pick the change up when their principal cache expires
+        logger.warning("Principal of user %s invalidated locally only", user_id)
+
+
+def apply_invalidation(message: str) -> None:
+
+    kind, _, payload = message.partition(":")
+
+    if kind == sessions.INVALIDATION_PRINCIPAL:
+        user_id, stamp = payload.split()
+        evict_principal(int(user_id), int(stamp))
+
+        if int(user_id) in api_key_table.user_ids:
+            api_key_table.changed.set()
+
+    elif kind == sessions.INVALIDATION_SESSIONS:
+        evict_introspections(payload.split())
+
+    elif kind == sessions.INVALIDATION_API_KEYS:
+        api_key_table.changed.set()
+
+    elif kind == sessions.INVALIDATION_RIGHTS:
+        rights_index.evict(list(map(int, payload.split())) or None)
+
+
+async def listen_principal_invalidations() -> None:
+
+    while True:
+        try:
+            async for message in sessions.listen_invalidations():
+                apply_invalidation(message)
+
+        except asyncio.CancelledError:
+            raise
+
+        except Exception as exc:
+            logger.exception(exc, exc_info=True)
+            # messages may have been lost while disconnected
+            clear_principals()
+            rights_index.evict()
+            await asyncio.sleep(1)
+
+
+async def watch_keyring() -> None:
+
+    while True:
+        await asyncio.sleep(a_s.ACCESS_TOKEN_KEYRING_RELOAD_SECONDS)
+        try:
+            if keys.reload_keyring():
+                logger.info(
+                    "Access token keyring reloaded, active key %s",
+                    keys.access_key.kid
+                )
+        except Exception as exc:
+            logger.exception(exc, exc_info=True)
+
+
+async def load_api_keys(db: AsyncSession) -> list[ApiKeyRecord]:
+
+    api_keys = (
+        await db.execute(
+            select(
+                ApiKey.key_id,
+                ApiKey.key_hash,
+                ApiKey.scopes,
+                ApiKey.user_id,
+            )
+            .where(ApiKey.revoked_at.is_(None))
+        )
+    ).all()
+    if not api_keys:
+        return []
+
+    users = (
+        await db.execute(
+            get_user_info_query([
+                User.id.in_({api_key.user_id for api_key in api_keys}),
+                User.active.is_(True),
+            ])
+        )
+    ).mappings().all()
+    users = {user.id: build_user_info(user) for user in users}
+
+    return [
+        ApiKeyRecord(
+            key_id=api_key.key_id,
+            key_hash=api_key.key_hash,
+            scopes=frozenset(api_key.scopes),
+            user=users[api_key.user_id],
+        )
+        for api_key in api_keys
+        if api_key.user_id in users
+    ]
+
+
+async def watch_api_keys() -> None:
+
+    while True:
+        api_key_table.changed.clear()
+        try:
+            async with async_session() as db:
+                api_key_table.replace(await load_api_keys(db))
+
+        except Exception as exc:
+            logger.exception(exc, exc_info=True)
+
+        try:
+            await asyncio.wait_for(
+                api_key_table.changed.wait(),
+                a_s.API_KEYS_RELOAD_SECONDS
+            )
+        except asyncio.TimeoutError:
+            pass
+
+
+def get_active_user_from_api_key_or_header(scope: ApiKeyScope) -> Callable:
+
+    async def dependency(
+        request: Request,
+        response: Response,
+        api_key: Annotated[
+            str | None,
+            Header(alias=a_s.API_KEY_HEADER)
+        ] = None,
+        access_token: Annotated[
+            types.AccessToken | None,
+            Header(alias="Authorization")
+        ] = None,
+    ) -> UserTTInfo:
+
+        if api_key:
+            return api_key_table.authenticate(api_key, scope)
+
+        if not access_token:
+            raise InvalidUserTokenException()
+
+        user = await get_user_from_token(
+            request, response, access_token.split(' ')[-1]
+        )
+        if user and user.active:
+            return user
+        raise InactiveUserException()
+
+    return dependency
+
+
+async def logout(access_token: str | None) -> None:
+
+    try:
+        token = await decode_access_token(access_token, verify_exp=False)
+    except InvalidUserTokenException:
+        token = {}
+
+    await sessions.revoke_session(access_token, token.get("user_id"))
+
+
+async def logout_all(user: UserTTInfo) -> int:
+
+    return await sessions.revoke_user_sessions(user.id)
+
+
+async def get_user_sessions(
+    user: UserTTInfo,
+    access_token: types.AccessToken | None = None
+) -> list[dict]:
+
+    current_keys = []
+    if access_token:
+        current_keys = [sessions.get_session_key(access_token), access_token]
+
+    return [
+        {
+            "user_agent": utils.decode_from_base64(session["device_id"]),
+            "expires_in": session["expires_in"],
+            "is_current": session["session_key"] in current_keys,
+        }
+        for session in await sessions.get_user_sessions(user.id)
+    ]
 
 
 async def login(
     db: AsyncSession,
     password: str,
     email: str,
-    user_agent: str | None = None
-) -> types.AccessToken:
+    user_agent: str | None = None,
+    client_ip: str | None = None,
+) -> tuple[types.AccessToken, UserTTInfo]:
+
+    if not await sessions.hit_login_rate_limit(email, client_ip):
+        raise TooManyLoginAttemptsException(
+            exc_info=msg.too_many_login_attempts_text.format(
+                a_s.LOGIN_RATE_LIMIT_WINDOW_SECONDS
+            )
+        )
 
-    user = await get_user_by_email(db, email)
-    if not user:
+    row = (
+        await db.execute(
+            get_user_info_query(
+                [User.email == email], User.password, User.pass_salt
+            )
+        )
+    ).mappings().one_or_none()
+    if not row:
         raise UserNotFoundException()
-    if not user.active:
+    if not row.active:
         raise InactiveUserException(status_code=status.HTTP_401_UNAUTHORIZED)
 
-    pass_is_valid = utils.verify_hash(password + user.pass_salt, user.password)
+    pass_is_valid, new_hash = await hashing.verify_and_update_hash(
+        password + row.pass_salt, row.password
+    )
     if not pass_is_valid:
         raise InvalidLoginDataException()
 
-    access_token, _ = await create_tokens_pair(
-        user, user.role.rolename, user_agent
-    )
-    return access_token
+    # the stored hash was made with other rounds than PASSWORD_HASH_ROUNDS
+    # best effort: the password was checked, the next login retries the rehash
+    if new_hash:
+        try:
+            async with transaction(db):
+                await db.execute(
+                    update(User)
+                    .where(User.id == row.id)
+                    .values(password=new_hash)
+                )
+        except SQLAlchemyError:
+            logger.exception("Could not rehash the password of %s", row.id)
+
+    user_info = dict(row)
+    del user_info["password"], user_info["pass_salt"]
+    user = build_user_info(user_info)
+
+    stamp = None
+    if bool(a_s.CLAIMS_VERIFY):
+        # the row was read before bcrypt, claims need one read after the stamp
+        stamp = await issue_security_stamp(user.id)
+        user = await get_user_info(db, email)
+        if not user.active:
+            raise InactiveUserException(
+                status_code=status.HTTP_401_UNAUTHORIZED
+            )
+
+    if not user.role:
+        raise InvalidUserRoleException()
+
+    access_token = await start_session(user, user.role, user_agent, stamp)
+    return access_token, user
 
 
 async def get_active_user_from_header(
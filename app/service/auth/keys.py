@@ -0,0 +1,204 @@
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass
+
+from jose import jwk
+from jose.constants import ALGORITHMS
+
+from service.auth.cache import decoded_token_cache, introspection_cache
+from service.exceptions.api.users import InvalidUserTokenException
+from settings import auth_settings as a_s
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class TokenKey:
+
+    kid: str
+    algorithm: str
+    signing_key: str | None
+    verifying_key: str
+    retires_at: float | None = None
+
+    @property
+    def is_asymmetric(self) -> bool:
+
+        return self.algorithm not in ALGORITHMS.HMAC
+
+    @property
+    def is_retired(self) -> bool:
+
+        return self.retires_at is not None and self.retires_at <= time.time()
+
+    def to_jwk(self) -> dict:
+
+        return {
+            **(
+                jwk.construct(self.verifying_key, self.algorithm)
+                .public_key()
+                .to_dict()
+            ),
+            "kid": self.kid,
+            "use": "sig",
+        }
+
+
+def build_key(
+    kid: str,
+    algorithm: str,
+    secret_key: str | None = None,
+    private_key: str | None = None,
+    public_key: str | None = None,
+    retires_at: float | None = None,
+) -> TokenKey:
+
+    if algorithm in ALGORITHMS.HMAC:
+        return TokenKey(
+            kid=kid,
+            algorithm=algorithm,
+            signing_key=secret_key,
+            verifying_key=secret_key,
+            retires_at=retires_at,
+        )
+
+    if not public_key:
+        public_key = (
+            jwk.construct(private_key, algorithm)
+            .public_key()
+            .to_pem()
+            .decode()
+        )
+
+    return TokenKey(
+        kid=kid,
+        algorithm=algorithm,
+        signing_key=private_key,
+        verifying_key=public_key,
+        retires_at=retires_at,
+    )
+
+
+def build_access_key() -> TokenKey:
+
+    return build_key(
+        kid=a_s.ACCESS_TOKEN_KEY_ID,
+        algorithm=a_s.ACCESS_TOKEN_ALGORITHM or a_s.TOKENS_ALGORITHM,
+        secret_key=a_s.ACCESS_TOKEN_SECRET_KEY,
+        private_key=a_s.ACCESS_TOKEN_PRIVATE_KEY,
+        public_key=a_s.ACCESS_TOKEN_PUBLIC_KEY,
+    )
+
+
+def load_keyring() -> tuple[TokenKey, dict[str, TokenKey]]:
+
+    if not a_s.ACCESS_TOKEN_KEYRING_FILE:
+        key = build_access_key()
+        return key, {key.kid: key}
+
+    with open(a_s.ACCESS_TOKEN_KEYRING_FILE) as keyring_file:
+        data = json.load(keyring_file)
+
+    ring = {
+        item["kid"]: build_key(
+            kid=item["kid"],
+            algorithm=item.get("algorithm", a_s.TOKENS_ALGORITHM),
+            secret_key=item.get("secret_key"),
+            private_key=item.get("private_key"),
+            public_key=item.get("public_key"),
+            retires_at=item.get("retires_at"),
+        )
+        for item in data["keys"]
+    }
+
+    active = ring[data["active"]]
+    if not active.signing_key or active.is_retired:
+        raise ValueError(f"Key {active.kid} can not sign access tokens")
+
+    return active, ring
+
+
+def get_keyring_mtime() -> int | None:
+
+    if not a_s.ACCESS_TOKEN_KEYRING_FILE:
+        return None
+
+    return os.stat(a_s.ACCESS_TOKEN_KEYRING_FILE).st_mtime_ns
+
+
+keyring_mtime = get_keyring_mtime()
+keyring_missed_at = 0.0
+access_key, keyring = load_keyring()
+
+
+def reload_keyring() -> bool:
+
+    global access_key, keyring, keyring_mtime
+
+    mtime = get_keyring_mtime()
+    if mtime == keyring_mtime:
+        return False
+
+    access_key, keyring = load_keyring()
+    keyring_mtime = mtime
+
+    # cached results may rely on keys that are gone now
+    decoded_token_cache.clear()
+    introspection_cache.clear()
+
+    return True
+
+
+def reload_keyring_on_miss() -> None:
+
+    global keyring_missed_at
+
+    # Another worker may already sign with a key this one has not polled
+    # yet. Look at the file right away, but at most once per interval so
+    # tokens with made-up kids can not hammer it.
+    now = time.monotonic()
+    if now - keyring_missed_at < a_s.ACCESS_TOKEN_KEYRING_MISS_RELOAD_SECONDS:
+        return
+
+    keyring_missed_at = now
+    try:
+        if reload_keyring():
+            logger.info(
+                "Access token keyring reloaded on unknown kid, active key %s",
+                access_key.kid
+            )
+    except Exception as exc:
+        logger.exception(exc, exc_info=True)
+
+
+def get_access_key(kid: str | None = None) -> TokenKey:
+
+    # tokens issued before kid headers were signed with the configured key
+    kid = kid or a_s.ACCESS_TOKEN_KEY_ID
+
+    if kid == access_key.kid:
+        return access_key
+
+    key = keyring.get(kid)
+    if key is None:
+        reload_keyring_on_miss()
+        key = keyring.get(kid)
+
+    if key is None or key.is_retired:
+        raise InvalidUserTokenException()
+
+    return key
+
+
+def get_jwks() -> dict:
+
+    published = [access_key] + [
+        key for key in keyring.values()
+        if key.kid != access_key.kid and not key.is_retired
+    ]
+
+    return {
+        "keys": [key.to_jwk() for key in published if key.is_asymmetric]
+    }
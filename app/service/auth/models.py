@@ -0,0 +1,46 @@
+from sqlalchemy import BigInteger, Column, DateTime, Integer, String
+
+from db.meta import Base
+
+
+# UNLOGGED: session state is disposable and must not pay for WAL writes
+class AuthSession(Base):
+
+    __tablename__ = "auth_session"
+    __table_args__ = {"prefixes": ["UNLOGGED"]}
+
+    session_key = Column(String, primary_key=True)
+    user_id = Column(Integer, nullable=False, index=True)
+
+    record = Column(String, nullable=False)
+    device_id = Column(String, nullable=False)
+    expires_at = Column(DateTime, nullable=False)
+
+
+class AuthRotatedSession(Base):
+
+    __tablename__ = "auth_rotated_session"
+    __table_args__ = {"prefixes": ["UNLOGGED"]}
+
+    session_key = Column(String, primary_key=True)
+    access_token = Column(String, nullable=False)
+    expires_at = Column(DateTime, nullable=False)
+
+
+class AuthSecurityStamp(Base):
+
+    __tablename__ = "auth_security_stamp"
+    __table_args__ = {"prefixes": ["UNLOGGED"]}
+
+    user_id = Column(Integer, primary_key=True)
+    stamp = Column(BigInteger, nullable=False, server_default="0")
+
+
+class AuthRateLimitHit(Base):
+
+    __tablename__ = "auth_rate_limit_hit"
+    __table_args__ = {"prefixes": ["UNLOGGED"]}
+
+    id = Column(BigInteger, primary_key=True)
+    key = Column(String, nullable=False, index=True)
+    expires_at = Column(DateTime, nullable=False, index=True)
@@ -0,0 +1,75 @@
+# KEYS: session key, user sessions index, indexed sessions to sweep
+# ARGV: session record, session ttl, device id
+CREATE_SESSION = """
+for i = 3, #KEYS do
+    if redis.call('EXISTS', KEYS[i]) == 0 then
+        redis.call('HDEL', KEYS[2], KEYS[i])
+    end
+end
+
+redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[2])
+redis.call('HSET', KEYS[2], KEYS[1], ARGV[3])
+redis.call('EXPIRE', KEYS[2], ARGV[2])
+"""
+
+# KEYS: old session key, legacy session key (raw access token),
+#       grace key of the old session, new session key, user sessions index
+# ARGV: new access token, new session record, session ttl, grace ttl, device id
+# returns the new access token if this caller rotated the session, otherwise
+# the token a concurrent rotation stored for the grace window
+ROTATE_SESSION = """
+local rotated = redis.call('GET', KEYS[3])
+if rotated then
+    return rotated
+end
+
+local session = KEYS[1]
+if redis.call('EXISTS', session) == 0 then
+    session = KEYS[2]
+    if redis.call('EXISTS', session) == 0 then
+        return false
+    end
+end
+
+redis.call('DEL', session)
+redis.call('SET', KEYS[4], ARGV[2], 'EX', ARGV[3])
+redis.call('SET', KEYS[3], ARGV[1], 'EX', ARGV[4])
+
+redis.call('HDEL', KEYS[5], session)
+redis.call('HSET', KEYS[5], KEYS[4], ARGV[5])
+redis.call('EXPIRE', KEYS[5], ARGV[3])
+
+return ARGV[1]
+"""
+
+# KEYS: user sessions index, indexed sessions to revoke
+REVOKE_USER_SESSIONS = """
+for i = 2, #KEYS do
+    redis.call('DEL', KEYS[i])
+    redis.call('HDEL', KEYS[1], KEYS[i])
+end
+
+if redis.call('HLEN', KEYS[1]) == 0 then
+    redis.call('DEL', KEYS[1])
+end
+"""
+
+# KEYS: sliding window per throttled subject
+# ARGV: now in ms, window in ms, attempt id, limit of every key in KEYS order
+# records the attempt and returns 1 only if every window is under its limit
+HIT_RATE_LIMIT = """
+local since = tonumber(ARGV[1]) - tonumber(ARGV[2])
+for i, key in ipairs(KEYS) do
+    redis.call('ZREMRANGEBYSCORE', key, '-inf', since)
+    if redis.call('ZCARD', key) >= tonumber(ARGV[3 + i]) then
+        return 0
+    end
+end
+
+for _, key in ipairs(KEYS) do
+    redis.call('ZADD', key, ARGV[1], ARGV[3])
+    redis.call('PEXPIRE', key, ARGV[2])
+end
+
+return 1
+"""
@@ -0,0 +1,284 @@
+import asyncio
+import logging
+import random
+import secrets
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable
+
+import redis.asyncio as aioredis
+
+from db.session import async_session, engine
+from service.auth import types
+from service.auth.cache import evict_introspections
+from service.auth.stores import (
+    MemorySessionStore,
+    PostgresSessionStore,
+    RedisSessionStore,
+    SessionStore,
+)
+from service.exceptions.api.users import SessionStoreUnavailableException
+from service.helpers import utils
+from service.helpers.breaker import CircuitBreaker, CircuitOpenError
+from settings import auth_settings as a_s
+from settings import redis_settings as r_s
+
+INVALIDATION_PRINCIPAL = "principal"
+INVALIDATION_SESSIONS = "sessions"
+INVALIDATION_API_KEYS = "api_keys"
+INVALIDATION_RIGHTS = "rights"
+
+SESSION_KEY_PREFIX = "auth:s:"
+LOGIN_RATE_LIMIT_PREFIX = "auth:login:"
+
+logger = logging.getLogger(__name__)
+
+
+def build_redis() -> aioredis.Redis:
+
+    return aioredis.from_url(
+        r_s.REDIS_URL,
+        decode_responses=True,
+        max_connections=r_s.REDIS_MAX_CONNECTIONS,
+        health_check_interval=r_s.REDIS_HEALTH_CHECK_INTERVAL,
+        socket_timeout=r_s.REDIS_SOCKET_TIMEOUT,
+        socket_connect_timeout=r_s.REDIS_SOCKET_CONNECT_TIMEOUT,
+    )
+
+
+def build_session_store(name: str | None = None) -> SessionStore:
+
+    name = name or a_s.SESSION_STORE
+
+    if name == MemorySessionStore.name:
+        return MemorySessionStore()
+
+    if name == PostgresSessionStore.name:
+        return PostgresSessionStore(engine, async_session)
+
+    if name == RedisSessionStore.name:
+        return RedisSessionStore(build_redis(), SESSION_KEY_PREFIX)
+
+    raise ValueError(f"Unknown session store {name!r}")
+
+
+store = build_session_store()
+store_breaker = CircuitBreaker(
+    failure_threshold=a_s.SESSION_STORE_FAILURE_THRESHOLD,
+    reset_timeout=a_s.SESSION_STORE_RESET_SECONDS,
+    call_timeout=a_s.SESSION_STORE_TIMEOUT_SECONDS,
+)
+
+
+async def call_store(
+    func: Callable[..., Awaitable[Any]],
+    *args,
+    **kwargs,
+) -> Any:
+
+    try:
+        return await store_breaker.call(func, *args, **kwargs)
+    except CircuitOpenError:
+        raise SessionStoreUnavailableException() from None
+    except Exception as exc:
+        logger.warning("Session store call failed: %r", exc)
+        raise SessionStoreUnavailableException() from exc
+
+
+def get_session_ttl() -> int:
+
+    ttl = int(a_s.REFRESH_TOKEN_EXPIRES_MINUTES) * 60
+    return ttl + random.randint(0, int(ttl * a_s.SESSION_TTL_JITTER))
+
+
+def get_session_key(access_token: types.AccessToken) -> str:
+
+    return f"{SESSION_KEY_PREFIX}{utils.get_digest(access_token)}"
+
+
+def build_session_record(user_id: int, device_id: str) -> str:
+
+    return ":".join([
+        str(user_id),
+        utils.get_digest(device_id, size=8),
+        str(int(time.time())),
+    ])
+
+
+def parse_session_record(record: str) -> types.SessionRecordTD | None:
+
+    fields = record.split(":")
+    # records written before the refresh id was dropped still lead with it
+    if len(fields) == 4:
+        fields = fields[1:]
+
+    try:
+        user_id, device_digest, issued_at = fields
+        return {
+            "user_id": int(user_id),
+            "device_digest": device_digest,
+            "issued_at": int(issued_at),
+        }
+    except ValueError:
+        return None
+
+
+async def create_session(
+    access_token: types.AccessToken,
+    user_id: int,
+    device_id: str,
+) -> None:
+
+    await call_store(
+        store.create,
+        get_session_key(access_token),
+        user_id,
+        build_session_record(user_id, device_id),
+        get_session_ttl(),
+        device_id,
+    )
+
+
+async def rotate_session(
+    access_token: types.AccessToken,
+    new_access_token: types.AccessToken,
+    user_id: int,
+    device_id: str,
+) -> types.AccessToken | None:
+
+    # one atomic store call: a concurrent caller that lost gets the winner's
+    # token back and its own is simply never stored
+    return await call_store(
+        store.rotate,
+        get_session_key(access_token),
+        get_session_key(new_access_token),
+        new_access_token,
+        user_id,
+        build_session_record(user_id, device_id),
+        get_session_ttl(),
+        a_s.REFRESH_GRACE_SECONDS,
+        device_id,
+        legacy_key=access_token,
+    )
+
+
+async def get_session(
+    access_token: types.AccessToken
+) -> types.SessionRecordTD | None:
+
+    record = await call_store(store.get, get_session_key(access_token))
+    if record:
+        return parse_session_record(record)
+
+    # sessions created before digest keys live under the raw access token
+    # until their first rotation and hold a refresh JWT, not a record
+    if await call_store(store.get, access_token):
+        return {"user_id": None, "device_digest": None, "issued_at": None}
+
+    return None
+
+
+async def hit_login_rate_limit(email: str, client_ip: str | None) -> bool:
+
+    keys = []
+    limits = []
+    if a_s.LOGIN_RATE_LIMIT_PER_EMAIL:
+        keys.append(
+            f"{LOGIN_RATE_LIMIT_PREFIX}email:{utils.get_digest(email.lower())}"
+        )
+        limits.append(a_s.LOGIN_RATE_LIMIT_PER_EMAIL)
+
+    if a_s.LOGIN_RATE_LIMIT_PER_IP and client_ip:
+        keys.append(f"{LOGIN_RATE_LIMIT_PREFIX}ip:{client_ip}")
+        limits.append(a_s.LOGIN_RATE_LIMIT_PER_IP)
+
+    if not keys:
+        return True
+
+    return await call_store(
+        store.hit_rate_limit,
+        keys,
+        limits,
+        a_s.LOGIN_RATE_LIMIT_WINDOW_SECONDS,
+    )
+
+
+async def get_security_stamp(user_id: int) -> int:
+
+    return await call_store(store.get_stamp, user_id)
+
+
+def get_stamp_seed() -> int:
+
+    # Missing stamps start from the clock, not from zero, so a flushed store
+    # never hands out a stamp an older token was already issued with.
+    return time.time_ns() // 1000
+
+
+async def seed_security_stamp(user_id: int) -> int:
+
+    return await call_store(store.seed_stamp, user_id, get_stamp_seed())
+
+
+async def incr_security_stamp(user_id: int) -> int:
+
+    return await call_store(store.incr_stamp, user_id, get_stamp_seed())
+
+
+async def publish_invalidation(kind: str, *payload: str | int) -> None:
+
+    await call_store(
+        store.publish,
+        r_s.REDIS_INVALIDATION_CHANNEL,
+        ":".join([kind, " ".join(map(str, payload))]),
+    )
+
+
+def listen_invalidations() -> AsyncIterator[str]:
+
+    return store.listen(r_s.REDIS_INVALIDATION_CHANNEL)
+
+
+async def publish_revoked_sessions(session_keys: list[str]) -> None:
+
+    # legacy index fields are raw access tokens, never broadcast them
+    session_keys = [
+        key for key in session_keys if key.startswith(SESSION_KEY_PREFIX)
+    ]
+    if not session_keys:
+        return
+
+    evict_introspections(session_keys)
+    await publish_invalidation(INVALIDATION_SESSIONS, *session_keys)
+
+
+async def revoke_session(
+    access_token: types.AccessToken | None,
+    user_id: int | None = None,
+) -> None:
+
+    if not access_token:
+        # logout without a session cookie has nothing to revoke
+        return
+
+    session_key = get_session_key(access_token)
+
+    await call_store(store.revoke, [session_key, access_token], user_id)
+    await publish_revoked_sessions([session_key])
+
+
+async def revoke_user_sessions(user_id: int) -> int:
+
+    session_keys = await call_store(store.revoke_user, user_id)
+    await publish_revoked_sessions(session_keys)
+
+    return len(session_keys)
+
+
+async def get_user_sessions(user_id: int) -> list[types.SessionTD]:
+
+    return await call_store(store.list_user, user_id)
+
+
+async def track_sessions() -> None:
+
+    await store.track()
@@ -0,0 +1,92 @@
+import asyncio
+import logging
+import os
+import struct
+
+from db.session import async_session
+from service.auth import handlers, sessions
+from settings import auth_settings as a_s
+from settings import redis_settings as r_s
+
+logger = logging.getLogger(__name__)
+
+# frame: 4-byte big-endian length + payload
+# request payload: access token, response payload: UserVerifyBatchResult json
+FRAME_HEADER = struct.Struct("!I")
+
+
+def build_frame(payload: bytes) -> bytes:
+
+    return FRAME_HEADER.pack(len(payload)) + payload
+
+
+async def read_frame(reader: asyncio.StreamReader) -> bytes | None:
+
+    try:
+        header = await reader.readexactly(FRAME_HEADER.size)
+    except asyncio.IncompleteReadError:
+        return None
+
+    (size,) = FRAME_HEADER.unpack(header)
+    if size > a_s.SIDECAR_MAX_FRAME_SIZE:
+        raise ValueError(f"Frame of {size} bytes is too large")
+
+    return await reader.readexactly(size)
+
+
+async def verify_token(access_token: str) -> bytes:
+
+    async with async_session() as db:
+        [result] = await handlers.verify_tokens(db, [access_token])
+
+    return handlers.build_verify_result(result).model_dump_json(
+        exclude_none=True
+    ).encode()
+
+
+async def handle_connection(
+    reader: asyncio.StreamReader,
+    writer: asyncio.StreamWriter,
+) -> None:
+
+    try:
+        while (frame := await read_frame(reader)) is not None:
+            writer.write(build_frame(await verify_token(frame.decode())))
+            await writer.drain()
+
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+
+    except ValueError as exc:
+        logger.warning(exc)
+
+    except Exception as exc:
+        logger.exception(exc, exc_info=True)
+
+    finally:
+        writer.close()
+
+
+async def serve(path: str) -> None:
+
+    if os.path.exists(path):
+        os.unlink(path)
+
+    listeners = [
+        asyncio.create_task(handlers.listen_principal_invalidations())
+    ]
+    if bool(r_s.REDIS_CLIENT_CACHE):
+        listeners.append(asyncio.create_task(sessions.track_sessions()))
+    if a_s.ACCESS_TOKEN_KEYRING_FILE:
+        listeners.append(asyncio.create_task(handlers.watch_keyring()))
+
+    server = await asyncio.start_unix_server(handle_connection, path=path)
+    os.chmod(path, a_s.SIDECAR_SOCKET_MODE)
+
+    logger.info("Verifying tokens on %s", path)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        for listener in listeners:
+            listener.cancel()
@@ -0,0 +1,4 @@
+from .base import SessionStore
+from .memory import MemorySessionStore
+from .postgres import PostgresSessionStore
+from .redis import RedisSessionStore
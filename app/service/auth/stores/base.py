@@ -0,0 +1,87 @@
+from abc import ABC, abstractmethod
+from typing import AsyncIterator
+
+from service.auth import types
+
+
+class SessionStore(ABC):
+
+    name: str
+
+    @abstractmethod
+    async def create(
+        self,
+        session_key: str,
+        user_id: int,
+        record: str,
+        ttl: int,
+        device_id: str,
+    ) -> None:
+        ...
+
+    @abstractmethod
+    async def rotate(
+        self,
+        session_key: str,
+        new_session_key: str,
+        new_access_token: types.AccessToken,
+        user_id: int,
+        record: str,
+        ttl: int,
+        grace_ttl: int,
+        device_id: str,
+        legacy_key: str | None = None,
+    ) -> types.AccessToken | None:
+        ...
+
+    @abstractmethod
+    async def get(self, session_key: str) -> str | None:
+        ...
+
+    @abstractmethod
+    async def revoke(
+        self,
+        session_keys: list[str],
+        user_id: int | None = None,
+    ) -> None:
+        ...
+
+    @abstractmethod
+    async def revoke_user(self, user_id: int) -> list[str]:
+        ...
+
+    @abstractmethod
+    async def list_user(self, user_id: int) -> list[types.SessionTD]:
+        ...
+
+    @abstractmethod
+    async def get_stamp(self, user_id: int) -> int:
+        ...
+
+    @abstractmethod
+    async def seed_stamp(self, user_id: int, seed: int) -> int:
+        ...
+
+    @abstractmethod
+    async def incr_stamp(self, user_id: int, seed: int) -> int:
+        ...
+
+    @abstractmethod
+    async def hit_rate_limit(
+        self,
+        keys: list[str],
+        limits: list[int],
+        window: int,
+    ) -> bool:
+        ...
+
+    @abstractmethod
+    async def publish(self, channel: str, message: str) -> None:
+        ...
+
+    @abstractmethod
+    def listen(self, channel: str) -> AsyncIterator[str]:
+        ...
+
+    async def track(self) -> None:
+        ...
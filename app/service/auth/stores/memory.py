@@ -0,0 +1,204 @@
+import asyncio
+import time
+from collections import OrderedDict, defaultdict, deque
+from itertools import islice
+from typing import AsyncIterator
+
+from service.auth import types
+from service.auth.stores.base import SessionStore
+
+
+class MemorySessionStore(SessionStore):
+    # Single-process store: sessions, stamps and invalidations never leave
+    # the worker, so it only fits one-worker deployments and benchmarks.
+
+    name = "memory"
+
+    def __init__(self) -> None:
+
+        # session key -> (expires_at, user_id, record, device_id)
+        self.sessions: dict[str, tuple[float, int, str, str]] = {}
+        self.user_sessions: defaultdict[int, set[str]] = defaultdict(set)
+        # old session key -> (expires_at, rotated access token), oldest first
+        self.rotated: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self.stamps: dict[int, int] = {}
+        # rate limit key -> expiry times of the attempts in its window
+        self.attempts: dict[str, deque[float]] = {}
+        self.subscribers: defaultdict[str, set[asyncio.Queue]] = (
+            defaultdict(set)
+        )
+
+    def get_alive(self, session_key: str) -> tuple | None:
+
+        session = self.sessions.get(session_key)
+        if session and session[0] <= time.monotonic():
+            self.drop(session_key)
+            return None
+
+        return session
+
+    def drop(self, session_key: str) -> None:
+
+        session = self.sessions.pop(session_key, None)
+        if session:
+            user_sessions = self.user_sessions[session[1]]
+            user_sessions.discard(session_key)
+            if not user_sessions:
+                del self.user_sessions[session[1]]
+
+    async def create(
+        self,
+        session_key: str,
+        user_id: int,
+        record: str,
+        ttl: int,
+        device_id: str,
+    ) -> None:
+
+        # sessions are roughly ordered by expiry, sweep a few of the oldest
+        for key in list(islice(self.sessions, 8)):
+            self.get_alive(key)
+
+        for key in list(self.user_sessions[user_id]):
+            self.get_alive(key)
+
+        self.sessions[session_key] = (
+            time.monotonic() + ttl, user_id, record, device_id
+        )
+        self.user_sessions[user_id].add(session_key)
+
+    def get_rotated(self, session_key: str) -> str | None:
+
+        now = time.monotonic()
+        while self.rotated and next(iter(self.rotated.values()))[0] <= now:
+            self.rotated.popitem(last=False)
+
+        rotated = self.rotated.get(session_key)
+        return rotated[1] if rotated else None
+
+    async def rotate(
+        self,
+        session_key: str,
+        new_session_key: str,
+        new_access_token: types.AccessToken,
+        user_id: int,
+        record: str,
+        ttl: int,
+        grace_ttl: int,
+        device_id: str,
+        legacy_key: str | None = None,
+    ) -> types.AccessToken | None:
+
+        rotated = self.get_rotated(session_key)
+        if rotated:
+            return rotated
+
+        if not self.get_alive(session_key):
+            return None
+
+        self.drop(session_key)
+        await self.create(new_session_key, user_id, record, ttl, device_id)
+        self.rotated[session_key] = (
+            time.monotonic() + grace_ttl, new_access_token
+        )
+
+        return new_access_token
+
+    async def get(self, session_key: str) -> str | None:
+
+        session = self.get_alive(session_key)
+        return session[2] if session else None
+
+    async def revoke(
+        self,
+        session_keys: list[str],
+        user_id: int | None = None,
+    ) -> None:
+
+        for session_key in session_keys:
+            self.drop(session_key)
+
+    async def revoke_user(self, user_id: int) -> list[str]:
+
+        session_keys = list(self.user_sessions.pop(user_id, ()))
+        for session_key in session_keys:
+            self.sessions.pop(session_key, None)
+
+        return session_keys
+
+    async def list_user(self, user_id: int) -> list[types.SessionTD]:
+
+        result = []
+        for session_key in list(self.user_sessions.get(user_id, ())):
+            session = self.get_alive(session_key)
+            if not session:
+                continue
+
+            result.append({
+                "session_key": session_key,
+                "device_id": session[3],
+                "expires_in": int(session[0] - time.monotonic()),
+            })
+
+        return result
+
+    async def get_stamp(self, user_id: int) -> int:
+
+        return self.stamps.get(user_id, 0)
+
+    async def seed_stamp(self, user_id: int, seed: int) -> int:
+
+        return self.stamps.setdefault(user_id, seed)
+
+    async def incr_stamp(self, user_id: int, seed: int) -> int:
+
+        self.stamps[user_id] = self.stamps.get(user_id, seed) + 1
+        return self.stamps[user_id]
+
+    def get_attempts(self, key: str, now: float) -> deque[float]:
+
+        attempts = self.attempts.get(key, deque())
+        while attempts and attempts[0] <= now:
+            attempts.popleft()
+
+        return attempts
+
+    async def hit_rate_limit(
+        self,
+        keys: list[str],
+        limits: list[int],
+        window: int,
+    ) -> bool:
+
+        now = time.monotonic()
+
+        for key in list(islice(self.attempts, 8)):
+            if not self.get_attempts(key, now):
+                del self.attempts[key]
+
+        windows = [self.get_attempts(key, now) for key in keys]
+        if any(
+            len(attempts) >= limit for attempts, limit in zip(windows, limits)
+        ):
+            return False
+
+        for key, attempts in zip(keys, windows):
+            attempts.append(now + window)
+            self.attempts[key] = attempts
+
+        return True
+
+    async def publish(self, channel: str, message: str) -> None:
+
+        for queue in self.subscribers[channel]:
+            queue.put_nowait(message)
+
+    async def listen(self, channel: str) -> AsyncIterator[str]:
+
+        queue: asyncio.Queue = asyncio.Queue()
+        self.subscribers[channel].add(queue)
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            self.subscribers[channel].discard(queue)
@@ -0,0 +1,336 @@
+import asyncio
+from datetime import timedelta
+from typing import AsyncIterator
+
+from sqlalchemy import delete, extract, func, select, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from service.auth import types
+from service.auth.models import (
+    AuthRateLimitHit,
+    AuthRotatedSession,
+    AuthSecurityStamp,
+    AuthSession,
+)
+from service.auth.stores.base import SessionStore
+
+
+class PostgresSessionStore(SessionStore):
+
+    name = "postgres"
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        sessionmaker: async_sessionmaker,
+    ) -> None:
+
+        self.engine = engine
+        self.sessionmaker = sessionmaker
+
+    async def get_rotated(
+        self,
+        db: AsyncSession,
+        session_key: str,
+    ) -> types.AccessToken | None:
+
+        return (
+            await db.execute(
+                select(AuthRotatedSession.access_token)
+                .where(
+                    AuthRotatedSession.session_key == session_key,
+                    AuthRotatedSession.expires_at > func.now(),
+                )
+            )
+        ).scalar()
+
+    async def insert_session(
+        self,
+        db: AsyncSession,
+        session_key: str,
+        user_id: int,
+        record: str,
+        ttl: int,
+        device_id: str,
+    ) -> None:
+
+        await db.execute(
+            delete(AuthSession)
+            .where(
+                AuthSession.user_id == user_id,
+                AuthSession.expires_at <= func.now(),
+            )
+        )
+
+        query = insert(AuthSession).values(
+            session_key=session_key,
+            user_id=user_id,
+            record=record,
+            device_id=device_id,
+            expires_at=func.now() + timedelta(seconds=ttl),
+        )
+        await db.execute(
+            query.on_conflict_do_update(
+                index_elements=[AuthSession.session_key],
+                set_={
+                    "record": query.excluded.record,
+                    "device_id": query.excluded.device_id,
+                    "expires_at": query.excluded.expires_at,
+                },
+            )
+        )
+
+    async def create(
+        self,
+        session_key: str,
+        user_id: int,
+        record: str,
+        ttl: int,
+        device_id: str,
+    ) -> None:
+
+        async with self.sessionmaker() as db, db.begin():
+            await self.insert_session(
+                db, session_key, user_id, record, ttl, device_id
+            )
+
+    async def rotate(
+        self,
+        session_key: str,
+        new_session_key: str,
+        new_access_token: types.AccessToken,
+        user_id: int,
+        record: str,
+        ttl: int,
+        grace_ttl: int,
+        device_id: str,
+        legacy_key: str | None = None,
+    ) -> types.AccessToken | None:
+
+        async with self.sessionmaker() as db, db.begin():
+            rotated = await self.get_rotated(db, session_key)
+            if rotated:
+                return rotated
+
+            deleted = (
+                await db.execute(
+                    delete(AuthSession)
+                    .where(
+                        AuthSession.session_key == session_key,
+                        AuthSession.expires_at > func.now(),
+                    )
+                    .returning(AuthSession.session_key)
+                )
+            ).scalar()
+
+            # a concurrent rotation holding the row lock wins, share its token
+            if deleted is None:
+                return await self.get_rotated(db, session_key)
+
+            await self.insert_session(
+                db, new_session_key, user_id, record, ttl, device_id
+            )
+
+            await db.execute(
+                delete(AuthRotatedSession)
+                .where(AuthRotatedSession.expires_at <= func.now())
+            )
+            await db.execute(
+                insert(AuthRotatedSession)
+                .values(
+                    session_key=session_key,
+                    access_token=new_access_token,
+                    expires_at=func.now() + timedelta(seconds=grace_ttl),
+                )
+                .on_conflict_do_nothing()
+            )
+
+        return new_access_token
+
+    async def get(self, session_key: str) -> str | None:
+
+        async with self.sessionmaker() as db:
+            return (
+                await db.execute(
+                    select(AuthSession.record)
+                    .where(
+                        AuthSession.session_key == session_key,
+                        AuthSession.expires_at > func.now(),
+                    )
+                )
+            ).scalar()
+
+    async def revoke(
+        self,
+        session_keys: list[str],
+        user_id: int | None = None,
+    ) -> None:
+
+        async with self.sessionmaker() as db, db.begin():
+            await db.execute(
+                delete(AuthSession)
+                .where(AuthSession.session_key.in_(session_keys))
+            )
+
+    async def revoke_user(self, user_id: int) -> list[str]:
+
+        async with self.sessionmaker() as db, db.begin():
+            return list(
+                (
+                    await db.execute(
+                        delete(AuthSession)
+                        .where(AuthSession.user_id == user_id)
+                        .returning(AuthSession.session_key)
+                    )
+                ).scalars()
+            )
+
+    async def list_user(self, user_id: int) -> list[types.SessionTD]:
+
+        async with self.sessionmaker() as db:
+            sessions = (
+                await db.execute(
+                    select(
+                        AuthSession.session_key,
+                        AuthSession.device_id,
+                        extract(
+                            "epoch", AuthSession.expires_at - func.now()
+                        ).label("expires_in"),
+                    )
+                    .where(
+                        AuthSession.user_id == user_id,
+                        AuthSession.expires_at > func.now(),
+                    )
+                )
+            ).mappings().all()
+
+        return [
+            {
+                "session_key": session.session_key,
+                "device_id": session.device_id,
+                "expires_in": int(session.expires_in),
+            }
+            for session in sessions
+        ]
+
+    async def get_stamp(self, user_id: int) -> int:
+
+        async with self.sessionmaker() as db:
+            return (
+                await db.execute(
+                    select(AuthSecurityStamp.stamp)
+                    .where(AuthSecurityStamp.user_id == user_id)
+                )
+            ).scalar() or 0
+
+    async def seed_stamp(self, user_id: int, seed: int) -> int:
+
+        query = insert(AuthSecurityStamp).values(user_id=user_id, stamp=seed)
+
+        async with self.sessionmaker() as db, db.begin():
+            return (
+                await db.execute(
+                    query.on_conflict_do_update(
+                        index_elements=[AuthSecurityStamp.user_id],
+                        set_={"stamp": AuthSecurityStamp.stamp},
+                    )
+                    .returning(AuthSecurityStamp.stamp)
+                )
+            ).scalar()
+
+    async def incr_stamp(self, user_id: int, seed: int) -> int:
+
+        query = insert(AuthSecurityStamp).values(
+            user_id=user_id, stamp=seed + 1
+        )
+
+        async with self.sessionmaker() as db, db.begin():
+            return (
+                await db.execute(
+                    query.on_conflict_do_update(
+                        index_elements=[AuthSecurityStamp.user_id],
+                        set_={"stamp": AuthSecurityStamp.stamp + 1},
+                    )
+                    .returning(AuthSecurityStamp.stamp)
+                )
+            ).scalar()
+
+    async def hit_rate_limit(
+        self,
+        keys: list[str],
+        limits: list[int],
+        window: int,
+    ) -> bool:
+
+        async with self.sessionmaker() as db, db.begin():
+            # count-then-insert races under READ COMMITTED, serialize the
+            # attempts per key; a fixed order keeps callers from deadlocking
+            for key in sorted(set(keys)):
+                await db.execute(
+                    select(func.pg_advisory_xact_lock(func.hashtext(key)))
+                )
+
+            await db.execute(
+                delete(AuthRateLimitHit)
+                .where(AuthRateLimitHit.expires_at <= func.now())
+            )
+
+            counts = dict(
+                (
+                    await db.execute(
+                        select(AuthRateLimitHit.key, func.count())
+                        .where(AuthRateLimitHit.key.in_(keys))
+                        .group_by(AuthRateLimitHit.key)
+                    )
+                ).all()
+            )
+            if any(
+                counts.get(key, 0) >= limit for key, limit in zip(keys, limits)
+            ):
+                return False
+
+            await db.execute(
+                insert(AuthRateLimitHit).values([
+                    {
+                        "key": key,
+                        "expires_at": func.now() + timedelta(seconds=window),
+                    }
+                    for key in keys
+                ])
+            )
+
+        return True
+
+    async def publish(self, channel: str, message: str) -> None:
+
+        async with self.sessionmaker() as db, db.begin():
+            await db.execute(
+                text("SELECT pg_notify(:channel, :message)"),
+                {"channel": channel, "message": message},
+            )
+
+    async def listen(self, channel: str) -> AsyncIterator[str]:
+
+        queue: asyncio.Queue = asyncio.Queue()
+
+        async with self.engine.connect() as conn:
+            connection = (await conn.get_raw_connection()).driver_connection
+
+            def on_notify(_connection, _pid, _channel, payload: str) -> None:
+                queue.put_nowait(payload)
+
+            def on_terminate(_connection) -> None:
+                queue.put_nowait(None)
+
+            connection.add_termination_listener(on_terminate)
+            await connection.add_listener(channel, on_notify)
+            try:
+                while (message := await queue.get()) is not None:
+                    yield message
+
+                raise ConnectionError("Notification connection was closed")
+            finally:
+                if not connection.is_closed():
+                    await connection.remove_listener(channel, on_notify)
+                connection.remove_termination_listener(on_terminate)
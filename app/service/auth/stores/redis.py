@@ -0,0 +1,213 @@
+import secrets
+import time
+from typing import AsyncIterator
+
+import redis.asyncio as aioredis
+
+from service.auth import scripts, types
+from service.auth.stores.base import SessionStore
+from service.helpers.tracking import TrackedCache
+from settings import redis_settings as r_s
+
+
+class RedisSessionStore(SessionStore):
+
+    name = "redis"
+
+    def __init__(self, redis: aioredis.Redis, session_prefix: str) -> None:
+
+        self.redis = redis
+        self.session_prefix = session_prefix
+
+        self.session_cache = TrackedCache(
+            prefix=session_prefix,
+            maxsize=r_s.REDIS_CLIENT_CACHE_SIZE,
+            ttl=r_s.REDIS_CLIENT_CACHE_TTL_SECONDS,
+        )
+
+        self.create_script = redis.register_script(scripts.CREATE_SESSION)
+        self.rotate_script = redis.register_script(scripts.ROTATE_SESSION)
+        self.revoke_user_script = redis.register_script(
+            scripts.REVOKE_USER_SESSIONS
+        )
+        self.rate_limit_script = redis.register_script(scripts.HIT_RATE_LIMIT)
+
+    def get_user_sessions_key(self, user_id: int) -> str:
+
+        return f"auth:sessions:{user_id}"
+
+    def get_rotated_session_key(self, session_key: str) -> str:
+
+        return f"auth:rotated:{session_key.removeprefix(self.session_prefix)}"
+
+    def get_security_stamp_key(self, user_id: int) -> str:
+
+        return f"auth:stamp:{user_id}"
+
+    async def create(
+        self,
+        session_key: str,
+        user_id: int,
+        record: str,
+        ttl: int,
+        device_id: str,
+    ) -> None:
+
+        index_key = self.get_user_sessions_key(user_id)
+
+        await self.create_script(
+            keys=[session_key, index_key, *await self.redis.hkeys(index_key)],
+            args=[record, ttl, device_id],
+            client=self.redis,
+        )
+
+    async def rotate(
+        self,
+        session_key: str,
+        new_session_key: str,
+        new_access_token: types.AccessToken,
+        user_id: int,
+        record: str,
+        ttl: int,
+        grace_ttl: int,
+        device_id: str,
+        legacy_key: str | None = None,
+    ) -> types.AccessToken | None:
+
+        return await self.rotate_script(
+            keys=[
+                session_key,
+                legacy_key or session_key,
+                self.get_rotated_session_key(session_key),
+                new_session_key,
+                self.get_user_sessions_key(user_id),
+            ],
+            args=[new_access_token, record, ttl, grace_ttl, device_id],
+            client=self.redis,
+        )
+
+    async def get(self, session_key: str) -> str | None:
+
+        # only prefixed keys are tracked, legacy keys always go to Redis
+        if not session_key.startswith(self.session_prefix):
+            return await self.redis.get(session_key)
+
+        return await self.session_cache.get(session_key, self.redis.get)
+
+    async def revoke(
+        self,
+        session_keys: list[str],
+        user_id: int | None = None,
+    ) -> None:
+
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.delete(*session_keys)
+            if user_id is not None:
+                pipe.hdel(self.get_user_sessions_key(user_id), *session_keys)
+            await pipe.execute()
+
+    async def revoke_user(self, user_id: int) -> list[str]:
+
+        index_key = self.get_user_sessions_key(user_id)
+
+        # sessions created while revoking show up on the next pass
+        revoked = []
+        while session_keys := await self.redis.hkeys(index_key):
+            await self.revoke_user_script(
+                keys=[index_key, *session_keys],
+                client=self.redis,
+            )
+            revoked.extend(session_keys)
+
+        return revoked
+
+    async def list_user(self, user_id: int) -> list[types.SessionTD]:
+
+        index_key = self.get_user_sessions_key(user_id)
+        sessions = await self.redis.hgetall(index_key)
+        if not sessions:
+            return []
+
+        session_keys = list(sessions)
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for session_key in session_keys:
+                pipe.ttl(session_key)
+            ttls = await pipe.execute()
+
+        result = []
+        stale = []
+        for session_key, ttl in zip(session_keys, ttls):
+            if ttl < 0:
+                stale.append(session_key)
+                continue
+
+            result.append({
+                "session_key": session_key,
+                "device_id": sessions[session_key],
+                "expires_in": ttl,
+            })
+
+        if stale:
+            await self.redis.hdel(index_key, *stale)
+
+        return result
+
+    async def get_stamp(self, user_id: int) -> int:
+
+        return int(
+            await self.redis.get(self.get_security_stamp_key(user_id)) or 0
+        )
+
+    async def seed_stamp(self, user_id: int, seed: int) -> int:
+
+        key = self.get_security_stamp_key(user_id)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            _, stamp = await pipe.set(key, seed, nx=True).get(key).execute()
+
+        return int(stamp)
+
+    async def incr_stamp(self, user_id: int, seed: int) -> int:
+
+        key = self.get_security_stamp_key(user_id)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            _, stamp = await pipe.set(key, seed, nx=True).incr(key).execute()
+
+        return stamp
+
+    async def hit_rate_limit(
+        self,
+        keys: list[str],
+        limits: list[int],
+        window: int,
+    ) -> bool:
+
+        return bool(
+            await self.rate_limit_script(
+                keys=keys,
+                args=[
+                    int(time.time() * 1000),
+                    window * 1000,
+                    secrets.token_hex(8),
+                    *limits,
+                ],
+                client=self.redis,
+            )
+        )
+
+    async def publish(self, channel: str, message: str) -> None:
+
+        await self.redis.publish(channel, message)
+
+    async def listen(self, channel: str) -> AsyncIterator[str]:
+
+        pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+        try:
+            await pubsub.subscribe(channel)
+            async for message in pubsub.listen():
+                yield message["data"]
+        finally:
+            await pubsub.aclose()
+
+    async def track(self) -> None:
+
+        await self.session_cache.listen(self.redis)
@@ -13,5 +13,33 @@ class AccessTokenTD(BaseTokenTD):
     role: str
 
 
+class ClaimsAccessTokenTD(AccessTokenTD):
+    usr: dict
+    stamp: int
+
+
 class RefreshTokenTD(BaseTokenTD):
     pass
+
+
+class SessionTD(TypedDict):
+    session_key: str
+    device_id: str
+    expires_in: int
+
+
+class SessionRecordTD(TypedDict):
+    # all None for a legacy session keyed by the raw access token
+    user_id: int | None
+    device_digest: str | None
+    issued_at: int | None
+
+
+class IntrospectionTD(TypedDict, total=False):
+    active: bool
+    sub: str
+    username: str
+    role: str
+    token_type: str
+    iat: int
+    exp: int
@@ -1,11 +1,17 @@
 from .exc import (
+    ApiKeyScopeForbiddenException,
     BaseUserException,
+    EulaMustBeAcceptedException,
     ExpiredUserTokenException,
     InactiveUserException,
+    InvalidApiKeyException,
     InvalidLoginDataException,
     InvalidUserRoleException,
     InvalidUserTokenException,
+    PasswordHashingOverloadedException,
     RightNotMatchWithUserRole,
+    SessionStoreUnavailableException,
+    TooManyLoginAttemptsException,
     UserEmailAlreadyExistsException,
     UserNotFoundException,
 )
@@ -80,3 +80,38 @@ class RightNotMatchWithUserRole(BaseUserException):
     exc_state = UserExcState.RIGHT_NOT_MATCHED_WITH_USER_ROLE
     exc_info = msg.right_not_match_with_role_text
     status_code = status.HTTP_400_BAD_REQUEST
+
+
+class PasswordHashingOverloadedException(BaseUserException):
+
+    exc_state = UserExcState.PASSWORD_HASHING_OVERLOADED
+    exc_info = msg.password_hashing_overloaded_text
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+
+
+class InvalidApiKeyException(BaseUserException):
+
+    exc_state = UserExcState.INVALID_API_KEY
+    exc_info = msg.invalid_api_key_text
+    status_code = status.HTTP_401_UNAUTHORIZED
+
+
+class ApiKeyScopeForbiddenException(BaseUserException):
+
+    exc_state = UserExcState.API_KEY_SCOPE_FORBIDDEN
+    exc_info = msg.api_key_scope_forbidden_text
+    status_code = status.HTTP_403_FORBIDDEN
+
+
+class SessionStoreUnavailableException(BaseUserException):
+
+    exc_state = UserExcState.SESSION_STORE_UNAVAILABLE
+    exc_info = msg.session_store_unavailable_text
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+
+
+class TooManyLoginAttemptsException(BaseUserException):
+
+    exc_state = UserExcState.TOO_MANY_LOGIN_ATTEMPTS
+    exc_info = msg.too_many_login_attempts_text
+    status_code = status.HTTP_429_TOO_MANY_REQUESTS
@@ -9,3 +9,11 @@ invalid_login_data_text = "Invalid email or password. Try again"
 agreement_already_accepted_text = "Agreement {} already accepted"
 eula_must_be_accepted_text = "EULA must be accepted by user"
 right_not_match_with_role_text = "Right not match with user role by user_id={}."
+
+password_hashing_overloaded_text = "Too many logins in progress. Try again later"
+
+invalid_api_key_text = "API key is invalid"
+api_key_scope_forbidden_text = "API key has no {} scope"
+
+session_store_unavailable_text = "Sessions are temporarily unavailable. Try again later"
+too_many_login_attempts_text = "Too many login attempts. Try again in {} seconds"
@@ -19,3 +19,12 @@ class UserExcState(MacroCaseStrEnum):
     AGREEMENT_ALREADY_ACCEPTED = auto()
     EULA_MUST_BE_ACCEPTED = auto()
     RIGHT_NOT_MATCHED_WITH_USER_ROLE = auto()
+
+    PASSWORD_HASHING_OVERLOADED = auto()
+
+    INVALID_API_KEY = auto()
+    API_KEY_SCOPE_FORBIDDEN = auto()
+
+    SESSION_STORE_UNAVAILABLE = auto()
+
+    TOO_MANY_LOGIN_ATTEMPTS = auto()
@@ -0,0 +1,104 @@
+import asyncio
+import time
+from enum import auto
+from typing import Any, Awaitable, Callable
+
+from strenum import LowercaseStrEnum
+
+
+class CircuitState(LowercaseStrEnum):
+
+    CLOSED = auto()
+    OPEN = auto()
+    HALF_OPEN = auto()
+
+
+class CircuitOpenError(Exception):
+    ...
+
+
+class CircuitBreaker:
+
+    def __init__(
+        self,
+        failure_threshold: int,
+        reset_timeout: float,
+        call_timeout: float | None = None,
+    ) -> None:
+
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.call_timeout = call_timeout
+
+        self.failures = 0
+        self.opened_at: float | None = None
+        self.probing = False
+
+        self.rejected = 0
+        self.timeouts = 0
+
+    @property
+    def state(self) -> CircuitState:
+
+        if self.opened_at is None:
+            return CircuitState.CLOSED
+
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return CircuitState.HALF_OPEN
+
+        return CircuitState.OPEN
+
+    async def call(
+        self,
+        func: Callable[..., Awaitable[Any]],
+        *args,
+        **kwargs,
+    ) -> Any:
+
+        state = self.state
+        # half-open lets a single probe through, everyone else fails fast
+        if state == CircuitState.OPEN or (
+            state == CircuitState.HALF_OPEN and self.probing
+        ):
+            self.rejected += 1
+            raise CircuitOpenError()
+
+        probe = state == CircuitState.HALF_OPEN
+        if probe:
+            self.probing = True
+
+        try:
+            async with asyncio.timeout(self.call_timeout):
+                result = await func(*args, **kwargs)
+
+        except Exception as exc:
+            if isinstance(exc, TimeoutError):
+                self.timeouts += 1
+            self.record_failure()
+            raise
+
+        finally:
+            # calls started before the circuit opened must not end a probe
+            if probe:
+                self.probing = False
+
+        if probe or self.opened_at is None:
+            self.failures = 0
+            self.opened_at = None
+
+        return result
+
+    def record_failure(self) -> None:
+
+        self.failures += 1
+        if self.failures >= self.failure_threshold or self.opened_at:
+            self.opened_at = time.monotonic()
+
+    def stats(self) -> dict[str, str | int]:
+
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "rejected": self.rejected,
+            "timeouts": self.timeouts,
+        }
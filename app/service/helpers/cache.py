@@ -0,0 +1,68 @@
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+
+class LRUTTLCache:
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def __len__(self) -> int:
+
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+
+        return self.get(key) is not None
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+
+        item = self._data.get(key)
+        if item is None:
+            return default
+
+        expires_at, value = item
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return default
+
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: float | None = None) -> None:
+
+        if self.maxsize <= 0:
+            return
+
+        ttl = self.ttl if ttl is None else ttl
+        if ttl <= 0:
+            return
+
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+
+        item = self._data.pop(key, None)
+        if item is None:
+            return default
+
+        return item[1]
+
+    def pop_if(self, predicate: Callable[[Any], bool]) -> None:
+
+        for key in [
+            key for key, (_, value) in self._data.items() if predicate(value)
+        ]:
+            del self._data[key]
+
+    def clear(self) -> None:
+
+        self._data.clear()
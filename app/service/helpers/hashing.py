@@ -0,0 +1,117 @@
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable
+
+from service.exceptions.api.users import PasswordHashingOverloadedException
+from service.helpers import utils
+from settings import auth_settings as a_s
+
+
+def run_timed(func: Callable, submitted_at: float, *args) -> tuple[float, Any]:
+
+    return time.time() - submitted_at, func(*args)
+
+
+class HashingPool:
+
+    def __init__(self, size: int, queue_limit: int) -> None:
+
+        self.size = size
+        self.queue_limit = queue_limit
+
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+
+        self._executor: ProcessPoolExecutor | None = None
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.size,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+
+        return self._executor
+
+    @property
+    def queue_depth(self) -> int:
+
+        return max(self.pending - self.size, 0)
+
+    async def run(self, func: Callable, *args) -> Any:
+
+        if self.pending >= self.size + self.queue_limit:
+            self.rejected += 1
+            raise PasswordHashingOverloadedException()
+
+        self.pending += 1
+        try:
+            wait_time, result = await asyncio.get_running_loop().run_in_executor(
+                self.executor, run_timed, func, time.time(), *args
+            )
+        except BrokenProcessPool:
+            self._executor = None
+            raise
+        finally:
+            self.pending -= 1
+
+        self.completed += 1
+        self.wait_time_total += wait_time
+        self.wait_time_max = max(self.wait_time_max, wait_time)
+
+        return result
+
+    def stats(self) -> dict[str, int | float]:
+
+        return {
+            "pool_size": self.size,
+            "queue_limit": self.queue_limit,
+            "in_flight": min(self.pending, self.size),
+            "queue_depth": self.queue_depth,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "wait_time_avg": (
+                self.wait_time_total / self.completed if self.completed else 0.0
+            ),
+            "wait_time_max": self.wait_time_max,
+        }
+
+    def shutdown(self) -> None:
+
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+hashing_pool = HashingPool(
+    size=a_s.HASH_POOL_SIZE,
+    queue_limit=a_s.HASH_POOL_QUEUE_LIMIT,
+)
+
+
+async def verify_hash(plain_text: str, hashed_text: str) -> bool:
+
+    return await hashing_pool.run(utils.verify_hash, plain_text, hashed_text)
+
+
+async def verify_and_update_hash(
+    plain_text: str,
+    hashed_text: str,
+) -> tuple[bool, str | None]:
+
+    return await hashing_pool.run(
+        utils.verify_and_update_hash, plain_text, hashed_text
+    )
+
+
+async def get_hash(plain_text: str) -> str:
+
+    return await hashing_pool.run(utils.get_hash, plain_text)
@@ -0,0 +1,29 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Hashable
+
+
+class SingleFlight:
+
+    def __init__(self) -> None:
+
+        self._calls: dict[Hashable, asyncio.Task] = {}
+
+    def __len__(self) -> int:
+
+        return len(self._calls)
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable]) -> Any:
+
+        task = self._calls.get(key)
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+            task = asyncio.ensure_future(func())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self.forget(key, done))
+
+        # a cancelled caller must not cancel the call shared with others
+        return await asyncio.shield(task)
+
+    def forget(self, key: Hashable, task: asyncio.Task) -> None:
+
+        if self._calls.get(key) is task:
+            del self._calls[key]
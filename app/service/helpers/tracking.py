@@ -0,0 +1,110 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable
+
+import redis.asyncio as aioredis
+
+from service.helpers.cache import LRUTTLCache
+
+logger = logging.getLogger(__name__)
+
+INVALIDATE_CHANNEL = "__redis__:invalidate"
+
+MISSING = object()
+
+
+class TrackedCache:
+    # Server-assisted client-side cache: Redis broadcasts every change of a
+    # key under `prefix` to the tracking connection, entries are only served
+    # while that connection is alive.
+
+    def __init__(self, prefix: str, maxsize: int, ttl: float) -> None:
+
+        self.prefix = prefix
+        self.ready = False
+
+        self._cache = LRUTTLCache(maxsize=maxsize, ttl=ttl)
+        self._pending: dict[str, object] = {}
+
+    def __len__(self) -> int:
+
+        return len(self._cache)
+
+    async def get(
+        self,
+        key: str,
+        loader: Callable[[str], Awaitable[Any]],
+    ) -> Any:
+
+        if not self.ready:
+            return await loader(key)
+
+        value = self._cache.get(key, MISSING)
+        if value is not MISSING:
+            return value
+
+        marker = self._pending[key] = object()
+        value = await loader(key)
+
+        # an invalidation that arrived while loading drops the marker
+        if self._pending.get(key) is marker:
+            del self._pending[key]
+            if self.ready:
+                self._cache.set(key, value)
+
+        return value
+
+    def invalidate(self, keys: list[str] | None) -> None:
+
+        if keys is None:
+            self._cache.clear()
+            self._pending.clear()
+            return
+
+        for key in keys:
+            self._cache.pop(key)
+            self._pending.pop(key, None)
+
+    def reset(self) -> None:
+
+        self.ready = False
+        self.invalidate(None)
+
+    async def listen(self, redis: aioredis.Redis) -> None:
+
+        while True:
+            pubsub = redis.pubsub()
+            try:
+                await pubsub.connect()
+
+                connection = pubsub.connection
+                await connection.send_command("CLIENT", "ID")
+                client_id = await connection.read_response()
+
+                await connection.send_command(
+                    "CLIENT", "TRACKING", "ON",
+                    "REDIRECT", client_id,
+                    "BCAST", "PREFIX", self.prefix,
+                )
+                await connection.read_response()
+
+                await pubsub.subscribe(INVALIDATE_CHANNEL)
+                async for message in pubsub.listen():
+                    if message["type"] == "subscribe":
+                        self.ready = True
+                    elif message["type"] == "message":
+                        self.invalidate(message["data"])
+
+            except asyncio.CancelledError:
+                raise
+
+            except Exception as exc:
+                logger.exception(exc, exc_info=True)
+
+            finally:
+                # stop serving entries before backing off, nothing
+                # invalidates them while disconnected
+                self.reset()
+                await pubsub.aclose()
+
+            await asyncio.sleep(1)
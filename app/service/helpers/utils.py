@@ -1,17 +1,31 @@
-from base64 import b64encode, b64decode
+import hashlib
+from base64 import b64encode, b64decode, urlsafe_b64encode
 from datetime import datetime, timedelta, timezone
 from typing import Any
 
 from jose import jwt
 from passlib.context import CryptContext
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from settings import auth_settings as a_s
+
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=a_s.PASSWORD_HASH_ROUNDS,
+)
 
 
 def verify_hash(plain_text: str, hashed_text: str) -> bool:
     return pwd_context.verify(plain_text, hashed_text)
 
 
+def verify_and_update_hash(
+    plain_text: str,
+    hashed_text: str,
+) -> tuple[bool, str | None]:
+    return pwd_context.verify_and_update(plain_text, hashed_text)
+
+
 def get_hash(plain_text: str) -> str:
     return pwd_context.hash(plain_text)
 
@@ -21,12 +35,15 @@ def create_token(
     secret_key: str,
     minutes: int,
     algorithm: str,
+    headers: dict[str, Any] | None = None,
 ) -> str:
     to_encode = data.copy()
     expire = datetime.now(timezone.utc) + timedelta(minutes=minutes)
     to_encode.update({"exp": expire})
 
-    encoded_jwt = jwt.encode(to_encode, secret_key, algorithm=algorithm)
+    encoded_jwt = jwt.encode(
+        to_encode, secret_key, algorithm=algorithm, headers=headers
+    )
     return encoded_jwt
 
 
@@ -36,3 +53,8 @@ def encode_to_base64(user_agent: str) -> str:
 
 def decode_from_base64(base_token: str) -> str:
     return b64decode(base_token).decode()
+
+
+def get_digest(value: str, size: int = 16) -> str:
+    digest = hashlib.blake2b(value.encode(), digest_size=size).digest()
+    return urlsafe_b64encode(digest).decode().rstrip("=")
@@ -1,4 +1,4 @@
-from sqlalchemy import RowMapping, delete, insert, select, update
+from sqlalchemy import delete, insert, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
@@ -9,6 +9,7 @@ from api.users.rights.schemas import (
 )
 from db.utils.transactional import transaction
 from service.exceptions.api.users import RightNotMatchWithUserRole
+from service.rights.index import RightRecord, invalidate_rights
 from service.rights.models import SpecRights, UserRights
 from service.rights.types import ROLE_TO_RIGHTS_MAP, RightType, SourceType
 from service.users.models import User
@@ -91,6 +92,8 @@ async def add_right_to_users(
                 user_right.right_id = spec_right.id
                 user_right.constraints = constraints.model_dump(exclude_none=True)
 
+    await invalidate_rights(user_ids)
+
 
 async def revoke_right_of_users(
     db: AsyncSession,
@@ -108,6 +111,8 @@ async def revoke_right_of_users(
             )
         )
 
+    await invalidate_rights(user_ids)
+
 
 async def change_rights_to_users_by_rel_id(
     db: AsyncSession,
@@ -133,7 +138,7 @@ async def change_rights_to_users_by_rel_id(
 
 async def update_right_of_user(
     db: AsyncSession,
-    right: RowMapping,
+    right: RightRecord,
     right_schema: GrantRightSchema,
     source_id: int
 ) -> SpecRights:
@@ -144,7 +149,7 @@ async def update_right_of_user(
         'right_type': right_schema.right_type,
     }
     async with transaction(db):
-        return (
+        spec_right = (
             await db.execute(
                 update(SpecRights)
                 .where(SpecRights.id == right.spec_right_id)
@@ -153,6 +158,11 @@ async def update_right_of_user(
             )
         ).scalar()
 
+    # the spec right is shared by every subject granted with it
+    await invalidate_rights()
+
+    return spec_right
+
 
 async def check_right_with_role_cond(
     db: AsyncSession,
@@ -0,0 +1,144 @@
+import logging
+from dataclasses import dataclass
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from db.session import async_session
+from service.auth import sessions
+from service.exceptions.api.users import SessionStoreUnavailableException
+from service.helpers.cache import LRUTTLCache
+from service.helpers.singleflight import SingleFlight
+from service.rights.models import SpecRights, UserRights
+from service.rights.types import RightScoreType
+from settings import auth_settings as a_s
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class RightRecord:
+
+    spec_right_id: int
+    right_type: str
+    source_id: int
+    source_type: str
+    user_right_id: int
+    right_id: int
+    subject_id: int
+    constraints: dict
+
+
+# source_type -> source_id -> highest right of the subject on the source
+SubjectRights = dict[str, dict[int, RightRecord]]
+
+
+class RightsIndex:
+
+    def __init__(
+        self,
+        sessionmaker: async_sessionmaker,
+        maxsize: int,
+        ttl: float,
+    ) -> None:
+
+        # loads are shared by concurrent requests, so they own their session
+        self.sessionmaker = sessionmaker
+        self.cache = LRUTTLCache(maxsize=maxsize, ttl=ttl)
+        self.flight = SingleFlight()
+        # bumped on every eviction so a load racing a write is not cached
+        self.version = 0
+
+    async def load(self, subject_id: int) -> SubjectRights:
+
+        version = self.version
+        async with self.sessionmaker() as db:
+            rows = (
+                await db.execute(
+                    select(
+                        SpecRights.id.label("spec_right_id"),
+                        SpecRights.right_type,
+                        SpecRights.source_id,
+                        SpecRights.source_type,
+                        UserRights.id.label("user_right_id"),
+                        UserRights.right_id,
+                        UserRights.subject_id,
+                        UserRights.constraints,
+                    )
+                    .select_from(SpecRights)
+                    .join(UserRights, SpecRights.id == UserRights.right_id)
+                    .where(UserRights.subject_id == subject_id)
+                )
+            ).mappings().all()
+
+        rights: SubjectRights = {}
+        for row in rows:
+            right = RightRecord(**row)
+            sources = rights.setdefault(right.source_type, {})
+
+            current = sources.get(right.source_id)
+            if (
+                not current
+                or RightScoreType[right.right_type]
+                > RightScoreType[current.right_type]
+            ):
+                sources[right.source_id] = right
+
+        if version == self.version:
+            self.cache.set(subject_id, rights)
+
+        return rights
+
+    async def get_subject_rights(self, subject_id: int) -> SubjectRights:
+
+        rights = self.cache.get(subject_id)
+        if rights is None:
+            rights = await self.flight.do(
+                subject_id, lambda: self.load(subject_id)
+            )
+
+        return rights
+
+    async def get_right(
+        self,
+        subject_id: int,
+        source_id: int,
+        source_type: str,
+    ) -> RightRecord | None:
+
+        rights = await self.get_subject_rights(subject_id)
+        return rights.get(source_type, {}).get(source_id)
+
+    def evict(self, subject_ids: list[int] | None = None) -> None:
+
+        self.version += 1
+
+        if subject_ids is None:
+            self.cache.clear()
+            return
+
+        for subject_id in subject_ids:
+            self.cache.pop(subject_id)
+
+
+rights_index = RightsIndex(
+    sessionmaker=async_session,
+    maxsize=a_s.RIGHTS_INDEX_SIZE,
+    ttl=a_s.RIGHTS_INDEX_TTL_SECONDS,
+)
+
+
+async def invalidate_rights(subject_ids: list[int] | None = None) -> None:
+
+    # an empty payload means every subject, so never publish an empty list
+    if subject_ids is not None and not subject_ids:
+        return
+
+    rights_index.evict(subject_ids)
+    try:
+        await sessions.publish_invalidation(
+            sessions.INVALIDATION_RIGHTS, *(subject_ids or [])
+        )
+    except SessionStoreUnavailableException:
+        # other workers pick the change up when their index entries expire
+        logger.warning("Rights of %s invalidated locally only", subject_ids)
@@ -35,6 +35,11 @@ class OrganizationBillingType(LowercaseStrEnum):
     PREMIUM = auto()
 
 
+class ApiKeyScope(LowercaseStrEnum):
+
+    INTEGRATIONS = auto()
+
+
 class UserAgreementType(StrEnum):
 
     EULA = auto()
@@ -2,6 +2,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from api.users.schemas import UserTTInfo
 from db.utils.transactional import transaction
+from service.auth.handlers import invalidate_user_principal
 from service.types import UserAgreementType
 from service.users.models import UserAgreement
 
@@ -24,3 +25,5 @@ async def accept_agreements(
 
     async with transaction(db):
         db.add_all(new_agreements)
+
+    await invalidate_user_principal(user.id)
@@ -7,11 +7,13 @@ from api.users import schemas
 from api.users.schemas import User as UserSchema
 from api.users.schemas import UserCreate, UserFullInfo, UserTTInfo
 from db.utils.transactional import transaction
+from service.auth import sessions
+from service.auth.handlers import invalidate_user_principal
 from service.exceptions.api.users import (
     UserEmailAlreadyExistsException,
     UserNotFoundException,
 )
-from service.helpers import utils
+from service.helpers import hashing
 from service.organizations.models import Department, Organization
 from service.rights.models import SpecRights, UserRights
 from service.rights.types import SourceType
@@ -36,11 +38,12 @@ async def create_user(
         raise e
 
     pass_salt = uuid4().hex
+    password = await hashing.get_hash(user.password + pass_salt)
 
     async with transaction(db):
         new_user = User(
             pass_salt=pass_salt,
-            password=utils.get_hash(user.password + pass_salt),
+            password=password,
             email=user.email,
             photo_link=img,
             active=user.active,
@@ -89,6 +92,10 @@ async def update_user(
     async with transaction(db):
         db.add(old_user)
 
+    await invalidate_user_principal(user_id)
+    if new_user.active is False:
+        await sessions.revoke_user_sessions(user_id)
+
     await db.refresh(old_user)
     return old_user
 
@@ -88,3 +88,19 @@ class UserAgreement(Base):
     organization_id = Column(Integer, ForeignKey("organization.id"), nullable=False)
     created_at = Column(DateTime, nullable=False, server_default=func.now())
     agreement_type = Column(String, nullable=False)
+
+
+class ApiKey(Base):
+
+    __tablename__ = "api_key"
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("user.id"), nullable=False)
+
+    key_id = Column(String, nullable=False, unique=True)
+    key_hash = Column(String, nullable=False)
+    name = Column(String)
+    scopes = Column(JSONB, nullable=False, default=[], server_default="[]")
+
+    created_at = Column(DateTime, nullable=False, server_default=func.now())
+    revoked_at = Column(DateTime)
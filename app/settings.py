@@ -1,5 +1,7 @@
+from typing import Literal
+
 from dotenv import load_dotenv
-from pydantic import Field, PostgresDsn
+from pydantic import Field, PostgresDsn, field_validator
 from pydantic_settings import BaseSettings
 
 
@@ -99,9 +101,98 @@ class AuthSettings(BaseSettings):
         "999",
         alias='REFRESH_TOKEN_EXPIRES_MINUTES'
     )
+    REFRESH_GRACE_SECONDS: int = Field(30, alias='REFRESH_GRACE_SECONDS')
+    SESSION_STORE: Literal['memory', 'redis', 'postgres'] = Field(
+        'redis',
+        alias='SESSION_STORE'
+    )
+    SESSION_TTL_JITTER: float = Field(0.1, alias='SESSION_TTL_JITTER')
+    SESSION_STORE_TIMEOUT_SECONDS: float = Field(
+        0.5, alias='SESSION_STORE_TIMEOUT_SECONDS'
+    )
+    SESSION_STORE_FAILURE_THRESHOLD: int = Field(
+        5, alias='SESSION_STORE_FAILURE_THRESHOLD'
+    )
+    SESSION_STORE_RESET_SECONDS: float = Field(
+        10, alias='SESSION_STORE_RESET_SECONDS'
+    )
     POSTGRES_DB: str | None = Field(None, alias='TEST_POSTGRES_DB')
 
     TOKENS_ALGORITHM: str = "HS256"
+
+    ACCESS_TOKEN_ALGORITHM: str | None = Field(
+        None,
+        alias='ACCESS_TOKEN_ALGORITHM'
+    )
+    ACCESS_TOKEN_PRIVATE_KEY: str | None = Field(
+        None,
+        alias='ACCESS_TOKEN_PRIVATE_KEY'
+    )
+    ACCESS_TOKEN_PUBLIC_KEY: str | None = Field(
+        None,
+        alias='ACCESS_TOKEN_PUBLIC_KEY'
+    )
+    ACCESS_TOKEN_KEY_ID: str = Field('default', alias='ACCESS_TOKEN_KEY_ID')
+    ACCESS_TOKEN_KEYRING_FILE: str | None = Field(
+        None,
+        alias='ACCESS_TOKEN_KEYRING_FILE'
+    )
+    ACCESS_TOKEN_KEYRING_RELOAD_SECONDS: float = Field(
+        30,
+        alias='ACCESS_TOKEN_KEYRING_RELOAD_SECONDS'
+    )
+    ACCESS_TOKEN_KEYRING_MISS_RELOAD_SECONDS: float = Field(
+        1,
+        alias='ACCESS_TOKEN_KEYRING_MISS_RELOAD_SECONDS'
+    )
+
+    # only jose verifies production tokens, see BENCHMARK_DECODERS
+    JWT_DECODER: Literal['jose'] = Field('jose', alias='JWT_DECODER')
+    DECODED_TOKEN_CACHE_SIZE: int = Field(
+        10000,
+        alias='DECODED_TOKEN_CACHE_SIZE'
+    )
+
+    API_KEY_SECRET: str = Field("q", alias='API_KEY_SECRET')
+    API_KEY_HEADER: str = Field('X-API-Key', alias='API_KEY_HEADER')
+    API_KEYS_RELOAD_SECONDS: float = Field(
+        300,
+        alias='API_KEYS_RELOAD_SECONDS'
+    )
+
+    VERIFY_BATCH_MAX_SIZE: int = Field(1000, alias='VERIFY_BATCH_MAX_SIZE')
+
+    SIDECAR_SOCKET_PATH: str = Field(
+        '/run/auth/verify.sock',
+        alias='SIDECAR_SOCKET_PATH'
+    )
+    SIDECAR_SOCKET_MODE: int = Field(0o660, alias='SIDECAR_SOCKET_MODE')
+    SIDECAR_MAX_FRAME_SIZE: int = Field(
+        16384,
+        alias='SIDECAR_MAX_FRAME_SIZE'
+    )
+
+    HASH_POOL_SIZE: int = Field(2, alias='HASH_POOL_SIZE')
+    HASH_POOL_QUEUE_LIMIT: int = Field(32, alias='HASH_POOL_QUEUE_LIMIT')
+    PASSWORD_HASH_ROUNDS: int = Field(12, alias='PASSWORD_HASH_ROUNDS')
+    PASSWORD_HASH_BUDGET_MS: int = Field(250, alias='PASSWORD_HASH_BUDGET_MS')
+    LOGIN_RATE_LIMIT_WINDOW_SECONDS: int = Field(
+        300, alias='LOGIN_RATE_LIMIT_WINDOW_SECONDS'
+    )
+    LOGIN_RATE_LIMIT_PER_EMAIL: int = Field(10, alias='LOGIN_RATE_LIMIT_PER_EMAIL')
+    # opt-in: behind a shared gateway every login comes from its address
+    LOGIN_RATE_LIMIT_PER_IP: int = Field(0, alias='LOGIN_RATE_LIMIT_PER_IP')
+    # set by the trusted gateway, e.g. X-Real-IP or X-Forwarded-For
+    LOGIN_CLIENT_IP_HEADER: str | None = Field(
+        None,
+        alias='LOGIN_CLIENT_IP_HEADER'
+    )
+    RIGHTS_INDEX_SIZE: int = Field(10000, alias='RIGHTS_INDEX_SIZE')
+    RIGHTS_INDEX_TTL_SECONDS: int = Field(60, alias='RIGHTS_INDEX_TTL_SECONDS')
+    FILTER_CANDIDATES_MAX_SIZE: int = Field(
+        10000,
+        alias='FILTER_CANDIDATES_MAX_SIZE'
+    )
     COOKIE_SESSION_KEY: str = Field('X-AUTH', alias='COOKIE_SESSION_KEY')
 
     SKIP_AUTH: int = Field(0, alias='SKIP_AUTH')
@@ -110,12 +201,75 @@ class AuthSettings(BaseSettings):
         alias='HR_SKIP_AGREEMENT'
     )
 
+    PRINCIPAL_CACHE_SIZE: int = Field(10000, alias='PRINCIPAL_CACHE_SIZE')
+    PRINCIPAL_CACHE_TTL_SECONDS: float = Field(
+        30,
+        alias='PRINCIPAL_CACHE_TTL_SECONDS'
+    )
+
+    CLAIMS_VERIFY: int = Field(0, alias='CLAIMS_VERIFY')
+    SECURITY_STAMP_CACHE_TTL_SECONDS: float = Field(
+        60,
+        alias='SECURITY_STAMP_CACHE_TTL_SECONDS'
+    )
+
+    INTROSPECTION_CACHE_SIZE: int = Field(
+        10000,
+        alias='INTROSPECTION_CACHE_SIZE'
+    )
+    INTROSPECTION_NEGATIVE_TTL_SECONDS: float = Field(
+        5,
+        alias='INTROSPECTION_NEGATIVE_TTL_SECONDS'
+    )
+    INTROSPECTION_POSITIVE_TTL_SECONDS: float = Field(
+        60,
+        alias='INTROSPECTION_POSITIVE_TTL_SECONDS'
+    )
+
+    @field_validator("SIDECAR_SOCKET_MODE", mode='before')
+    def parse_socket_mode(cls, mode: int | str) -> int:
+        # file modes are written in octal: SIDECAR_SOCKET_MODE=660 / 0o660
+        if isinstance(mode, str):
+            return int(mode, 8)
+        return mode
+
 
 class RedisSettings(BaseSettings):
 
     REDIS_URL: str | None = Field(
         "redis://default:@auth-redis:6379/0", alias='REDIS_URL'
     )
+    REDIS_INVALIDATION_CHANNEL: str = Field(
+        'auth:invalidation',
+        alias='REDIS_INVALIDATION_CHANNEL'
+    )
+
+    REDIS_MAX_CONNECTIONS: int | None = Field(
+        None,
+        alias='REDIS_MAX_CONNECTIONS'
+    )
+    REDIS_HEALTH_CHECK_INTERVAL: int = Field(
+        30,
+        alias='REDIS_HEALTH_CHECK_INTERVAL'
+    )
+    REDIS_SOCKET_TIMEOUT: float | None = Field(
+        None,
+        alias='REDIS_SOCKET_TIMEOUT'
+    )
+    REDIS_SOCKET_CONNECT_TIMEOUT: float | None = Field(
+        None,
+        alias='REDIS_SOCKET_CONNECT_TIMEOUT'
+    )
+
+    REDIS_CLIENT_CACHE: int = Field(0, alias='REDIS_CLIENT_CACHE')
+    REDIS_CLIENT_CACHE_SIZE: int = Field(
+        10000,
+        alias='REDIS_CLIENT_CACHE_SIZE'
+    )
+    REDIS_CLIENT_CACHE_TTL_SECONDS: float = Field(
+        300,
+        alias='REDIS_CLIENT_CACHE_TTL_SECONDS'
+    )
 
 
 main_settings = Settings()
@@ -0,0 +1,65 @@
+import pytest
+
+from service.auth import handlers
+from service.exceptions.api.users.types import UserExcState
+from settings import auth_settings as a_s
+from tests.constants import AUTH__CHECK_URL
+
+
+@pytest.mark.asyncio
+async def test_check_without_token(fixture_client):
+
+    response = await fixture_client.get(AUTH__CHECK_URL)
+
+    assert response.status_code == 401
+    assert response.content == b""
+    assert response.headers["X-Auth-Error"] == UserExcState.INVALID_USER_TOKEN
+
+
+@pytest.mark.asyncio
+async def test_check_authorized_user(fixture_authorized_user):
+
+    response = await fixture_authorized_user.get("client").get(AUTH__CHECK_URL)
+
+    assert response.status_code == 200
+    assert response.content == b""
+
+    user = fixture_authorized_user.get("user")
+    assert response.headers["X-Auth-User-Id"] == str(user.id)
+    assert response.headers["X-Auth-Role"] == (
+        fixture_authorized_user.get("role").rolename
+    )
+    assert response.headers["X-Auth-Organization-Id"] == str(
+        fixture_authorized_user.get("organization").id
+    )
+
+
+@pytest.mark.asyncio
+async def test_check_without_eula(fixture_authorized_user_without_eula):
+
+    a_s.SKIP_AGREEMENT = 0
+
+    response = await fixture_authorized_user_without_eula.get("client").get(
+        AUTH__CHECK_URL
+    )
+
+    assert response.status_code == 403
+    assert response.headers["X-Auth-Error"] == UserExcState.EULA_MUST_BE_ACCEPTED
+
+
+@pytest.mark.asyncio
+async def test_check_user_without_role(fixture_authorized_user, monkeypatch):
+
+    get_user_from_token = handlers.get_user_from_token
+
+    async def get_roleless_user(*args, **kwargs):
+        user = await get_user_from_token(*args, **kwargs)
+        return user.model_copy(update={"role": None})
+
+    monkeypatch.setattr(handlers, "get_user_from_token", get_roleless_user)
+
+    response = await fixture_authorized_user.get("client").get(AUTH__CHECK_URL)
+
+    assert response.status_code == 403
+    assert "X-Auth-Role" not in response.headers
+    assert response.headers["X-Auth-Error"] == UserExcState.INVALID_USER_ROLE
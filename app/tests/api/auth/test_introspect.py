@@ -0,0 +1,141 @@
+import pytest
+
+from service.auth import handlers, sessions
+from service.auth.cache import introspection_cache
+from service.exceptions.api.users import SessionStoreUnavailableException
+from service.roles.types import RoleType
+from tests.constants import AUTH__INTROSPECT_URL
+from tests.service.roles.factories import RoleFactory, UserRoleFactory
+from tests.user_access_token import get_user_access_token
+
+
+@pytest.mark.asyncio
+async def test_introspect_garbage_token(fixture_authorized_user):
+
+    introspection_cache.clear()
+
+    response = await fixture_authorized_user.get("client").post(
+        AUTH__INTROSPECT_URL,
+        data={"token": "garbage"}
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {"active": False}
+
+
+@pytest.mark.asyncio
+async def test_introspect_token_without_session(fixture_authorized_user):
+
+    introspection_cache.clear()
+
+    access_token, _ = await get_user_access_token(
+        fixture_authorized_user.get("user"),
+        fixture_authorized_user.get("role"),
+    )
+
+    response = await fixture_authorized_user.get("client").post(
+        AUTH__INTROSPECT_URL,
+        data={"token": access_token}
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {"active": False}
+
+
+@pytest.mark.asyncio
+async def test_introspect_active_token(
+    fixture_authorized_user,
+    fixture_mock_redis
+):
+
+    introspection_cache.clear()
+
+    user = fixture_authorized_user.get("user")
+    access_token = await handlers.start_session(
+        user, fixture_authorized_user.get("role").rolename
+    )
+
+    response = await fixture_authorized_user.get("client").post(
+        AUTH__INTROSPECT_URL,
+        data={"token": access_token}
+    )
+
+    assert response.status_code == 200
+
+    result = response.json()
+    assert result["active"] is True
+    assert result["sub"] == str(user.id)
+    assert result["username"] == user.email
+
+    await handlers.logout(access_token)
+
+    response = await fixture_authorized_user.get("client").post(
+        AUTH__INTROSPECT_URL,
+        data={"token": access_token}
+    )
+
+    assert response.json() == {"active": False}
+
+
+@pytest.mark.asyncio
+async def test_introspect_after_role_change(
+    fixture_authorized_user,
+    fixture_mock_redis
+):
+
+    introspection_cache.clear()
+
+    user = fixture_authorized_user.get("user")
+    client = fixture_authorized_user.get("client")
+    access_token = await handlers.start_session(
+        user, fixture_authorized_user.get("role").rolename
+    )
+
+    response = await client.post(
+        AUTH__INTROSPECT_URL, data={"token": access_token}
+    )
+    assert response.json()["active"] is True
+
+    role = await RoleFactory(rolename=RoleType.HR_DIRECTOR)
+    await UserRoleFactory(user_id=user.id, role_id=role.id)
+    await handlers.invalidate_user_principal(user.id)
+
+    response = await client.post(
+        AUTH__INTROSPECT_URL, data={"token": access_token}
+    )
+    assert response.json() == {"active": False}
+
+
+@pytest.mark.asyncio
+async def test_introspect_without_store_checks_principal(
+    fixture_authorized_user,
+    fixture_mock_redis,
+    monkeypatch
+):
+
+    introspection_cache.clear()
+
+    user = fixture_authorized_user.get("user")
+    client = fixture_authorized_user.get("client")
+    access_token = await handlers.start_session(
+        user, fixture_authorized_user.get("role").rolename
+    )
+
+    async def get_session(access_token):
+        raise SessionStoreUnavailableException()
+
+    monkeypatch.setattr(sessions, "get_session", get_session)
+
+    response = await client.post(
+        AUTH__INTROSPECT_URL, data={"token": access_token}
+    )
+    assert response.json()["active"] is True
+
+    role = await RoleFactory(rolename=RoleType.HR_DIRECTOR)
+    await UserRoleFactory(user_id=user.id, role_id=role.id)
+    await handlers.invalidate_user_principal(user.id)
+
+    response = await client.post(
+        AUTH__INTROSPECT_URL, data={"token": access_token}
+    )
+    assert response.json() == {"active": False}
@@ -0,0 +1,39 @@
+import pytest
+import rsa
+
+from service.auth import keys
+from tests.constants import AUTH__JWKS_URL
+
+
+@pytest.mark.asyncio
+async def test_jwks_hides_symmetric_keys(fixture_client):
+
+    response = await fixture_client.get(AUTH__JWKS_URL)
+
+    assert response.status_code == 200
+    assert response.json() == {"keys": []}
+
+
+@pytest.mark.asyncio
+async def test_jwks_publishes_asymmetric_key(fixture_client, monkeypatch):
+
+    _, private_key = rsa.newkeys(1024)
+    monkeypatch.setattr(
+        keys,
+        "access_key",
+        keys.TokenKey(
+            kid="test",
+            algorithm="RS256",
+            signing_key=private_key.save_pkcs1().decode(),
+            verifying_key=private_key.save_pkcs1().decode(),
+        )
+    )
+
+    response = await fixture_client.get(AUTH__JWKS_URL)
+
+    assert response.status_code == 200
+
+    jwk = response.json()["keys"][0]
+    assert jwk["kid"] == "test"
+    assert jwk["kty"] == "RSA"
+    assert "d" not in jwk
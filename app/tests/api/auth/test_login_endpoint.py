@@ -1,8 +1,27 @@
+import uuid
+from contextlib import asynccontextmanager
+
 import pytest
 from factory import faker
+from passlib.hash import bcrypt
+from sqlalchemy import select, update
+from sqlalchemy.exc import OperationalError
 
+from service.auth import handlers
+from service.helpers import hashing
+from service.users.models import User
 from settings import auth_settings as a_s
-from tests.constants import AUTH__LOGIN_URL, GLOBAL_PASSWORD
+from tests.conftest import async_session
+from tests.constants import (
+    AUTH__LOGIN_URL,
+    GLOBAL_PASSWORD,
+    GLOBAL_PASSWORD_SALT,
+)
+from tests.service.organization.factories import (
+    DepartmentFactory,
+    OrganizationFactory,
+)
+from tests.service.users.factories import UserFactory
 
 
 @pytest.mark.asyncio
@@ -33,3 +52,196 @@ async def test_login_undefined_user(
     )
     assert response.status_code == 401
     assert response.cookies.get(a_s.COOKIE_SESSION_KEY) is None
+
+
+@pytest.mark.asyncio
+async def test_login_throttled_by_email(
+    fixture_mock_redis, fixture_client, monkeypatch
+):
+    monkeypatch.setattr(a_s, "LOGIN_RATE_LIMIT_PER_EMAIL", 2)
+    email = f"{uuid.uuid4().hex}@example.com"
+
+    statuses = []
+    for _ in range(3):
+        response = await fixture_client.post(
+            AUTH__LOGIN_URL,
+            data={"username": email, "password": GLOBAL_PASSWORD},
+        )
+        statuses.append(response.status_code)
+
+    assert statuses == [401, 401, 429]
+
+
+@pytest.mark.asyncio
+async def test_login_throttled_by_forwarded_ip(
+    fixture_mock_redis, fixture_client, monkeypatch
+):
+    monkeypatch.setattr(a_s, "LOGIN_RATE_LIMIT_PER_EMAIL", 0)
+    monkeypatch.setattr(a_s, "LOGIN_RATE_LIMIT_PER_IP", 2)
+    monkeypatch.setattr(a_s, "LOGIN_CLIENT_IP_HEADER", "X-Forwarded-For")
+    first, second = (f"10.{i}.{uuid.uuid4().int % 256}.1" for i in (1, 2))
+
+    statuses = []
+    for client_ip in (first, first, first, second):
+        response = await fixture_client.post(
+            AUTH__LOGIN_URL,
+            data={
+                "username": f"{uuid.uuid4().hex}@example.com",
+                "password": GLOBAL_PASSWORD,
+            },
+            headers={"X-Forwarded-For": f"203.0.113.9, {client_ip}"},
+        )
+        statuses.append(response.status_code)
+
+    # logins through the same gateway no longer share one bucket
+    assert statuses == [401, 401, 429, 401]
+
+
+@pytest.mark.asyncio
+async def test_login_user_without_role(fixture_mock_redis, fixture_client):
+
+    org = await OrganizationFactory()
+    department = await DepartmentFactory(organization_id=org.id)
+    user = await UserFactory(department_id=department.id)
+
+    response = await fixture_client.post(
+        AUTH__LOGIN_URL,
+        data={"username": user.email, "password": GLOBAL_PASSWORD},
+    )
+    assert response.status_code == 400
+    assert response.cookies.get(a_s.COOKIE_SESSION_KEY) is None
+
+
+@pytest.mark.asyncio
+async def test_login_does_not_requery_user_info(
+    fixture_mock_redis, fixture_client, fixture_user, monkeypatch
+):
+
+    async def get_user_info(*args, **kwargs):
+        raise AssertionError("login must reuse its own row")
+
+    monkeypatch.setattr(handlers, "get_user_info", get_user_info)
+    user = fixture_user.get("user")
+
+    response = await fixture_client.post(
+        AUTH__LOGIN_URL,
+        data={"username": user.email, "password": GLOBAL_PASSWORD},
+    )
+    assert response.status_code == 200
+
+    content = response.json()
+    assert content["id"] == user.id
+    assert content["role"] == fixture_user.get("role").rolename
+
+
+@pytest.mark.asyncio
+async def test_login_deactivated_during_password_check(
+    fixture_mock_redis, fixture_client, fixture_user, monkeypatch
+):
+
+    monkeypatch.setattr(a_s, "CLAIMS_VERIFY", 1)
+    user = fixture_user.get("user")
+    verify_and_update_hash = hashing.verify_and_update_hash
+
+    async def verify_and_deactivate(*args, **kwargs):
+        result = await verify_and_update_hash(*args, **kwargs)
+
+        # an admin deactivates the user after login read the row
+        async with async_session() as session:
+            await session.execute(
+                update(User).where(User.id == user.id).values(active=False)
+            )
+            await session.commit()
+        await handlers.invalidate_user_principal(user.id)
+
+        return result
+
+    monkeypatch.setattr(
+        hashing, "verify_and_update_hash", verify_and_deactivate
+    )
+
+    response = await fixture_client.post(
+        AUTH__LOGIN_URL,
+        data={"username": user.email, "password": GLOBAL_PASSWORD},
+    )
+    assert response.status_code == 401
+    assert response.cookies.get(a_s.COOKIE_SESSION_KEY) is None
+
+
+@pytest.mark.asyncio
+async def test_login_rehashes_password_with_other_rounds(
+    fixture_mock_redis, fixture_client, fixture_user
+):
+
+    rounds = 4 if a_s.PASSWORD_HASH_ROUNDS != 4 else 5
+    user = fixture_user.get("user")
+
+    async with async_session() as session:
+        db_user = await session.get(User, user.id)
+        db_user.password = bcrypt.using(rounds=rounds).hash(
+            GLOBAL_PASSWORD + GLOBAL_PASSWORD_SALT
+        )
+        await session.commit()
+
+    response = await fixture_client.post(
+        AUTH__LOGIN_URL,
+        data={"username": user.email, "password": GLOBAL_PASSWORD},
+    )
+    assert response.status_code == 200
+
+    async with async_session() as session:
+        password = (
+            await session.execute(
+                select(User.password).where(User.id == user.id)
+            )
+        ).scalar()
+
+    assert bcrypt.from_string(password).rounds == a_s.PASSWORD_HASH_ROUNDS
+    assert bcrypt.verify(GLOBAL_PASSWORD + GLOBAL_PASSWORD_SALT, password)
+
+
+@pytest.mark.asyncio
+async def test_login_survives_failed_rehash(
+    fixture_mock_redis, fixture_client, fixture_user, monkeypatch
+):
+
+    async def verify_and_update_hash(secret, hashed):
+        return True, "new-hash"
+
+    @asynccontextmanager
+    async def transaction(db):
+        raise OperationalError("UPDATE", {}, Exception("connection lost"))
+        yield db
+
+    monkeypatch.setattr(
+        hashing, "verify_and_update_hash", verify_and_update_hash
+    )
+    monkeypatch.setattr(handlers, "transaction", transaction)
+
+    response = await fixture_client.post(
+        AUTH__LOGIN_URL,
+        data={
+            "username": fixture_user.get("user").email,
+            "password": GLOBAL_PASSWORD,
+        },
+    )
+    assert response.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_login_rejected_when_hashing_overloaded(
+    fixture_mock_redis, fixture_client, fixture_user, monkeypatch
+):
+
+    pool = hashing.hashing_pool
+    monkeypatch.setattr(pool, "pending", pool.size + pool.queue_limit)
+
+    response = await fixture_client.post(
+        AUTH__LOGIN_URL,
+        data={
+            "username": fixture_user.get("user").email,
+            "password": GLOBAL_PASSWORD,
+        },
+    )
+    assert response.status_code == 503
+    assert response.cookies.get(a_s.COOKIE_SESSION_KEY) is None
@@ -0,0 +1,124 @@
+import pytest
+from httpx import AsyncClient
+
+from main import app
+from service.auth import sessions
+from service.roles.types import RoleType
+from settings import auth_settings as a_s
+from settings import main_settings as m_s
+from tests.constants import (
+    AUTH__LOGIN_URL,
+    AUTH__LOGOUT_ALL_URL,
+    AUTH__LOGOUT_URL,
+    AUTH__SESSIONS_URL,
+    GLOBAL_PASSWORD,
+)
+
+
+async def login(user, user_agent: str) -> str:
+
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        response = await client.post(
+            AUTH__LOGIN_URL,
+            data={"username": user.email, "password": GLOBAL_PASSWORD},
+            headers={"User-Agent": user_agent},
+        )
+
+    assert response.status_code == 200
+    return response.cookies.get(a_s.COOKIE_SESSION_KEY)
+
+
+def build_client(access_token: str, user_agent: str) -> AsyncClient:
+
+    return AsyncClient(
+        app=app, base_url="http://test",
+        cookies={a_s.COOKIE_SESSION_KEY: access_token},
+        headers={"User-Agent": user_agent},
+    )
+
+
+@pytest.mark.asyncio
+async def test_list_sessions(fixture_mock_redis, fixture_authorized_user):
+
+    user = fixture_authorized_user.get("user")
+    first = await login(user, "first")
+    await login(user, "second")
+
+    async with build_client(first, "first") as client:
+        response = await client.get(AUTH__SESSIONS_URL)
+
+    assert response.status_code == 200
+
+    content = response.json()
+    assert sorted(item["user_agent"] for item in content) == [
+        "first", "second"
+    ]
+    assert [
+        item["user_agent"] for item in content if item["is_current"]
+    ] == ["first"]
+
+
+@pytest.mark.asyncio
+async def test_logout_all_revokes_every_session(
+    fixture_mock_redis, fixture_authorized_user
+):
+
+    user = fixture_authorized_user.get("user")
+    first = await login(user, "first")
+    second = await login(user, "second")
+
+    async with build_client(first, "first") as client:
+        response = await client.delete(AUTH__LOGOUT_ALL_URL)
+        assert response.status_code == 200
+
+        response = await client.get(AUTH__SESSIONS_URL)
+        assert response.json() == []
+
+    assert await sessions.get_session(first) is None
+    assert await sessions.get_session(second) is None
+
+
+@pytest.mark.asyncio
+async def test_deactivation_revokes_sessions(
+    fixture_mock_redis, fixture_authorized_user, fixture_authorized_user_master
+):
+
+    user = fixture_authorized_user.get("user")
+    access_token = await login(user, "first")
+    assert await sessions.get_session(access_token)
+
+    response = await fixture_authorized_user_master.get("client").put(
+        f"{m_s.USE_PREFIX}/users/{user.id}",
+        data={"active": False},
+        params={"role": RoleType.HR_RECRUITER},
+    )
+    assert response.status_code == 201
+    assert response.json()["active"] is False
+
+    assert await sessions.get_session(access_token) is None
+
+
+@pytest.mark.asyncio
+async def test_deactivation_forbidden_for_regular_user(
+    fixture_mock_redis, fixture_authorized_user, fixture_user
+):
+
+    target = fixture_user.get("user")
+    access_token = await login(target, "first")
+
+    response = await fixture_authorized_user.get("client").put(
+        f"{m_s.USE_PREFIX}/users/{target.id}",
+        data={"active": False},
+        params={"role": RoleType.HR_RECRUITER},
+    )
+    assert response.status_code == 403
+
+    assert await sessions.get_session(access_token)
+
+
+@pytest.mark.asyncio
+async def test_logout_without_cookie(fixture_mock_redis, fixture_client):
+
+    response = await fixture_client.delete(AUTH__LOGOUT_URL)
+
+    assert response.status_code == 200
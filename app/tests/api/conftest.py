@@ -85,6 +85,34 @@ async def fixture_authorized_user_without_eula():
         yield info
 
 
+@pytest.fixture(scope="function")
+async def fixture_authorized_user_master():
+
+    org = await OrganizationFactory(full_name="master", short_name="MASTER")
+    department = await DepartmentFactory(organization_id=org.id)
+    user = await UserFactory(department_id=department.id)
+    role = await RoleFactory(rolename=RoleType.USER_MASTER)
+    await UserAgreementFactory(user_id=user.id, organization_id=org.id)
+    await UserRoleFactory(user_id=user.id, role_id=role.id)
+
+    access_token, refresh_token = await get_user_access_token(user, role)
+    cookies = {a_s.COOKIE_SESSION_KEY: access_token}
+    headers = {"Authorization": f'Bearer {access_token}'}
+
+    async with AsyncClient(
+        app=app, base_url="http://test",
+        cookies=cookies, headers=headers
+    ) as ac:
+        info = {
+            "client": ac,
+            "user": user,
+            "department": department,
+            "organization": org,
+            "role": role
+        }
+        yield info
+
+
 @pytest.fixture(scope="function")
 async def fixture_inactive_user():
     org = await OrganizationFactory()
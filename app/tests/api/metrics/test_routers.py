@@ -0,0 +1,53 @@
+import pytest
+from httpx import AsyncClient
+
+from main import app
+from service.roles.types import RoleType
+from settings import auth_settings as a_s
+from tests.constants import METRICS_URL
+from tests.service.organization.factories import (
+    DepartmentFactory,
+    OrganizationFactory,
+)
+from tests.service.roles.factories import RoleFactory, UserRoleFactory
+from tests.service.users.factories import UserAgreementFactory, UserFactory
+from tests.user_access_token import get_user_access_token
+
+
+@pytest.mark.asyncio
+async def test_metrics_without_header(fixture_client):
+
+    response = await fixture_client.get(METRICS_URL)
+
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_metrics_forbidden_for_regular_user(fixture_authorized_user):
+
+    response = await fixture_authorized_user.get("client").get(METRICS_URL)
+
+    assert response.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_metrics_for_user_master():
+
+    org = await OrganizationFactory()
+    department = await DepartmentFactory(organization_id=org.id)
+    user = await UserFactory(department_id=department.id)
+    role = await RoleFactory(rolename=RoleType.USER_MASTER)
+    await UserAgreementFactory(user_id=user.id, organization_id=org.id)
+    await UserRoleFactory(user_id=user.id, role_id=role.id)
+
+    access_token, _ = await get_user_access_token(user, role)
+
+    async with AsyncClient(
+        app=app, base_url="http://test",
+        headers={"Authorization": f"Bearer {access_token}"},
+        cookies={a_s.COOKIE_SESSION_KEY: access_token},
+    ) as client:
+        response = await client.get(METRICS_URL)
+
+    assert response.status_code == 200
+    assert set(response.json()) == {"hashing", "session_store"}
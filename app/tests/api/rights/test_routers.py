@@ -4,6 +4,7 @@ from sqlalchemy import select
 from service.rights.types import RightType, SourceType
 from service.roles.models import Role
 from service.roles.types import RoleType
+from settings import auth_settings as a_s
 from settings import main_settings as m_s
 from tests.conftest import async_session
 from tests.service.rights.factories import SpecRightsFactory, UserRightsFactory
@@ -261,3 +262,142 @@ async def test_get_users_single_right_by_source_id(fixture_authorized_user):
 
     content = response.json()
     assert content['right_type'] == RightType.DELETE
+
+
+@pytest.mark.asyncio
+async def test_highest_right_reflects_revoke(fixture_authorized_user):
+
+    user = fixture_authorized_user.get("user")
+    client = fixture_authorized_user.get("client")
+
+    source_id = 1
+    url = f'{m_s.USE_PREFIX}/rights/by-rel/{source_id}/{user.id}'
+
+    right = await SpecRightsFactory(
+        source_type=SourceType.VACANCY, source_id=source_id,
+        right_type=RightType.VIEW_ALL,
+    )
+    await UserRightsFactory(subject_id=user.id, right_id=right.id)
+
+    response = await client.get(url, params={"source_type": SourceType.VACANCY})
+    assert response.status_code == 200
+    assert response.json()["right_type"] == RightType.VIEW_ALL
+
+    response = await client.delete(url)
+    assert response.status_code == 200
+
+    response = await client.get(url, params={"source_type": SourceType.VACANCY})
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_delete_right_by_source_type(fixture_authorized_user):
+
+    user = fixture_authorized_user.get("user")
+    client = fixture_authorized_user.get("client")
+
+    source_id = 1
+    url = f'{m_s.USE_PREFIX}/rights/by-rel/{source_id}/{user.id}'
+
+    for source_type in [SourceType.VACANCY, SourceType.VACANCY_REQUEST]:
+        right = await SpecRightsFactory(
+            source_type=source_type, source_id=source_id,
+            right_type=RightType.VIEW_ALL,
+        )
+        await UserRightsFactory(subject_id=user.id, right_id=right.id)
+
+    # the source id alone does not tell which right to delete
+    response = await client.delete(url)
+    assert response.status_code == 404
+
+    response = await client.delete(
+        url, params={"source_type": SourceType.VACANCY}
+    )
+    assert response.status_code == 200
+
+    response = await client.get(url, params={"source_type": SourceType.VACANCY})
+    assert response.status_code == 404
+
+    response = await client.get(
+        url, params={"source_type": SourceType.VACANCY_REQUEST}
+    )
+    assert response.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_filter_candidates(fixture_authorized_user):
+
+    user = fixture_authorized_user.get("user")
+    client = fixture_authorized_user.get("client")
+
+    for source_id, right_type in [
+        (1, RightType.VIEW_PUBLIC),
+        (2, RightType.VIEW_ALL),
+        (2, RightType.MANAGE),
+    ]:
+        right = await SpecRightsFactory(
+            source_type=SourceType.VACANCY, source_id=source_id,
+            right_type=right_type,
+        )
+        await UserRightsFactory(subject_id=user.id, right_id=right.id)
+
+    response = await client.post(
+        f'{m_s.USE_PREFIX}/rights/filter-candidates',
+        json={
+            "subject_id": user.id,
+            "source_type": SourceType.VACANCY,
+            "source_ids": [3, 2, 1, 2],
+        },
+    )
+
+    assert response.status_code == 200
+    assert [
+        (right["source_id"], right["right_type"])
+        for right in response.json()["allowed"]
+    ] == [(2, RightType.MANAGE), (1, RightType.VIEW_PUBLIC)]
+
+
+@pytest.mark.asyncio
+async def test_filter_candidates_page_is_bounded(fixture_authorized_user):
+
+    user = fixture_authorized_user.get("user")
+    client = fixture_authorized_user.get("client")
+
+    response = await client.post(
+        f'{m_s.USE_PREFIX}/rights/filter-candidates',
+        json={
+            "subject_id": user.id,
+            "source_type": SourceType.VACANCY,
+            "source_ids": list(range(a_s.FILTER_CANDIDATES_MAX_SIZE + 1)),
+        },
+    )
+
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_get_users_rights_by_source_id_interleaved(fixture_authorized_user):
+
+    department = fixture_authorized_user.get("department")
+    client = fixture_authorized_user.get("client")
+
+    source_id = 1
+    for right_type in [RightType.VIEW_ALL, RightType.MANAGE, RightType.VIEW_ALL]:
+        right = await SpecRightsFactory(
+            source_type=SourceType.VACANCY, source_id=source_id,
+            right_type=right_type,
+        )
+        new_user = await UserFactory(department_id=department.id)
+        await UserRightsFactory(subject_id=new_user.id, right_id=right.id)
+
+    response = await client.get(
+        f'{m_s.USE_PREFIX}/rights/by-rel/{source_id}',
+        params={"source_type": SourceType.VACANCY},
+    )
+
+    assert response.status_code == 200
+
+    content = response.json()
+
+    assert len(content[RightType.VIEW_ALL]) == 2
+    assert len(content[RightType.MANAGE]) == 1
@@ -207,3 +207,37 @@ async def test_whoami_eula_mock_off(
     info = response.json()
 
     assert info['is_eula_accepted'] is False
+
+
+@pytest.mark.asyncio
+async def test_accept_eula_invalidates_cached_principal(fixture_client):
+
+    a_s.SKIP_AGREEMENT = 0
+
+    org = await OrganizationFactory()
+    department = await DepartmentFactory(organization_id=org.id)
+    user = await UserFactory(department_id=department.id)
+    role = await RoleFactory(rolename=RoleType.HR_RECRUITER)
+    await UserRoleFactory(user_id=user.id, role_id=role.id)
+
+    access_token, _ = await get_user_access_token(user, role)
+    cookies = {a_s.COOKIE_SESSION_KEY: access_token}
+    headers = {"Authorization": f'Bearer {access_token}'}
+
+    response = await fixture_client.get(
+        USER__WHOAMI_URL, cookies=cookies, headers=headers
+    )
+    assert response.json()["is_eula_accepted"] is False
+
+    response = await fixture_client.post(
+        AGREEMENTS__ACCEPT_URL,
+        cookies=cookies,
+        headers=headers,
+        json={"agreement_types": [UserAgreementType.EULA]},
+    )
+    assert response.status_code == status.HTTP_200_OK
+
+    response = await fixture_client.get(
+        USER__WHOAMI_URL, cookies=cookies, headers=headers
+    )
+    assert response.json()["is_eula_accepted"] is True
@@ -1,8 +1,18 @@
 import pytest
 from fastapi import status
 
+from api.users.schemas import UserTTInfo
+from service.auth.api_keys import ApiKeyRecord, api_key_table, generate_api_key
+from service.exceptions.api.users.types import UserExcState
 from service.rights.types import RightType, SourceType
-from service.types import IntegrationUserState, JobSiteMacroEnum, OrganizationBillingType
+from service.roles.types import RoleType
+from service.types import (
+    ApiKeyScope,
+    IntegrationUserState,
+    JobSiteMacroEnum,
+    OrganizationBillingType,
+)
+from settings import auth_settings as a_s
 from settings import main_settings as m_s
 from tests.service.organization.factories import (
     DepartmentFactory,
@@ -284,3 +294,51 @@ async def test_get_user_with_job_site_policy_not_found(fixture_authorized_user):
     )
 
     assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.asyncio
+async def test_integrations_with_api_key(fixture_client, monkeypatch):
+
+    # restored on teardown even if the test fails
+    monkeypatch.setattr(api_key_table, "records", {})
+    monkeypatch.setattr(api_key_table, "user_ids", set())
+
+    org = await OrganizationFactory()
+    dep = await DepartmentFactory(organization_id=org.id)
+    user = await UserFactory(department_id=dep.id)
+
+    key_id, key_hash, api_key = generate_api_key()
+    api_key_table.replace([
+        ApiKeyRecord(
+            key_id=key_id,
+            key_hash=key_hash,
+            scopes=frozenset({ApiKeyScope.INTEGRATIONS}),
+            user=UserTTInfo(
+                id=user.id,
+                email=user.email,
+                first_name=user.first_name,
+                last_name=user.last_name,
+                department_id=dep.id,
+                organization_id=org.id,
+                active=True,
+                is_internal=True,
+                role=RoleType.SERVICE_USER,
+            ),
+        )
+    ])
+
+    url = (
+        f"{m_s.USE_PREFIX}/integrations/policy/"
+        f"{JobSiteMacroEnum.HEADHUNTER.lower()}/{user.id}"
+    )
+
+    response = await fixture_client.get(
+        url, headers={a_s.API_KEY_HEADER: api_key}
+    )
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    response = await fixture_client.get(
+        url, headers={a_s.API_KEY_HEADER: f"{key_id}.wrong"}
+    )
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    assert response.json()["exc_state"] == UserExcState.INVALID_API_KEY
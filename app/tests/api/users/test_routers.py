@@ -232,3 +232,24 @@ async def test_get_users_by_ids_with_duplicate_id(
     assert response.status_code == 200
     content = response.json()
     assert len(content) == 10
+
+
+@pytest.mark.asyncio
+async def test_update_user_invalidates_cached_principal(
+    fixture_authorized_user
+):
+    user = fixture_authorized_user.get("user")
+    client = fixture_authorized_user.get("client")
+
+    response = await client.get(USER__WHOAMI_URL)
+    assert response.json()["first_name"] == user.first_name
+
+    response = await client.put(
+        f"{m_s.USE_PREFIX}/users/{user.id}",
+        data={"first_name": "renamed"},
+        params={"role": RoleType.HR_RECRUITER},
+    )
+    assert response.status_code == 201
+
+    response = await client.get(USER__WHOAMI_URL)
+    assert response.json()["first_name"] == "renamed"
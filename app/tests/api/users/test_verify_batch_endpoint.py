@@ -0,0 +1,80 @@
+import pytest
+
+from settings import auth_settings as a_s
+from service.exceptions.api.users.types import UserExcState
+from service.helpers import utils
+from tests.constants import USER__VERIFY_BATCH_URL
+from tests.user_access_token import get_user_access_token
+
+
+@pytest.mark.asyncio
+async def test_without_header(
+    fixture_client
+):
+    response = await fixture_client.post(
+        USER__VERIFY_BATCH_URL,
+        json={"tokens": []}
+    )
+
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_batch_results_keep_order(
+    fixture_authorized_user
+):
+    user = fixture_authorized_user.get("user")
+    access_token, _ = await get_user_access_token(
+        user, fixture_authorized_user.get("role")
+    )
+    fake_role_token = utils.create_token(
+        {
+            "email": user.email,
+            "user_id": user.id,
+            "role": "PEPE",
+        },
+        minutes=int(a_s.ACCESS_TOKEN_EXPIRES_MINUTES),
+        secret_key=a_s.ACCESS_TOKEN_SECRET_KEY,
+        algorithm=a_s.TOKENS_ALGORITHM,
+    )
+
+    response = await fixture_authorized_user.get("client").post(
+        USER__VERIFY_BATCH_URL,
+        json={"tokens": [access_token, "garbage", fake_role_token]}
+    )
+
+    assert response.status_code == 200
+
+    valid, garbage, fake_role = response.json()
+    assert valid["is_valid"] is True
+    assert valid["user"]["id"] == user.id
+    assert valid["user"]["role"] == fixture_authorized_user.get("role").rolename
+
+    assert garbage["is_valid"] is False
+    assert garbage["exc_state"] == UserExcState.INVALID_USER_TOKEN
+
+    assert fake_role["is_valid"] is False
+    assert fake_role["exc_state"] == UserExcState.INVALID_USER_ROLE
+
+
+@pytest.mark.asyncio
+async def test_batch_without_eula(
+    fixture_authorized_user_without_eula
+):
+    a_s.SKIP_AGREEMENT = 0
+
+    access_token, _ = await get_user_access_token(
+        fixture_authorized_user_without_eula.get("user"),
+        fixture_authorized_user_without_eula.get("role"),
+    )
+
+    response = await fixture_authorized_user_without_eula.get("client").post(
+        USER__VERIFY_BATCH_URL,
+        json={"tokens": [access_token]}
+    )
+
+    assert response.status_code == 200
+
+    result = response.json()[0]
+    assert result["is_valid"] is False
+    assert result["exc_state"] == UserExcState.EULA_MUST_BE_ACCEPTED
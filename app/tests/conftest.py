@@ -13,7 +13,10 @@ from sqlalchemy.ext.asyncio import (
 from sqlalchemy.pool import NullPool
 
 from settings import test_postgres_settings, redis_settings
-from service.auth import handlers
+from service.auth import sessions
+from service.auth.cache import clear_principals
+from service.auth.stores import RedisSessionStore
+from service.rights.index import rights_index
 
 from db.session import get_db
 from db.meta import Base
@@ -43,6 +46,9 @@ async def prepare_database():
     async with engine_test.begin() as conn:
         await conn.run_sync(Base.metadata.drop_all)
         await conn.run_sync(Base.metadata.create_all)
+    # ids restart with the schema, entries of earlier tests would leak
+    clear_principals()
+    rights_index.evict()
     yield
 
 
@@ -57,7 +63,9 @@ async def fixture_client():
 async def fixture_mock_redis(monkeypatch):
     redis_cache = aioredis.from_url(redis_settings.REDIS_URL, decode_responses=True)
     monkeypatch.setattr(
-        handlers, "redis", redis_cache
+        sessions,
+        "store",
+        RedisSessionStore(redis_cache, sessions.SESSION_KEY_PREFIX)
     )
     yield
     await redis_cache.close()
@@ -6,10 +6,17 @@ GLOBAL_PASSWORD = str(uuid.uuid4())
 GLOBAL_PASSWORD_SALT = uuid.uuid4().hex
 
 USER__VERIFY_URL = f"{m_s.USE_PREFIX}/users/verify"
+USER__VERIFY_BATCH_URL = f"{m_s.USE_PREFIX}/users/verify/batch"
 USER__CREATE_USER_URL = f"{m_s.USE_PREFIX}/users"
 USER__WHOAMI_URL = f"{m_s.USE_PREFIX}/users/whoami"
 
 AUTH__LOGIN_URL = f"{m_s.USE_PREFIX}/auth"
 AUTH__LOGOUT_URL = f"{m_s.USE_PREFIX}/logout"
+AUTH__LOGOUT_ALL_URL = f"{m_s.USE_PREFIX}/logout/all"
+AUTH__SESSIONS_URL = f"{m_s.USE_PREFIX}/auth/sessions"
+AUTH__JWKS_URL = f"{m_s.USE_PREFIX}/.well-known/jwks.json"
+AUTH__INTROSPECT_URL = f"{m_s.USE_PREFIX}/auth/introspect"
+AUTH__CHECK_URL = f"{m_s.USE_PREFIX}/auth/check"
+METRICS_URL = f"{m_s.USE_PREFIX}/metrics"
 
 AGREEMENTS__ACCEPT_URL = f"{m_s.USE_PREFIX}/agreements/accept"
@@ -0,0 +1,101 @@
+import asyncio
+
+import pytest
+
+from service.auth import sessions
+from service.auth.stores import MemorySessionStore
+from service.exceptions.api.users import SessionStoreUnavailableException
+from service.helpers.breaker import (
+    CircuitBreaker,
+    CircuitOpenError,
+    CircuitState,
+)
+
+
+class StalledSessionStore(MemorySessionStore):
+
+    stalled = True
+
+    async def get(self, session_key: str) -> str | None:
+
+        if self.stalled:
+            await asyncio.sleep(10)
+
+        return await super().get(session_key)
+
+
+@pytest.fixture
+def fixture_stalled_store(monkeypatch):
+
+    store = StalledSessionStore()
+    monkeypatch.setattr(sessions, "store", store)
+    monkeypatch.setattr(
+        sessions,
+        "store_breaker",
+        CircuitBreaker(failure_threshold=2, reset_timeout=0.05, call_timeout=0.01),
+    )
+    return store
+
+
+async def test_stalled_store_opens_circuit(fixture_stalled_store):
+
+    for _ in range(2):
+        with pytest.raises(SessionStoreUnavailableException):
+            await sessions.get_session("token")
+
+    assert sessions.store_breaker.state == CircuitState.OPEN
+
+    with pytest.raises(SessionStoreUnavailableException):
+        await asyncio.wait_for(sessions.get_session("token"), 0.005)
+
+    assert sessions.store_breaker.stats()["rejected"] == 1
+
+
+async def test_circuit_closes_after_successful_probe(fixture_stalled_store):
+
+    for _ in range(2):
+        with pytest.raises(SessionStoreUnavailableException):
+            await sessions.get_session("token")
+
+    fixture_stalled_store.stalled = False
+    await asyncio.sleep(0.05)
+
+    assert sessions.store_breaker.state == CircuitState.HALF_OPEN
+    assert await sessions.get_session("token") is None
+    assert sessions.store_breaker.state == CircuitState.CLOSED
+
+
+async def test_late_call_does_not_end_probe():
+
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+    late_done = asyncio.Event()
+    probe_done = asyncio.Event()
+
+    async def fail():
+        raise ConnectionError()
+
+    # started while closed, finishes in the middle of the probe
+    late = asyncio.create_task(breaker.call(late_done.wait))
+    await asyncio.sleep(0)
+
+    with pytest.raises(ConnectionError):
+        await breaker.call(fail)
+    await asyncio.sleep(0.05)
+
+    probe = asyncio.create_task(breaker.call(probe_done.wait))
+    await asyncio.sleep(0)
+    assert breaker.probing
+
+    late_done.set()
+    await late
+
+    assert breaker.probing
+    assert breaker.state == CircuitState.HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        await breaker.call(probe_done.wait)
+
+    probe_done.set()
+    await probe
+
+    assert breaker.state == CircuitState.CLOSED
+    assert not breaker.probing
@@ -0,0 +1,27 @@
+from service.auth.cache import evict_principal, introspection_cache
+from service.helpers.cache import LRUTTLCache
+
+
+def test_pop_if():
+
+    cache = LRUTTLCache(maxsize=10, ttl=60)
+    for i in range(4):
+        cache.set(i, i)
+
+    cache.pop_if(lambda value: value % 2 == 0)
+
+    assert [cache.get(i) for i in range(4)] == [None, 1, None, 3]
+
+
+def test_principal_eviction_drops_introspections():
+
+    introspection_cache.clear()
+    introspection_cache.set("first", {"active": True, "sub": "1"})
+    introspection_cache.set("second", {"active": True, "sub": "2"})
+
+    evict_principal(1)
+
+    assert introspection_cache.get("first") is None
+    assert introspection_cache.get("second") is not None
+
+    introspection_cache.clear()
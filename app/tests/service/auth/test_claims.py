@@ -0,0 +1,118 @@
+import pytest
+
+from api.users.schemas import UserTTInfo
+from service.auth import handlers, sessions
+from service.auth.cache import clear_principals
+from service.auth.stores import MemorySessionStore
+from service.roles.types import RoleType
+from settings import auth_settings as a_s
+
+
+@pytest.fixture
+def fixture_claims_store(monkeypatch):
+
+    store = MemorySessionStore()
+    monkeypatch.setattr(sessions, "store", store)
+    monkeypatch.setattr(a_s, "CLAIMS_VERIFY", 1)
+    clear_principals()
+    yield store
+    clear_principals()
+
+
+@pytest.fixture
+def fixture_claims_user():
+
+    return UserTTInfo(
+        id=1,
+        email="user@example.com",
+        first_name="first",
+        last_name="last",
+        role=RoleType.HR_RECRUITER,
+        is_eula_accepted=True,
+        active=True,
+        phone_number="+1234567890",
+        is_internal=True,
+    )
+
+
+async def mint_claims(user: UserTTInfo, stamp: int | None = None) -> dict:
+
+    if stamp is None:
+        stamp = await handlers.issue_security_stamp(user.id)
+
+    access_token = await handlers.mint_access_token(
+        user, user.role, stamp=stamp
+    )
+    return await handlers.decode_access_token(access_token)
+
+
+async def test_claims_carry_no_contact_details(
+    fixture_claims_store, fixture_claims_user
+):
+
+    token = await mint_claims(fixture_claims_user)
+
+    assert set(token["usr"]) == handlers.CLAIMS_FIELDS
+
+    user = await handlers.get_user_from_claims(token)
+    assert user.email == fixture_claims_user.email
+    assert user.phone_number is None
+    assert user.is_internal is None
+
+
+async def test_stamp_bump_invalidates_claims(
+    fixture_claims_store, fixture_claims_user
+):
+
+    token = await mint_claims(fixture_claims_user)
+    assert await handlers.get_user_from_claims(token)
+
+    await handlers.invalidate_user_principal(fixture_claims_user.id)
+
+    assert await handlers.get_user_from_claims(token) is None
+    assert await handlers.get_user_from_claims(
+        await mint_claims(fixture_claims_user)
+    )
+
+
+async def test_flushed_store_does_not_revive_claims(
+    fixture_claims_store, fixture_claims_user
+):
+
+    stale = await mint_claims(fixture_claims_user)
+    await handlers.invalidate_user_principal(fixture_claims_user.id)
+
+    fixture_claims_store.stamps.clear()
+    clear_principals()
+
+    assert await handlers.get_user_from_claims(stale) is None
+
+    fresh = await mint_claims(fixture_claims_user)
+    assert fresh["stamp"] > stale["stamp"]
+    assert await handlers.get_user_from_claims(stale) is None
+    assert await handlers.get_user_from_claims(fresh)
+
+
+async def test_stamp_bump_before_mint_invalidates_claims(
+    fixture_claims_store, fixture_claims_user
+):
+
+    stamp = await handlers.issue_security_stamp(fixture_claims_user.id)
+    # the user is loaded here and changed by an admin before the mint
+    await handlers.invalidate_user_principal(fixture_claims_user.id)
+
+    token = await mint_claims(fixture_claims_user, stamp)
+    assert await handlers.get_user_from_claims(token) is None
+
+
+async def test_no_claims_without_stamp(
+    fixture_claims_store, fixture_claims_user
+):
+
+    access_token = await handlers.mint_access_token(
+        fixture_claims_user, fixture_claims_user.role
+    )
+    token = await handlers.decode_access_token(access_token)
+
+    assert "usr" not in token
+    assert await handlers.get_user_from_claims(token) is None
@@ -0,0 +1,133 @@
+import base64
+import json
+
+import pytest
+from jose.exceptions import ExpiredSignatureError, JWTError
+from pydantic import ValidationError
+
+from service.auth.decoders import BENCHMARK_DECODERS, get_decoder
+from service.helpers import utils
+from settings import AuthSettings
+from settings import auth_settings as a_s
+
+
+def create_token(minutes: int) -> str:
+
+    return utils.create_token(
+        {"email": "mock@mock.com", "user_id": 1, "role": "HR_RECRUITER"},
+        secret_key=a_s.ACCESS_TOKEN_SECRET_KEY,
+        minutes=minutes,
+        algorithm=a_s.TOKENS_ALGORITHM,
+    )
+
+
+@pytest.mark.parametrize("name", list(BENCHMARK_DECODERS))
+def test_decoders_agree_with_jose(name):
+
+    token = create_token(10)
+
+    assert BENCHMARK_DECODERS[name].decode(
+        token, a_s.ACCESS_TOKEN_SECRET_KEY, a_s.TOKENS_ALGORITHM
+    ) == BENCHMARK_DECODERS["jose"].decode(
+        token, a_s.ACCESS_TOKEN_SECRET_KEY, a_s.TOKENS_ALGORITHM
+    )
+
+
+@pytest.mark.parametrize("name", list(BENCHMARK_DECODERS))
+def test_decoders_reject_tampered_token(name):
+
+    token = create_token(10)
+
+    with pytest.raises(JWTError):
+        BENCHMARK_DECODERS[name].decode(
+            token[:-4] + "AAAA",
+            a_s.ACCESS_TOKEN_SECRET_KEY,
+            a_s.TOKENS_ALGORITHM
+        )
+
+
+@pytest.mark.parametrize("name", list(BENCHMARK_DECODERS))
+def test_decoders_reject_expired_token(name):
+
+    token = create_token(-1)
+
+    with pytest.raises(ExpiredSignatureError):
+        BENCHMARK_DECODERS[name].decode(
+            token, a_s.ACCESS_TOKEN_SECRET_KEY, a_s.TOKENS_ALGORITHM
+        )
+
+
+def encode_segment(value: dict) -> str:
+
+    return base64.urlsafe_b64encode(
+        json.dumps(value).encode()
+    ).decode().rstrip("=")
+
+
+def test_production_decoder_is_jose():
+
+    assert get_decoder().name == "jose"
+
+    with pytest.raises(KeyError):
+        get_decoder("hmac")
+
+
+@pytest.mark.parametrize("name", ["hmac", "pyjwt"])
+def test_jwt_decoder_setting_is_validated(monkeypatch, name):
+
+    monkeypatch.setenv("JWT_DECODER", name)
+
+    with pytest.raises(ValidationError):
+        AuthSettings()
+
+
+@pytest.mark.parametrize("name", list(BENCHMARK_DECODERS))
+@pytest.mark.parametrize("alg", ["none", "HS512", "RS256"])
+def test_decoders_reject_other_alg_header(name, alg):
+
+    header, payload, signature = create_token(10).split(".")
+    token = ".".join([
+        encode_segment({"alg": alg, "typ": "JWT"}), payload, signature
+    ])
+
+    with pytest.raises(JWTError):
+        BENCHMARK_DECODERS[name].decode(
+            token, a_s.ACCESS_TOKEN_SECRET_KEY, a_s.TOKENS_ALGORITHM
+        )
+
+
+@pytest.mark.parametrize("name", list(BENCHMARK_DECODERS))
+@pytest.mark.parametrize("token", [
+    "",
+    "garbage",
+    "a.b",
+    "a.b.c.d",
+    "!!!.###.$$$",
+])
+def test_decoders_reject_malformed_token(name, token):
+
+    with pytest.raises(JWTError):
+        BENCHMARK_DECODERS[name].decode(
+            token, a_s.ACCESS_TOKEN_SECRET_KEY, a_s.TOKENS_ALGORITHM
+        )
+
+
+def decode_or_error(name: str, token: str) -> dict | type:
+
+    try:
+        return BENCHMARK_DECODERS[name].decode(
+            token, a_s.ACCESS_TOKEN_SECRET_KEY, a_s.TOKENS_ALGORITHM
+        )
+    except JWTError:
+        return JWTError
+
+
+@pytest.mark.parametrize("name", list(BENCHMARK_DECODERS))
+@pytest.mark.parametrize("segment", [0, 1, 2])
+def test_decoders_agree_on_padded_segments(name, segment):
+
+    parts = create_token(10).split(".")
+    parts[segment] += "=="
+    token = ".".join(parts)
+
+    assert decode_or_error(name, token) == decode_or_error("jose", token)
@@ -0,0 +1,47 @@
+import asyncio
+import time
+
+import pytest
+
+from service.exceptions.api.users import PasswordHashingOverloadedException
+from service.helpers.hashing import HashingPool
+
+
+@pytest.fixture
+def fixture_hashing_pool():
+
+    pool = HashingPool(size=1, queue_limit=1)
+    yield pool
+    pool.shutdown()
+
+
+async def test_pool_runs_and_records_wait_time(fixture_hashing_pool):
+
+    assert await fixture_hashing_pool.run(abs, -1) == 1
+
+    stats = fixture_hashing_pool.stats()
+    assert stats["completed"] == 1
+    assert stats["in_flight"] == 0
+    assert stats["wait_time_max"] >= 0
+
+
+async def test_pool_rejects_over_queue_limit(fixture_hashing_pool):
+
+    # one call runs, one waits in the queue, the third is rejected
+    calls = [
+        asyncio.create_task(fixture_hashing_pool.run(time.sleep, 0.5))
+        for _ in range(2)
+    ]
+    await asyncio.sleep(0)
+
+    assert fixture_hashing_pool.stats()["queue_depth"] == 1
+
+    with pytest.raises(PasswordHashingOverloadedException):
+        await fixture_hashing_pool.run(abs, -1)
+
+    await asyncio.gather(*calls)
+
+    stats = fixture_hashing_pool.stats()
+    assert stats["rejected"] == 1
+    assert stats["completed"] == 2
+    assert stats["queue_depth"] == 0
@@ -0,0 +1,131 @@
+import json
+import os
+import time
+
+import pytest
+
+from service.auth import handlers, keys
+from service.auth.cache import decoded_token_cache
+from service.helpers import utils
+from service.exceptions.api.users import InvalidUserTokenException
+from settings import auth_settings as a_s
+
+
+@pytest.fixture
+def fixture_keyring(monkeypatch):
+
+    active = keys.build_key(kid="new", algorithm="HS256", secret_key="new")
+    previous = keys.build_key(
+        kid="old",
+        algorithm="HS256",
+        secret_key="old",
+        retires_at=time.time() + 60,
+    )
+    retired = keys.build_key(
+        kid="retired",
+        algorithm="HS256",
+        secret_key="retired",
+        retires_at=time.time() - 60,
+    )
+
+    monkeypatch.setattr(keys, "access_key", active)
+    monkeypatch.setattr(
+        keys,
+        "keyring",
+        {key.kid: key for key in (active, previous, retired)}
+    )
+
+
+def test_previous_key_is_accepted(fixture_keyring):
+
+    assert keys.get_access_key("new").signing_key == "new"
+    assert keys.get_access_key("old").verifying_key == "old"
+
+
+@pytest.mark.parametrize("kid", ["retired", "unknown"])
+def test_retired_and_unknown_keys_are_rejected(fixture_keyring, kid):
+
+    with pytest.raises(InvalidUserTokenException):
+        keys.get_access_key(kid)
+
+
+def write_keyring(path, active: str, kids: list[str]) -> None:
+
+    path.write_text(json.dumps({
+        "active": active,
+        "keys": [
+            {"kid": kid, "algorithm": "HS256", "secret_key": kid}
+            for kid in kids
+        ],
+    }))
+    # make sure the rewrite is seen even on coarse filesystem clocks
+    mtime = time.time_ns() + 10 ** 9
+    os.utime(path, ns=(mtime, mtime))
+
+
+@pytest.fixture
+def fixture_keyring_file(tmp_path, monkeypatch):
+
+    path = tmp_path / "keyring.json"
+    write_keyring(path, "old", ["old"])
+
+    monkeypatch.setattr(a_s, "ACCESS_TOKEN_KEYRING_FILE", str(path))
+    monkeypatch.setattr(a_s, "ACCESS_TOKEN_KEYRING_MISS_RELOAD_SECONDS", 60)
+    monkeypatch.setattr(keys, "keyring_missed_at", float("-inf"))
+
+    access_key, keyring = keys.load_keyring()
+    monkeypatch.setattr(keys, "access_key", access_key)
+    monkeypatch.setattr(keys, "keyring", keyring)
+    monkeypatch.setattr(keys, "keyring_mtime", keys.get_keyring_mtime())
+
+    return path
+
+
+def test_unknown_kid_reloads_keyring(fixture_keyring_file):
+
+    # another worker already activated the new key
+    write_keyring(fixture_keyring_file, "new", ["old", "new"])
+
+    assert keys.get_access_key("new").verifying_key == "new"
+    assert keys.access_key.kid == "new"
+
+
+def test_unknown_kid_reload_is_rate_limited(fixture_keyring_file):
+
+    with pytest.raises(InvalidUserTokenException):
+        keys.get_access_key("new")
+
+    write_keyring(fixture_keyring_file, "new", ["old", "new"])
+
+    with pytest.raises(InvalidUserTokenException):
+        keys.get_access_key("new")
+
+    assert keys.access_key.kid == "old"
+
+
+async def test_cached_token_of_retired_key_is_rejected(
+    fixture_keyring, monkeypatch
+):
+
+    decoded_token_cache.clear()
+    token = utils.create_token(
+        {"email": "mock@mock.com", "user_id": 1, "role": "HR_RECRUITER"},
+        secret_key="old",
+        minutes=10,
+        algorithm="HS256",
+        headers={"kid": "old"},
+    )
+    assert await handlers.decode_access_token(token)
+
+    retired = keys.build_key(
+        kid="old",
+        algorithm="HS256",
+        secret_key="old",
+        retires_at=time.time() - 1,
+    )
+    monkeypatch.setitem(keys.keyring, "old", retired)
+
+    with pytest.raises(InvalidUserTokenException):
+        await handlers.decode_access_token(token)
+
+    decoded_token_cache.clear()
@@ -0,0 +1,64 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+
+from service.auth import handlers
+
+
+class FakeSession:
+
+    closed = False
+
+
+@pytest.fixture
+def fixture_loads(monkeypatch):
+
+    loads = []
+
+    @asynccontextmanager
+    async def async_session():
+        db = FakeSession()
+        try:
+            yield db
+        finally:
+            db.closed = True
+
+    async def load_principal(db, access_token, user_agent, use_claims):
+        loads.append(user_agent)
+        await asyncio.sleep(0.05)
+        # the shared load must still own an open session
+        assert not db.closed
+        return user_agent, None
+
+    monkeypatch.setattr(handlers, "async_session", async_session)
+    monkeypatch.setattr(handlers, "load_principal", load_principal)
+    return loads
+
+
+async def test_cancelled_first_caller_does_not_break_waiters(fixture_loads):
+
+    first = asyncio.create_task(handlers.resolve_principal("token", "ua"))
+    await asyncio.sleep(0)
+    second = asyncio.create_task(handlers.resolve_principal("token", "ua"))
+    await asyncio.sleep(0)
+
+    first.cancel()
+
+    assert await second == ("ua", None)
+    assert fixture_loads == ["ua"]
+
+    with pytest.raises(asyncio.CancelledError):
+        await first
+
+
+async def test_flight_is_not_shared_across_devices(fixture_loads):
+
+    results = await asyncio.gather(
+        handlers.resolve_principal("token", "first"),
+        handlers.resolve_principal("token", "second"),
+        handlers.resolve_principal("token", "first"),
+    )
+
+    assert [user for user, _ in results] == ["first", "second", "first"]
+    assert sorted(fixture_loads) == ["first", "second"]
@@ -0,0 +1,67 @@
+import pytest
+from fastapi import Request
+
+from service.auth import handlers
+from service.auth.stores import MemorySessionStore
+from settings import auth_settings as a_s
+
+
+@pytest.fixture
+def fixture_rate_limit_store():
+
+    return MemorySessionStore()
+
+
+def build_request(headers: dict[str, str]) -> Request:
+
+    return Request({
+        "type": "http",
+        "headers": [
+            (name.lower().encode(), value.encode())
+            for name, value in headers.items()
+        ],
+        "client": ("10.0.0.1", 50000),
+    })
+
+
+async def test_rate_limit_rejects_over_limit(fixture_rate_limit_store):
+
+    keys, limits = ["email", "ip"], [3, 10]
+    for _ in range(3):
+        assert await fixture_rate_limit_store.hit_rate_limit(keys, limits, 60)
+
+    assert not await fixture_rate_limit_store.hit_rate_limit(keys, limits, 60)
+    assert await fixture_rate_limit_store.hit_rate_limit(
+        ["other", "ip"], limits, 60
+    )
+
+    # rejected attempts are not recorded
+    assert len(fixture_rate_limit_store.attempts["ip"]) == 4
+
+
+async def test_rate_limit_window_slides(fixture_rate_limit_store):
+
+    assert await fixture_rate_limit_store.hit_rate_limit(["email"], [1], 0)
+    assert await fixture_rate_limit_store.hit_rate_limit(["email"], [1], 60)
+    assert not await fixture_rate_limit_store.hit_rate_limit(
+        ["email"], [1], 60
+    )
+
+
+def test_client_ip_from_peer(monkeypatch):
+
+    monkeypatch.setattr(a_s, "LOGIN_CLIENT_IP_HEADER", None)
+
+    request = build_request({"X-Forwarded-For": "192.0.2.1"})
+    assert handlers.get_client_ip(request) == "10.0.0.1"
+
+
+def test_client_ip_from_trusted_header(monkeypatch):
+
+    monkeypatch.setattr(a_s, "LOGIN_CLIENT_IP_HEADER", "X-Forwarded-For")
+
+    # only the entry appended by the gateway is trusted
+    request = build_request({"X-Forwarded-For": "192.0.2.1, 198.51.100.7"})
+    assert handlers.get_client_ip(request) == "198.51.100.7"
+
+    assert handlers.get_client_ip(build_request({})) is None
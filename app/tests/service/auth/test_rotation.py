@@ -0,0 +1,65 @@
+import asyncio
+
+import pytest
+
+from service.auth import sessions
+from service.auth.stores import MemorySessionStore
+from settings import auth_settings as a_s
+
+
+@pytest.fixture
+def fixture_session_store(monkeypatch):
+
+    store = MemorySessionStore()
+    monkeypatch.setattr(sessions, "store", store)
+    return store
+
+
+async def test_concurrent_rotations_share_one_token(fixture_session_store):
+
+    await sessions.create_session("token", 1, "device")
+
+    results = await asyncio.gather(*[
+        sessions.rotate_session("token", f"rotated-{i}", 1, "device")
+        for i in range(5)
+    ])
+
+    # the losers' tokens are discarded, everyone gets the winner's
+    assert len(set(results)) == 1
+    [winner] = set(results)
+    assert await sessions.get_session("token") is None
+    assert await sessions.get_session(winner)
+    for i in range(5):
+        if f"rotated-{i}" != winner:
+            assert await sessions.get_session(f"rotated-{i}") is None
+
+
+async def test_rotated_token_reused_within_grace(fixture_session_store):
+
+    await sessions.create_session("token", 1, "device")
+
+    first = await sessions.rotate_session("token", "rotated-0", 1, "d")
+    second = await sessions.rotate_session("token", "rotated-1", 1, "d")
+
+    assert first == second == "rotated-0"
+
+
+async def test_rotated_token_not_reused_after_grace(
+    fixture_session_store, monkeypatch
+):
+
+    monkeypatch.setattr(a_s, "REFRESH_GRACE_SECONDS", 0)
+    await sessions.create_session("token", 1, "device")
+
+    assert await sessions.rotate_session("token", "rotated-0", 1, "device")
+    assert await sessions.rotate_session(
+        "token", "rotated-1", 1, "device"
+    ) is None
+
+
+async def test_unknown_session_is_not_rotated(fixture_session_store):
+
+    assert await sessions.rotate_session(
+        "token", "rotated-0", 1, "device"
+    ) is None
+    assert await sessions.get_session("rotated-0") is None
@@ -0,0 +1,85 @@
+import pytest
+from pydantic import ValidationError
+
+from service.auth import handlers, sessions
+from service.auth.stores import MemorySessionStore
+from settings import AuthSettings
+
+
+@pytest.fixture
+def fixture_session_store(monkeypatch):
+
+    store = MemorySessionStore()
+    monkeypatch.setattr(sessions, "store", store)
+    return store
+
+
+def test_session_record_round_trip():
+
+    record = sessions.build_session_record(7, "device")
+
+    assert len(record.split(":")) == 3
+    assert sessions.parse_session_record(record)["user_id"] == 7
+
+
+def test_session_record_with_refresh_id():
+
+    assert sessions.parse_session_record("refresh:7:digest:100") == {
+        "user_id": 7,
+        "device_digest": "digest",
+        "issued_at": 100,
+    }
+
+
+def test_malformed_session_record():
+
+    assert sessions.parse_session_record("garbage") is None
+
+
+async def test_get_session(fixture_session_store):
+
+    await sessions.create_session("token", 7, "device")
+
+    session = await sessions.get_session("token")
+    assert session["user_id"] == 7
+    assert session["issued_at"]
+
+
+async def test_get_legacy_session(fixture_session_store):
+
+    # before digest keys the raw access token held the refresh JWT
+    await fixture_session_store.create("token", 7, "refresh.jwt", 60, "device")
+
+    session = await sessions.get_session("token")
+    assert session is not None
+    assert session["user_id"] is None
+
+    await sessions.revoke_session("token", 7)
+    assert await sessions.get_session("token") is None
+
+
+async def test_revoke_without_token(fixture_session_store):
+
+    await sessions.create_session("token", 7, "device")
+
+    await sessions.revoke_session(None, 7)
+    assert await sessions.get_session("token")
+
+
+async def test_logout_without_token(fixture_session_store):
+
+    await sessions.create_session("token", 7, "device")
+
+    await handlers.logout(None)
+    assert await sessions.get_session("token")
+
+
+def test_unknown_session_store_is_rejected(monkeypatch):
+
+    monkeypatch.setenv("SESSION_STORE", "postgress")
+
+    with pytest.raises(ValidationError):
+        AuthSettings()
+
+    with pytest.raises(ValueError):
+        sessions.build_session_store("postgress")
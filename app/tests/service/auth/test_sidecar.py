@@ -0,0 +1,122 @@
+import asyncio
+import json
+
+import pytest
+from pydantic import ValidationError
+
+from service.auth import sidecar
+from service.exceptions.api.users.types import UserExcState
+from settings import AuthSettings
+from settings import auth_settings as a_s
+
+
+def feed(*chunks: bytes) -> asyncio.StreamReader:
+
+    reader = asyncio.StreamReader()
+    for chunk in chunks:
+        reader.feed_data(chunk)
+    reader.feed_eof()
+    return reader
+
+
+@pytest.fixture
+async def fixture_sidecar(tmp_path):
+
+    path = str(tmp_path / "verify.sock")
+    handled = []
+
+    async def handle_connection(reader, writer):
+        handled.append(asyncio.current_task())
+        await sidecar.handle_connection(reader, writer)
+
+    server = await asyncio.start_unix_server(handle_connection, path=path)
+    reader, writer = await asyncio.open_unix_connection(path)
+    yield reader, writer
+
+    writer.close()
+    await writer.wait_closed()
+    # the handler sees EOF and closes its end before the loop goes away
+    await asyncio.gather(*handled)
+    server.close()
+    await server.wait_closed()
+
+
+async def test_read_frames():
+
+    reader = feed(
+        sidecar.build_frame(b"first"),
+        sidecar.build_frame(b""),
+        sidecar.build_frame(b"third"),
+    )
+
+    assert await sidecar.read_frame(reader) == b"first"
+    assert await sidecar.read_frame(reader) == b""
+    assert await sidecar.read_frame(reader) == b"third"
+    assert await sidecar.read_frame(reader) is None
+
+
+async def test_read_truncated_frame():
+
+    reader = feed(sidecar.build_frame(b"payload")[:-1])
+
+    with pytest.raises(asyncio.IncompleteReadError):
+        await sidecar.read_frame(reader)
+
+
+async def test_read_oversize_frame(monkeypatch):
+
+    monkeypatch.setattr(a_s, "SIDECAR_MAX_FRAME_SIZE", 4)
+
+    assert await sidecar.read_frame(feed(sidecar.build_frame(b"four")))
+    with pytest.raises(ValueError):
+        await sidecar.read_frame(feed(sidecar.build_frame(b"fives")))
+
+
+async def test_oversize_frame_closes_connection(fixture_sidecar, monkeypatch):
+
+    monkeypatch.setattr(a_s, "SIDECAR_MAX_FRAME_SIZE", 4)
+    reader, writer = fixture_sidecar
+
+    writer.write(sidecar.build_frame(b"fives"))
+    await writer.drain()
+
+    assert await reader.read() == b""
+
+
+async def test_malformed_token_is_answered(fixture_sidecar):
+
+    reader, writer = fixture_sidecar
+
+    for payload in (b"not-a-jwt", b"{broken.json}.x"):
+        writer.write(sidecar.build_frame(payload))
+        await writer.drain()
+
+        result = json.loads(await sidecar.read_frame(reader))
+        assert result["is_valid"] is False
+        assert result["exc_state"] == UserExcState.INVALID_USER_TOKEN
+
+
+async def test_undecodable_frame_closes_connection(fixture_sidecar):
+
+    reader, writer = fixture_sidecar
+
+    writer.write(sidecar.build_frame(b"\xff\xfe"))
+    await writer.drain()
+
+    assert await reader.read() == b""
+
+
+@pytest.mark.parametrize("mode", ["660", "0660", "0o660"])
+def test_socket_mode_is_octal(monkeypatch, mode):
+
+    monkeypatch.setenv("SIDECAR_SOCKET_MODE", mode)
+
+    assert AuthSettings().SIDECAR_SOCKET_MODE == 0o660
+
+
+def test_socket_mode_rejects_non_octal(monkeypatch):
+
+    monkeypatch.setenv("SIDECAR_SOCKET_MODE", "0o989")
+
+    with pytest.raises(ValidationError):
+        AuthSettings()
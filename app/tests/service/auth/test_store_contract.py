@@ -0,0 +1,215 @@
+import asyncio
+import secrets
+
+import pytest
+import redis.asyncio as aioredis
+
+from service.auth import sessions
+from service.auth.stores import (
+    MemorySessionStore,
+    PostgresSessionStore,
+    RedisSessionStore,
+    SessionStore,
+)
+from settings import redis_settings as r_s
+
+# every store must behave the same behind service.auth.sessions, these run
+# against each implementation; redis and postgres need the test services
+
+
+@pytest.fixture(params=["memory", "redis", "postgres"])
+async def fixture_contract_store(request):
+
+    if request.param == "memory":
+        yield MemorySessionStore()
+
+    elif request.param == "redis":
+        redis = aioredis.from_url(r_s.REDIS_URL, decode_responses=True)
+        yield RedisSessionStore(redis, sessions.SESSION_KEY_PREFIX)
+        await redis.close()
+
+    else:
+        from tests.conftest import async_session, engine_test
+        yield PostgresSessionStore(engine_test, async_session)
+
+
+@pytest.fixture
+def fixture_user_id():
+
+    # the redis database is shared between runs
+    return secrets.randbelow(2 ** 31)
+
+
+def new_session_key() -> str:
+
+    return f"{sessions.SESSION_KEY_PREFIX}{secrets.token_hex(8)}"
+
+
+async def test_create_and_get(
+    fixture_contract_store: SessionStore, fixture_user_id
+):
+
+    session_key = new_session_key()
+    await fixture_contract_store.create(
+        session_key, fixture_user_id, "record", 60, "device"
+    )
+
+    assert await fixture_contract_store.get(session_key) == "record"
+    assert await fixture_contract_store.get(new_session_key()) is None
+
+
+async def test_list_user(fixture_contract_store: SessionStore, fixture_user_id):
+
+    session_key = new_session_key()
+    await fixture_contract_store.create(
+        session_key, fixture_user_id, "record", 60, "device"
+    )
+
+    [session] = await fixture_contract_store.list_user(fixture_user_id)
+    assert session["session_key"] == session_key
+    assert session["device_id"] == "device"
+    assert 0 < session["expires_in"] <= 60
+
+    assert await fixture_contract_store.list_user(fixture_user_id + 1) == []
+
+
+async def test_revoke(fixture_contract_store: SessionStore, fixture_user_id):
+
+    kept, revoked = new_session_key(), new_session_key()
+    for session_key in (kept, revoked):
+        await fixture_contract_store.create(
+            session_key, fixture_user_id, "record", 60, "device"
+        )
+
+    await fixture_contract_store.revoke([revoked], fixture_user_id)
+
+    assert await fixture_contract_store.get(revoked) is None
+    assert await fixture_contract_store.get(kept) == "record"
+    assert [
+        session["session_key"]
+        for session in await fixture_contract_store.list_user(fixture_user_id)
+    ] == [kept]
+
+
+async def test_revoke_user(
+    fixture_contract_store: SessionStore, fixture_user_id
+):
+
+    session_keys = {new_session_key(), new_session_key()}
+    for session_key in session_keys:
+        await fixture_contract_store.create(
+            session_key, fixture_user_id, "record", 60, "device"
+        )
+
+    revoked = await fixture_contract_store.revoke_user(fixture_user_id)
+
+    assert set(revoked) == session_keys
+    for session_key in session_keys:
+        assert await fixture_contract_store.get(session_key) is None
+    assert await fixture_contract_store.list_user(fixture_user_id) == []
+    assert await fixture_contract_store.revoke_user(fixture_user_id) == []
+
+
+async def test_rotation(fixture_contract_store: SessionStore, fixture_user_id):
+
+    session_key, new_key = new_session_key(), new_session_key()
+    await fixture_contract_store.create(
+        session_key, fixture_user_id, "record", 60, "device"
+    )
+
+    assert await fixture_contract_store.rotate(
+        session_key, new_key, "new.token", fixture_user_id,
+        "new-record", 60, 10, "device",
+    ) == "new.token"
+    assert await fixture_contract_store.get(session_key) is None
+    assert await fixture_contract_store.get(new_key) == "new-record"
+
+    # a later or concurrent caller gets the stored token, not its own
+    late_key = new_session_key()
+    assert await fixture_contract_store.rotate(
+        session_key, late_key, "late.token", fixture_user_id,
+        "late-record", 60, 10, "device",
+    ) == "new.token"
+    assert await fixture_contract_store.get(late_key) is None
+    assert [
+        session["session_key"]
+        for session in await fixture_contract_store.list_user(fixture_user_id)
+    ] == [new_key]
+
+
+async def test_rotate_missing_session(
+    fixture_contract_store: SessionStore, fixture_user_id
+):
+
+    new_key = new_session_key()
+    assert await fixture_contract_store.rotate(
+        new_session_key(), new_key, "new.token", fixture_user_id,
+        "new-record", 60, 10, "device",
+    ) is None
+    assert await fixture_contract_store.get(new_key) is None
+
+
+async def test_security_stamp(
+    fixture_contract_store: SessionStore, fixture_user_id
+):
+
+    assert await fixture_contract_store.get_stamp(fixture_user_id) == 0
+
+    assert await fixture_contract_store.seed_stamp(fixture_user_id, 100) == 100
+    # an existing stamp is never re-seeded
+    assert await fixture_contract_store.seed_stamp(fixture_user_id, 500) == 100
+
+    assert await fixture_contract_store.incr_stamp(fixture_user_id, 500) == 101
+    assert await fixture_contract_store.get_stamp(fixture_user_id) == 101
+
+    other_id = fixture_user_id + 1
+    assert await fixture_contract_store.incr_stamp(other_id, 500) == 501
+
+
+async def test_rate_limit(fixture_contract_store: SessionStore):
+
+    email, ip = f"email:{secrets.token_hex(8)}", f"ip:{secrets.token_hex(8)}"
+    other = f"email:{secrets.token_hex(8)}"
+
+    for _ in range(3):
+        assert await fixture_contract_store.hit_rate_limit(
+            [email, ip], [3, 5], 60
+        )
+    assert not await fixture_contract_store.hit_rate_limit(
+        [email, ip], [3, 5], 60
+    )
+
+    # the rejected attempt is not counted against the shared key
+    assert await fixture_contract_store.hit_rate_limit([other, ip], [3, 5], 60)
+    assert await fixture_contract_store.hit_rate_limit([other, ip], [3, 5], 60)
+    assert not await fixture_contract_store.hit_rate_limit(
+        [other, ip], [3, 5], 60
+    )
+
+
+async def test_publish_reaches_listener(fixture_contract_store: SessionStore):
+
+    channel = f"contract:{secrets.token_hex(8)}"
+    listener = fixture_contract_store.listen(channel)
+    received = asyncio.ensure_future(anext(listener))
+
+    # subscribing is asynchronous, publish until the listener is attached
+    async with asyncio.timeout(5):
+        while not received.done():
+            await fixture_contract_store.publish(channel, "message")
+            await asyncio.sleep(0.01)
+
+    assert received.result() == "message"
+    await listener.aclose()
+
+
+async def test_concurrent_rate_limit(fixture_contract_store: SessionStore):
+
+    key = f"ip:{secrets.token_hex(8)}"
+
+    results = await asyncio.gather(*(
+        fixture_contract_store.hit_rate_limit([key], [3], 60)
+        for _ in range(10)
+    ))
+
+    assert results.count(True) == 3
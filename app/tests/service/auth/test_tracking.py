@@ -0,0 +1,158 @@
+import asyncio
+
+import pytest
+
+from service.helpers.tracking import TrackedCache
+
+
+class FakeConnection:
+
+    def __init__(self) -> None:
+
+        self.commands = []
+
+    async def send_command(self, *args) -> None:
+
+        self.commands.append(args)
+
+    async def read_response(self):
+
+        return 42 if self.commands[-1] == ("CLIENT", "ID") else b"OK"
+
+
+class FakePubSub:
+
+    def __init__(self, messages: asyncio.Queue) -> None:
+
+        self.messages = messages
+        self.connection = FakeConnection()
+        self.closed = False
+
+    async def connect(self) -> None:
+        ...
+
+    async def subscribe(self, channel: str) -> None:
+
+        self.channel = channel
+
+    async def listen(self):
+
+        while True:
+            message = await self.messages.get()
+            if isinstance(message, Exception):
+                raise message
+            yield message
+
+    async def aclose(self) -> None:
+
+        self.closed = True
+
+
+class FakeRedis:
+
+    def __init__(self) -> None:
+
+        self.messages = asyncio.Queue()
+        self.pubsubs = []
+
+    def pubsub(self) -> FakePubSub:
+
+        self.pubsubs.append(FakePubSub(self.messages))
+        return self.pubsubs[-1]
+
+
+@pytest.fixture
+def fixture_tracked_cache():
+
+    return TrackedCache(prefix="auth:s:", maxsize=10, ttl=60)
+
+
+def build_loader(values: dict):
+
+    async def loader(key: str):
+        return values.get(key)
+
+    return loader
+
+
+async def test_cache_bypassed_until_ready(fixture_tracked_cache):
+
+    values = {"auth:s:1": "first"}
+    await fixture_tracked_cache.get("auth:s:1", build_loader(values))
+
+    assert len(fixture_tracked_cache) == 0
+
+
+async def test_invalidation_during_load_is_not_cached(fixture_tracked_cache):
+
+    fixture_tracked_cache.ready = True
+
+    async def loader(key: str):
+        # the key changes on the server while its old value is in flight
+        fixture_tracked_cache.invalidate([key])
+        return "stale"
+
+    assert await fixture_tracked_cache.get("auth:s:1", loader) == "stale"
+    assert len(fixture_tracked_cache) == 0
+
+
+async def test_redirected_invalidations(fixture_tracked_cache):
+
+    redis = FakeRedis()
+    values = {"auth:s:1": "first", "auth:s:2": "second"}
+    listener = asyncio.create_task(fixture_tracked_cache.listen(redis))
+
+    await redis.messages.put({"type": "subscribe", "data": 1})
+    await asyncio.sleep(0)
+    assert fixture_tracked_cache.ready
+
+    # tracking is redirected to the subscribed connection itself
+    assert redis.pubsubs[0].connection.commands[-1] == (
+        "CLIENT", "TRACKING", "ON", "REDIRECT", 42,
+        "BCAST", "PREFIX", "auth:s:",
+    )
+
+    for key in values:
+        await fixture_tracked_cache.get(key, build_loader(values))
+    assert len(fixture_tracked_cache) == 2
+
+    values["auth:s:1"] = "changed"
+    await redis.messages.put({"type": "message", "data": ["auth:s:1"]})
+    await asyncio.sleep(0)
+
+    assert await fixture_tracked_cache.get(
+        "auth:s:1", build_loader(values)
+    ) == "changed"
+    assert len(fixture_tracked_cache) == 2
+
+    # a flush on the server is sent with no keys
+    await redis.messages.put({"type": "message", "data": None})
+    await asyncio.sleep(0)
+    assert len(fixture_tracked_cache) == 0
+
+    listener.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await listener
+
+
+async def test_lost_tracking_connection_resets_cache(fixture_tracked_cache):
+
+    redis = FakeRedis()
+    values = {"auth:s:1": "first"}
+    listener = asyncio.create_task(fixture_tracked_cache.listen(redis))
+
+    await redis.messages.put({"type": "subscribe", "data": 1})
+    await asyncio.sleep(0)
+    await fixture_tracked_cache.get("auth:s:1", build_loader(values))
+    assert len(fixture_tracked_cache) == 1
+
+    await redis.messages.put(ConnectionError())
+    await asyncio.sleep(0)
+
+    assert not fixture_tracked_cache.ready
+    assert len(fixture_tracked_cache) == 0
+    assert redis.pubsubs[0].closed
+
+    listener.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await listener
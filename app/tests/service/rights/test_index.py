@@ -0,0 +1,76 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+from service.rights.index import RightsIndex
+
+
+class FakeResult:
+
+    def mappings(self):
+        return self
+
+    def all(self):
+        return []
+
+
+class FakeSession:
+
+    def __init__(self) -> None:
+
+        self.closed = False
+        self.queries = 0
+
+    async def execute(self, query):
+
+        self.queries += 1
+        await asyncio.sleep(0.05)
+        # the shared load must still own an open session
+        assert not self.closed
+        return FakeResult()
+
+
+def build_index(opened: list[FakeSession]) -> RightsIndex:
+
+    @asynccontextmanager
+    async def sessionmaker():
+        db = FakeSession()
+        opened.append(db)
+        try:
+            yield db
+        finally:
+            db.closed = True
+
+    return RightsIndex(sessionmaker=sessionmaker, maxsize=10, ttl=60)
+
+
+async def test_cancelled_caller_does_not_break_shared_load():
+
+    opened = []
+    index = build_index(opened)
+
+    first = asyncio.create_task(index.get_subject_rights(1))
+    await asyncio.sleep(0)
+    second = asyncio.create_task(index.get_subject_rights(1))
+    await asyncio.sleep(0)
+
+    first.cancel()
+
+    assert await second == {}
+    assert len(opened) == 1
+    assert opened[0].closed
+
+
+async def test_loaded_rights_are_cached():
+
+    opened = []
+    index = build_index(opened)
+
+    await index.get_subject_rights(1)
+    await index.get_subject_rights(1)
+
+    assert len(opened) == 1
+
+    index.evict([1])
+    await index.get_subject_rights(1)
+
+    assert len(opened) == 2
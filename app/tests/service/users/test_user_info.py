@@ -0,0 +1,52 @@
+import pytest
+
+from service.auth.handlers import get_user_info
+from service.roles.types import RoleType
+from settings import auth_settings as a_s
+from tests.conftest import async_session
+from tests.service.organization.factories import (
+    DepartmentFactory,
+    OrganizationFactory,
+)
+from tests.service.roles.factories import RoleFactory, UserRoleFactory
+from tests.service.users.factories import UserAgreementFactory, UserFactory
+
+
+@pytest.mark.asyncio
+async def test_user_info_takes_latest_role():
+
+    a_s.SKIP_AGREEMENT = 0
+
+    org = await OrganizationFactory()
+    department = await DepartmentFactory(organization_id=org.id)
+    user = await UserFactory(department_id=department.id)
+    employee = await RoleFactory(rolename=RoleType.HR_EMPLOYEE)
+    director = await RoleFactory(rolename=RoleType.HR_DIRECTOR)
+    await UserRoleFactory(user_id=user.id, role_id=employee.id)
+    await UserRoleFactory(user_id=user.id, role_id=director.id)
+    await UserAgreementFactory(user_id=user.id, organization_id=org.id)
+
+    async with async_session() as session:
+        info = await get_user_info(session, user.email)
+
+    assert info.role == RoleType.HR_DIRECTOR
+    assert info.organization_id == org.id
+    assert info.is_eula_accepted
+
+
+@pytest.mark.asyncio
+async def test_user_info_ignores_other_organization_eula():
+
+    a_s.SKIP_AGREEMENT = 0
+
+    org = await OrganizationFactory()
+    other_org = await OrganizationFactory(full_name="OTHER", short_name="OTHER")
+    department = await DepartmentFactory(organization_id=org.id)
+    user = await UserFactory(department_id=department.id)
+    await UserAgreementFactory(user_id=user.id, organization_id=other_org.id)
+
+    async with async_session() as session:
+        info = await get_user_info(session, user.email)
+
+    assert info.role is None
+    assert not info.is_eula_accepted